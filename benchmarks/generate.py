@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+generate.py — Seeded synthetic loan agreements for the benchmark suite.
+
+Builds an agreement shaped like the ones Markup reviews: ARTICLE headings,
+numbered Sections with captions, (a)/(b) subsections, a definitions article
+of quoted defined terms, Section and Article cross-references and pricing
+tables. Scale 1 is about the size of examples/sample_agreement.txt (~2,500
+words); scale 100 is a 400-page syndicated facility.
+
+The same seed always produces the same agreement, revisions and corrections,
+so timings are comparable across runs and machines.
+
+The .docx output has the run fragmentation Word leaves behind: section text
+is split across several runs with rsid attributes, captions in bold runs,
+and tables as w:tbl.
+
+Usage:
+    python benchmarks/generate.py agreement --scale 10 -o bench_out/
+    python benchmarks/generate.py mutate bench_out/deal_txt/ --rate 0.3
+    python benchmarks/generate.py corrections bench_out/agreement.docx bench_out/agreement_corrections.json
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+
+DEFAULT_SEED = 20260101
+SECTIONS_PER_SCALE = 36       # scale 1 ≈ 12 articles × 3 sections
+
+ARTICLE_CAPTIONS = [
+    "DEFINITIONS", "THE LOAN", "CONDITIONS PRECEDENT", "REPRESENTATIONS AND WARRANTIES",
+    "AFFIRMATIVE COVENANTS", "NEGATIVE COVENANTS", "FINANCIAL COVENANTS", "CASH MANAGEMENT",
+    "INSURANCE AND CASUALTY", "EVENTS OF DEFAULT", "REMEDIES", "THE AGENT",
+    "ASSIGNMENTS AND PARTICIPATIONS", "YIELD PROTECTION", "TAXES", "MISCELLANEOUS",
+]
+SECTION_CAPTIONS = [
+    "Loan Amount", "Interest Rate", "Prepayment", "Extension Option", "Use of Proceeds",
+    "Reporting", "Insurance", "Transfers", "Indebtedness", "Liens", "Distributions",
+    "Debt Service Coverage", "Reserves", "Notices", "Cure Periods", "Payment Default",
+    "Covenant Default", "Remedies Cumulative", "Indemnification", "Costs and Expenses",
+    "Governing Law", "Waiver of Jury Trial", "Successors and Assigns", "Severability",
+]
+TERM_WORDS = [
+    "Loan", "Property", "Lender", "Borrower", "Guarantor", "Agent", "Obligations",
+    "Collateral", "Lien", "Reserve", "Account", "Budget", "Payment", "Default", "Rate",
+    "Margin", "Period", "Date", "Plan", "Report", "Permitted", "Approved", "Material",
+    "Net", "Operating", "Capital", "Interest", "Leasing", "Tenant", "Insurance",
+]
+SUBJECTS = ["Borrower", "Lender", "Guarantor", "the Agent", "each Lender", "the Required Lenders"]
+VERBS = ["shall deliver", "shall maintain", "may require", "shall not permit", "shall pay",
+         "shall cause", "may terminate", "shall promptly notify", "may approve", "shall reimburse"]
+OBJECTS = ["all financial statements", "insurance coverage", "the Collateral",
+           "any Indebtedness", "the outstanding principal balance", "all reasonable costs",
+           "written notice", "each Reserve Account", "the annual Budget", "any Lien"]
+QUALIFIERS = ["within thirty (30) days after request", "in all material respects",
+              "in accordance with the Loan Documents", "without the prior written consent of Lender",
+              "subject to the applicable cure period", "at Borrower's sole cost and expense",
+              "to the reasonable satisfaction of Lender", "on each Payment Date",
+              "as set forth in the approved Budget", "except as otherwise provided herein"]
+
+
+def roman(n: int) -> str:
+    out = ''
+    for value, numeral in ((1000, 'M'), (900, 'CM'), (500, 'D'), (400, 'CD'), (100, 'C'),
+                           (90, 'XC'), (50, 'L'), (40, 'XL'), (10, 'X'), (9, 'IX'),
+                           (5, 'V'), (4, 'IV'), (1, 'I')):
+        while n >= value:
+            out += numeral
+            n -= value
+    return out
+
+
+def _sentence(rng: random.Random, terms: list[str], refs: list[str]) -> str:
+    words = [rng.choice(SUBJECTS), rng.choice(VERBS), rng.choice(OBJECTS)]
+    if terms and rng.random() < 0.6:
+        words.append(f"relating to the {rng.choice(terms)}")
+    words.append(rng.choice(QUALIFIERS))
+    if refs and rng.random() < 0.25:
+        words.append(f"as provided in {rng.choice(refs)}")
+    text = ' '.join(words)
+    return text[0].upper() + text[1:] + '.'
+
+
+def generate_agreement(scale: int = 1, seed: int = DEFAULT_SEED) -> list[dict]:
+    """Paragraph blocks of a synthetic agreement, in order.
+
+    Each block is {"kind": "title" | "article" | "caption" | "section" |
+    "subsection" | "definition" | "table" | "blank", "text": ...}; tables
+    carry "rows" (lists of cell strings) instead.
+    """
+    rng = random.Random(seed)
+    total_sections = SECTIONS_PER_SCALE * scale
+    n_articles = min(12 + scale // 5, len(ARTICLE_CAPTIONS) * 3)
+    per_article = max(2, total_sections // n_articles)
+    n_terms = min(20 + 2 * scale, 2000)
+    terms = []
+    while len(terms) < n_terms:
+        term = ' '.join(rng.sample(TERM_WORDS, rng.choice((1, 2, 2, 3))))
+        if term not in terms:
+            terms.append(term)
+    refs = [f"Section {a}.{s:02d}" for a in range(2, n_articles + 1)
+            for s in range(1, per_article + 1)]
+
+    blocks = [{"kind": "title", "text": "CREDIT AGREEMENT"},
+              {"kind": "blank", "text": ""},
+              {"kind": "section", "text": f'THIS CREDIT AGREEMENT (this "Agreement") is entered '
+                                          f'into by and among the Borrower, the Lenders and the Agent.'},
+              {"kind": "blank", "text": ""}]
+    for a in range(1, n_articles + 1):
+        caption = ARTICLE_CAPTIONS[(a - 1) % len(ARTICLE_CAPTIONS)]
+        blocks += [{"kind": "article", "text": f"ARTICLE {roman(a)}"},
+                   {"kind": "caption", "text": caption},
+                   {"kind": "blank", "text": ""}]
+        if a == 1:
+            blocks.append({"kind": "section",
+                           "text": "Section 1.01. Defined Terms. As used in this Agreement, "
+                                   "the following terms have the meanings set forth below:"})
+            for term in terms:
+                body = _sentence(rng, terms, refs)
+                blocks.append({"kind": "definition",
+                               "text": f'"{term}" means the obligation that {body[0].lower()}{body[1:]}'})
+            blocks.append({"kind": "blank", "text": ""})
+            continue
+        for s in range(1, per_article + 1):
+            section_caption = rng.choice(SECTION_CAPTIONS)
+            body = ' '.join(_sentence(rng, terms, refs) for _ in range(rng.randint(1, 3)))
+            blocks.append({"kind": "section",
+                           "text": f"Section {a}.{s:02d}. {section_caption}. {body}"})
+            if rng.random() < 0.3:
+                for letter in "abcdefgh"[:rng.randint(2, 6)]:
+                    blocks.append({"kind": "subsection",
+                                   "text": f"({letter}) {_sentence(rng, terms, refs)}"})
+            if rng.random() < 0.04:
+                rows = [["Level", "Leverage Ratio", "Applicable Margin"]]
+                for level in range(1, rng.randint(3, 6)):
+                    rows.append([f"Level {roman(level)}", f"< {level + 2}.{rng.randint(0, 9)}0x",
+                                 f"{1 + level * 0.25:.2f}%"])
+                blocks.append({"kind": "table", "rows": rows})
+            blocks.append({"kind": "blank", "text": ""})
+    return blocks
+
+
+def table_lines(rows: list[list[str]]) -> list[str]:
+    """Plain-text rendering of a table, one row per line."""
+    return ['\t'.join(row) for row in rows]
+
+
+def write_txt(blocks: list[dict], path: Path) -> Path:
+    lines = []
+    for block in blocks:
+        if block["kind"] == "table":
+            lines.extend(table_lines(block["rows"]))
+        else:
+            lines.append(block["text"])
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+# ---------------------------------------------------------------------------
+# .docx output
+# ---------------------------------------------------------------------------
+
+_W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-'
+    'officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-'
+    'officedocument.wordprocessingml.styles+xml"/>'
+    '</Types>')
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/officeDocument" Target="word/document.xml"/></Relationships>')
+_DOC_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/styles" Target="styles.xml"/></Relationships>')
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<w:styles xmlns:w="{_W_NS}">'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/>'
+    '<w:basedOn w:val="Normal"/><w:pPr><w:jc w:val="center"/></w:pPr>'
+    '<w:rPr><w:b/></w:rPr></w:style>'
+    '<w:style w:type="table" w:styleId="TableGrid"><w:name w:val="Table Grid"/></w:style>'
+    '</w:styles>')
+_RPR = '<w:rPr><w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman"/><w:sz w:val="24"/></w:rPr>'
+_RPR_BOLD = ('<w:rPr><w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman"/><w:b/>'
+             '<w:sz w:val="24"/></w:rPr>')
+
+
+def _run(text: str, rpr: str, rsid: str) -> str:
+    return (f'<w:r w:rsidR="{rsid}">{rpr}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>')
+
+
+def _fragmented_runs(text: str, rng: random.Random) -> str:
+    """Split text into 1-5 runs at word boundaries, as Word's editing history does."""
+    m = re.match(r'((?:Section\s+)?\d+\.\d+\.\s+[^.]{1,60}\.\s)', text)
+    runs = []
+    if m:
+        runs.append(_run(m.group(1), _RPR_BOLD, f"00{rng.randint(0x100000, 0xFFFFFF):06X}"))
+        text = text[m.end():]
+    words = text.split(' ')
+    cuts = sorted(rng.sample(range(1, len(words)), min(len(words) - 1, rng.randint(0, 4)))) \
+        if len(words) > 1 else []
+    for a, b in zip([0] + cuts, cuts + [len(words)]):
+        piece = ' '.join(words[a:b]) + (' ' if b < len(words) else '')
+        runs.append(_run(piece, _RPR, f"00{rng.randint(0x100000, 0xFFFFFF):06X}"))
+    return ''.join(runs)
+
+
+def _paragraph(text: str, rng: random.Random, style: str = None) -> str:
+    ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+    if not text:
+        return f'<w:p>{ppr}</w:p>'
+    runs = _run(text, _RPR_BOLD, "00A1B2C3") if style else _fragmented_runs(text, rng)
+    return f'<w:p w:rsidR="00A1B2C3">{ppr}{runs}</w:p>'
+
+
+def _table(rows: list[list[str]], rng: random.Random) -> str:
+    cells = ''.join(
+        '<w:tr>' + ''.join(f'<w:tc><w:tcPr><w:tcW w:w="3000" w:type="dxa"/></w:tcPr>'
+                           f'{_paragraph(cell, rng)}</w:tc>' for cell in row) + '</w:tr>'
+        for row in rows)
+    grid = '<w:gridCol w:w="3000"/>' * len(rows[0])
+    return ('<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:w="0" w:type="auto"/>'
+            f'</w:tblPr><w:tblGrid>{grid}</w:tblGrid>{cells}</w:tbl>')
+
+
+def write_docx(blocks: list[dict], path: Path, seed: int = DEFAULT_SEED) -> Path:
+    rng = random.Random(seed + 1)
+    body = []
+    for block in blocks:
+        kind = block["kind"]
+        if kind == "table":
+            body.append(_table(block["rows"], rng))
+        elif kind == "blank":
+            continue        # Word agreements space paragraphs, they do not use empty ones
+        else:
+            body.append(_paragraph(block["text"], rng,
+                                   "Heading1" if kind in ("title", "article", "caption") else None))
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<w:document xmlns:w="{_W_NS}"><w:body>{"".join(body)}'
+                '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/></w:sectPr></w:body></w:document>')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _ROOT_RELS)
+        zf.writestr('word/_rels/document.xml.rels', _DOC_RELS)
+        zf.writestr('word/styles.xml', _STYLES)
+        zf.writestr('word/document.xml', document)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Review output
+# ---------------------------------------------------------------------------
+
+def mutate_text(text: str, rng: random.Random, rate: float) -> str:
+    """A plausible reviewer's revision of text: reworded, added and dropped clauses."""
+    out = []
+    for line in text.split('\n'):
+        if not line.strip() or rng.random() >= rate:
+            out.append(line)
+            continue
+        k = rng.random()
+        if k < 0.35:
+            line = line.replace(" shall ", " may ", 1).replace("Lender", "the Required Lenders", 1)
+        elif k < 0.6:
+            line = line.rstrip('.') + ", " + rng.choice(QUALIFIERS) + "."
+        elif k < 0.75:
+            words = line.split(' ')
+            if len(words) > 8:
+                a = rng.randint(3, len(words) - 4)
+                del words[a:a + rng.randint(1, 3)]
+            line = ' '.join(words)
+        elif k < 0.85:
+            line += " [REVISED: narrowed to material breaches]"
+        elif k < 0.93:
+            out.append(line)
+            line = _sentence(rng, [], [])
+        else:
+            continue
+        out.append(line)
+    return '\n'.join(out)
+
+
+def mutate_deal(deal_dir: Path, rate: float = 0.3, seed: int = DEFAULT_SEED) -> int:
+    """Write revised.txt and changes_summary.md for every provision and mark it reviewed."""
+    rng = random.Random(seed + 2)
+    count = 0
+    for folder in sorted((deal_dir / "provisions").iterdir()):
+        manifest_path = folder / "manifest.json"
+        if not manifest_path.exists():
+            continue
+        original = (folder / "original.txt").read_text(encoding='utf-8')
+        (folder / "revised.txt").write_text(mutate_text(original, rng, rate), encoding='utf-8')
+        (folder / "changes_summary.md").write_text(
+            f"# Changes — {folder.name}\n\n- Synthetic benchmark revision.\n", encoding='utf-8')
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        manifest.update(status="reviewed", reviewed_at="2026-01-01T00:00:00+00:00")
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        count += 1
+    return count
+
+
+def docx_paragraph_texts(path: Path) -> list[str]:
+    """Text of each non-empty paragraph of a .docx (as the redline scripts see it)."""
+    with zipfile.ZipFile(path) as zf:
+        xml = zf.read('word/document.xml').decode('utf-8')
+    texts = []
+    for para in re.findall(r'<w:p[ >].*?</w:p>', xml, re.DOTALL):
+        text = ''.join(re.findall(r'<w:t[^>]*>([^<]*)</w:t>', para))
+        text = text.replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"') \
+                   .replace('&apos;', "'").replace('&amp;', '&')
+        if text.strip():
+            texts.append(text)
+    return texts
+
+
+def make_corrections(docx_path: Path, count: int = 50, seed: int = DEFAULT_SEED) -> list[dict]:
+    """review_draft.py corrections for `count` paragraphs of a draft."""
+    rng = random.Random(seed + 3)
+    candidates = [t for t in docx_paragraph_texts(docx_path) if len(t.split()) >= 8]
+    picked = sorted(rng.sample(range(len(candidates)), min(count, len(candidates))))
+    corrections = []
+    for i, idx in enumerate(picked):
+        original = candidates[idx]
+        revised = mutate_text(original, rng, 1.0)
+        if revised == original:
+            revised = original.rstrip('.') + ", " + rng.choice(QUALIFIERS) + "."
+        corrections.append({"requirement_id": i, "status": "deviates",
+                            "original_text": original, "revised_text": revised,
+                            "draft_section": f"paragraph {idx}"})
+    return corrections
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic agreements, revisions and corrections for benchmarks.",
+    )
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_agr = sub.add_parser('agreement', help='Write agreement.txt and agreement.docx')
+    p_agr.add_argument('--scale', type=int, default=10, help='Size multiple of the sample (default: 10)')
+    p_agr.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    p_agr.add_argument('--output-dir', '-o', default='bench_out', help='Output directory')
+    p_mut = sub.add_parser('mutate', help="Write revised.txt for every provision of a prepared deal")
+    p_mut.add_argument('deal_dir')
+    p_mut.add_argument('--rate', type=float, default=0.3, help='Share of lines revised (default: 0.3)')
+    p_mut.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    p_cor = sub.add_parser('corrections', help='Write a corrections JSON for a draft .docx')
+    p_cor.add_argument('docx')
+    p_cor.add_argument('output')
+    p_cor.add_argument('--count', type=int, default=50, help='Corrections to write (default: 50)')
+    p_cor.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    if args.command == 'agreement':
+        out = Path(args.output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        blocks = generate_agreement(args.scale, args.seed)
+        write_txt(blocks, out / "agreement.txt")
+        write_docx(blocks, out / "agreement.docx", args.seed)
+        words = sum(len(b.get("text", "").split()) for b in blocks)
+        print(f"✅ Scale {args.scale}: {len(blocks):,} blocks, {words:,} words → "
+              f"{out / 'agreement.txt'}, {out / 'agreement.docx'}")
+    elif args.command == 'mutate':
+        deal = Path(args.deal_dir)
+        if not (deal / "provisions").is_dir():
+            print(f"Error: No provisions directory in {deal}")
+            return 1
+        count = mutate_deal(deal, args.rate, args.seed)
+        print(f"✅ {count} provisions revised and marked reviewed")
+    else:
+        corrections = make_corrections(Path(args.docx), args.count, args.seed)
+        Path(args.output).write_text(json.dumps(corrections, indent=1), encoding='utf-8')
+        print(f"✅ {len(corrections)} corrections → {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+run_benchmarks.py — Time each script stage on synthetic agreements.
+
+Generates a seeded agreement at each --scale (see generate.py), then runs the
+scripts exactly as a user would, each in its own process:
+
+    prepare_txt     prepare_deal.py on agreement.txt
+    prepare_docx    prepare_deal.py on agreement.docx (unpack, split, index)
+    assemble        assemble_deal.py on the .txt deal after synthetic review
+    apply_redlines  apply_redlines.py on the .docx deal after synthetic review
+    review_draft    review_draft.py on agreement.docx with generated corrections
+
+Each stage is set up afresh before every repetition and the fastest run is
+kept. The stages that need the docx skill are skipped when it is not
+installed.
+
+Timings are compared with benchmarks/baselines.json; a stage slower than its
+baseline by more than --tolerance (and by at least MIN_REGRESSION_SECONDS,
+to ignore noise on fast stages) is a regression and the run exits 1.
+Baselines are machine-specific: record them with --update-baseline on the
+machine that will check them.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scale 10 --scale 100 --repeat 3
+    python benchmarks/run_benchmarks.py --stages prepare_txt,assemble
+    python benchmarks/run_benchmarks.py --scale 10 --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from generate import (DEFAULT_SEED, generate_agreement, make_corrections,  # noqa: E402
+                      mutate_deal, write_docx, write_txt)
+from markup_core import find_skill_root  # noqa: E402
+from markup_core.bench import print_table  # noqa: E402
+
+STAGES = ('prepare_txt', 'prepare_docx', 'assemble', 'apply_redlines', 'review_draft')
+SKILL_STAGES = ('apply_redlines', 'review_draft')
+DEFAULT_BASELINE = BENCH_DIR / "baselines.json"
+DEFAULT_TOLERANCE = 0.25
+MIN_REGRESSION_SECONDS = 0.1
+CORRECTIONS_PER_SCALE = 5
+
+
+def _script(name: str, *args) -> list[str]:
+    return [sys.executable, str(SCRIPTS_DIR / name), *map(str, args)]
+
+
+def _prepare(source: Path, deal: Path, work: Path) -> list[str]:
+    # No cross-deal cache or library: every run starts from nothing
+    return _script('prepare_deal.py', source, '--output-dir', deal, '--no-cache',
+                   '--library-dir', work / "library")
+
+
+def _fresh(path: Path) -> None:
+    if path.exists():
+        shutil.rmtree(path)
+
+
+class Workload:
+    """The generated agreement for one scale and the commands for each stage."""
+
+    def __init__(self, work: Path, scale: int, seed: int):
+        self.work, self.scale, self.seed = work, scale, seed
+        self.txt = work / "agreement.txt"
+        self.docx = work / "agreement.docx"
+        self.deal_txt = work / "deal_txt"
+        self.deal_docx = work / "deal_docx"
+        self.drafts = work / "drafts"
+        self.reviewed = set()
+
+    def generate(self) -> int:
+        blocks = generate_agreement(self.scale, self.seed)
+        write_txt(blocks, self.txt)
+        write_docx(blocks, self.docx, self.seed)
+        return sum(len(b.get("text", "").split()) for b in blocks)
+
+    def _reviewed_deal(self, source: Path, deal: Path) -> None:
+        """Prepare deal once (untimed) and give it synthetic revisions."""
+        if deal in self.reviewed:
+            return
+        _fresh(deal)
+        run(_prepare(source, deal, self.work))
+        mutate_deal(deal, seed=self.seed)
+        self.reviewed.add(deal)
+
+    def setup(self, stage: str) -> list[str]:
+        """Reset the inputs of stage and return its command."""
+        if stage == 'prepare_txt':
+            _fresh(self.work / "prep_txt")
+            return _prepare(self.txt, self.work / "prep_txt", self.work)
+        if stage == 'prepare_docx':
+            _fresh(self.work / "prep_docx")
+            return _prepare(self.docx, self.work / "prep_docx", self.work)
+        if stage == 'assemble':
+            self._reviewed_deal(self.txt, self.deal_txt)
+            # Time a cold build: drop the provision store and the deliverables' build state
+            _fresh(self.deal_txt / "deliverables")
+            (self.deal_txt / ".provision_store.json").unlink(missing_ok=True)
+            return _script('assemble_deal.py', self.deal_txt, '--no-cache', '--no-index')
+        if stage == 'apply_redlines':
+            self._reviewed_deal(self.docx, self.deal_docx)
+            # apply_redlines.py saves its edits into unpacked/; start each run from the original
+            pristine = self.work / "unpacked_original"
+            if not pristine.exists():
+                shutil.copytree(self.deal_docx / "unpacked", pristine)
+            _fresh(self.deal_docx / "unpacked")
+            shutil.copytree(pristine, self.deal_docx / "unpacked")
+            return _script('apply_redlines.py', self.deal_docx)
+        if stage == 'review_draft':
+            self.drafts.mkdir(exist_ok=True)
+            draft = self.drafts / "agreement.docx"
+            corrections = self.drafts / "agreement_corrections.json"
+            shutil.copyfile(self.docx, draft)        # review_draft.py edits in place
+            if not corrections.exists():
+                corrections.write_text(json.dumps(make_corrections(
+                    self.docx, CORRECTIONS_PER_SCALE * self.scale, self.seed), indent=1),
+                    encoding='utf-8')
+            return _script('review_draft.py', draft, corrections)
+        raise ValueError(f"Unknown stage: {stage}")
+
+
+def run(cmd: list[str]) -> float:
+    """Run cmd quietly; return its wall-clock seconds. Raises on failure."""
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                          stdin=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - t0
+    if proc.returncode != 0:
+        tail = '\n'.join(proc.stdout.strip().split('\n')[-15:])
+        raise RuntimeError(f"{Path(cmd[1]).name} exited {proc.returncode}:\n{tail}")
+    return elapsed
+
+
+def time_stage(workload: Workload, stage: str, repeat: int) -> float:
+    """Fastest of repeat runs of stage, each after a fresh setup."""
+    best = None
+    for _ in range(max(1, repeat)):
+        elapsed = run(workload.setup(stage))
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def load_baselines(path: Path) -> dict:
+    if path.exists():
+        return json.loads(path.read_text(encoding='utf-8'))
+    return {"machine": {}, "scales": {}}
+
+
+def machine_info() -> dict:
+    return {"platform": platform.platform(), "python": platform.python_version(),
+            "cpus": os.cpu_count()}
+
+
+def compare(seconds: float, baseline: float, tolerance: float) -> str:
+    """Status of a timing against its baseline."""
+    if baseline is None:
+        return "new"
+    if seconds > baseline * (1 + tolerance) and seconds - baseline >= MIN_REGRESSION_SECONDS:
+        return "REGRESSION"
+    if seconds < baseline * (1 - tolerance) and baseline - seconds >= MIN_REGRESSION_SECONDS:
+        return "faster"
+    return "ok"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time each script stage on synthetic agreements and check for regressions.",
+    )
+    parser.add_argument('--scale', type=int, action='append',
+                        help='Agreement size as a multiple of the sample agreement; repeatable '
+                             '(default: 10). 100 is a large facility, 1000 a stress test')
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f'Comma-separated stages to run (default: all of {", ".join(STAGES)})')
+    parser.add_argument('--repeat', '-r', type=int, default=3,
+                        help='Runs per stage; the fastest is kept (default: 3)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Generator seed')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE),
+                        help='Baseline timings file (default: benchmarks/baselines.json)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed slowdown before a stage fails (default: {DEFAULT_TOLERANCE:.0%}%)')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Record these timings as the new baseline instead of checking them')
+    parser.add_argument('--work-dir', help='Keep generated deals here (default: a temp directory)')
+    args = parser.parse_args()
+
+    scales = args.scale or [10]
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        print(f"Error: Unknown stage(s): {', '.join(unknown)} (expected {', '.join(STAGES)})")
+        return 1
+    if find_skill_root() is None and any(s in SKILL_STAGES for s in stages):
+        print(f"⚠️  docx skill not found — skipping {', '.join(s for s in stages if s in SKILL_STAGES)}")
+        stages = [s for s in stages if s not in SKILL_STAGES]
+
+    baseline_path = Path(args.baseline)
+    baselines = load_baselines(baseline_path)
+    if baselines.get("machine") and baselines["machine"] != machine_info() and not args.update_baseline:
+        print(f"ℹ️  Baselines were recorded on {baselines['machine'].get('platform')} "
+              f"({baselines['machine'].get('cpus')} CPUs); expect drift on this machine")
+
+    root = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix='markup_bench_'))
+    rows, regressions, failures = [], [], []
+    try:
+        for scale in scales:
+            work = root / f"scale_{scale}"
+            _fresh(work)
+            work.mkdir(parents=True)
+            workload = Workload(work, scale, args.seed)
+            words = workload.generate()
+            print(f"🔎 Scale {scale}: {words:,} words")
+            recorded = baselines["scales"].setdefault(str(scale), {})
+            for stage in stages:
+                try:
+                    seconds = time_stage(workload, stage, args.repeat)
+                except RuntimeError as e:
+                    print(f"   ⚠️  {stage} failed: {e}")
+                    failures.append(f"{stage}@{scale}")
+                    continue
+                baseline = recorded.get(stage)
+                status = "recorded" if args.update_baseline else compare(seconds, baseline,
+                                                                         args.tolerance)
+                if status == "REGRESSION":
+                    regressions.append(f"{stage}@{scale}")
+                rows.append([f"{stage} ×{scale}", f"{seconds:.3f}s",
+                             f"{baseline:.3f}s" if baseline is not None else "-",
+                             f"{seconds / baseline:.2f}x" if baseline else "-", status])
+                if args.update_baseline:
+                    recorded[stage] = round(seconds, 3)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print()
+    print_table(["stage", "time", "baseline", "ratio", "status"], rows)
+    print()
+
+    if args.update_baseline:
+        baselines["machine"] = machine_info()
+        baseline_path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + '\n',
+                                 encoding='utf-8')
+        print(f"✅ Baselines written to {baseline_path}")
+    if failures:
+        print(f"⚠️  {len(failures)} stage(s) failed: {', '.join(failures)}")
+    if regressions:
+        print(f"⚠️  {len(regressions)} regression(s) over {args.tolerance:.0%}: "
+              f"{', '.join(regressions)}")
+    if failures or regressions:
+        return 1
+    if not args.update_baseline:
+        print("✅ No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,170 +11,32 @@ Uses the Document library from Claude Code's built-in docx skill for:
 Matches directly against XML paragraphs (not original.txt) to avoid paragraph
 boundary mismatches between text extraction and OOXML structure.
 
+Works in two phases: each provision's diff and tracked-change XML are planned
+in a process pool (plans depend only on the streamed paragraph records and
+revised.txt), then the plans are applied to the shared DOM in document order.
+
 Usage:
     PYTHONPATH=~/.claude/skills/docx python scripts/apply_redlines.py [deal_dir]
 
-    deal_dir defaults to the current working directory.
+    deal_dir defaults to the current working directory. Manifests are read
+    from the deal.db index when present (see deal_index.py). --jobs N limits the
+    number of planning processes (default: CPU count). --timings writes a
+    per-phase span tree to <deal_dir>/timings.json; --profile also cProfiles
+    the per-provision alignment.
 
 Prerequisites:
     - unpacked/ directory must exist (created by prepare_deal.py for .docx inputs)
     - Provision folders must have status "reviewed" with revised.txt files
     - The docx skill must be installed at ~/.claude/skills/docx
 """
-import argparse, os, sys, re, difflib, json, glob
-
-
-# ---- Locate and import the Document library ----
-
-def find_skill_root():
-    """Find the docx skill root directory."""
-    candidates = [
-        os.path.expanduser('~/.claude/skills/docx'),
-        '/mnt/skills/public/docx',
-        '/mnt/skills/docx',
-    ]
-    for c in candidates:
-        if os.path.isfile(os.path.join(c, 'scripts', 'document.py')):
-            return c
-    return None
-
-SKILL_ROOT = find_skill_root()
-if not SKILL_ROOT:
-    sys.exit("ERROR: Could not find the docx skill. Expected at ~/.claude/skills/docx")
-sys.path.insert(0, SKILL_ROOT)
-
-from scripts.document import Document, DocxXMLEditor
-from ooxml.scripts.pack import pack_document
-
-
-# ---- Fix UTF-16 encoded XML files ----
-
-def fix_utf16_files(directory):
-    """Convert any UTF-16 encoded XML files to UTF-8."""
-    count = 0
-    for xml_path in glob.glob(os.path.join(directory, '**', '*.xml'), recursive=True):
-        with open(xml_path, 'rb') as f:
-            header = f.read(4)
-        if header[:2] in (b'\xff\xfe', b'\xfe\xff'):
-            with open(xml_path, 'rb') as f:
-                content = f.read()
-            text = content.decode('utf-16')
-            text = text.replace('encoding="utf-16"', 'encoding="UTF-8"')
-            text = text.replace("encoding='utf-16'", "encoding='UTF-8'")
-            with open(xml_path, 'w', encoding='utf-8') as f:
-                f.write(text)
-            count += 1
-    if count:
-        print(f"  Converted {count} UTF-16 XML file(s) to UTF-8")
-
-
-# ---- XML text helpers ----
-
-def extract_text(para):
-    """Extract text from a minidom w:p element, including tabs."""
-    parts = []
-    for r in para.getElementsByTagName('w:r'):
-        for ch in r.childNodes:
-            if ch.nodeType != ch.ELEMENT_NODE:
-                continue
-            if ch.tagName == 'w:t':
-                parts.append(''.join(
-                    c.data for c in ch.childNodes if c.nodeType == c.TEXT_NODE
-                ))
-            elif ch.tagName == 'w:tab':
-                parts.append('\t')
-    return ''.join(parts)
-
-
-def get_rpr(para):
-    """Get rPr XML string from the first run in a paragraph."""
-    for r in para.getElementsByTagName('w:r'):
-        for ch in r.childNodes:
-            if ch.nodeType == ch.ELEMENT_NODE and ch.tagName == 'w:rPr':
-                s = ch.toxml()
-                return re.sub(r' xmlns:\w+="[^"]*"', '', s)
-        return ''
-    return ''
-
-
-def get_ppr(para):
-    """Get pPr XML string from a paragraph."""
-    for ch in para.childNodes:
-        if ch.nodeType == ch.ELEMENT_NODE and ch.tagName == 'w:pPr':
-            s = ch.toxml()
-            return re.sub(r' xmlns:\w+="[^"]*"', '', s)
-    return ''
-
-
-def nm(t):
-    """Normalize whitespace for matching/indexing."""
-    return re.sub(r'\s+', ' ', t.strip())
-
-
-def esc(text):
-    """Escape text for XML content."""
-    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-
-
-# ---- Diff and tracked-change XML construction ----
-
-def text_to_runs(rpr, text, is_del=False):
-    """Convert text to XML runs, splitting at tab characters."""
-    tag = 'w:delText' if is_del else 'w:t'
-    segs = text.split('\t')
-    runs = []
-    for i, seg in enumerate(segs):
-        if seg:
-            runs.append(
-                f'<w:r>{rpr}<{tag} xml:space="preserve">{esc(seg)}</{tag}></w:r>'
-            )
-        if i < len(segs) - 1:
-            runs.append(f'<w:r>{rpr}<w:tab/></w:r>')
-    return ''.join(runs)
-
-
-def char_diff_ops(old, new):
-    """Character-level diff preserving exact original text."""
-    ops = []
-    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old, new).get_opcodes():
-        if tag == 'equal':
-            ops.append(('eq', old[i1:i2]))
-        elif tag == 'delete':
-            ops.append(('del', old[i1:i2]))
-        elif tag == 'insert':
-            ops.append(('ins', new[j1:j2]))
-        elif tag == 'replace':
-            ops.append(('del', old[i1:i2]))
-            ops.append(('ins', new[j1:j2]))
-    return ops
-
-
-def merge_ops(ops):
-    """Merge consecutive ops of the same type."""
-    if not ops:
-        return ops
-    merged = [ops[0]]
-    for op, text in ops[1:]:
-        if merged[-1][0] == op:
-            merged[-1] = (op, merged[-1][1] + text)
-        else:
-            merged.append((op, text))
-    return merged
+import argparse, os, sys, re, difflib, json
+from functools import partial
 
-
-def tracked_runs_xml(rpr, ops):
-    """Build tracked-change XML runs from diff operations."""
-    parts = []
-    for op, text in ops:
-        if op == 'eq':
-            parts.append(text_to_runs(rpr, text, is_del=False))
-        elif op == 'del':
-            inner = text_to_runs(rpr, text, is_del=True)
-            parts.append(f'<w:del>{inner}</w:del>')
-        elif op == 'ins':
-            inner = text_to_runs(rpr, text, is_del=False)
-            parts.append(f'<w:ins>{inner}</w:ins>')
-    return ''.join(parts)
+from deal_index import DealIndex
+from docx_package import DocxPackage
+from diff_engine import DEFAULT_DIFF_LEVEL, DIFF_LEVELS, diff_ops
+from docx_stream import stream_paragraphs
+from markup_core import esc, fix_utf16_files, load_skill, nm, timings, tracked_runs_xml
 
 
 # ---- Section boundary detection ----
@@ -197,33 +59,204 @@ def find_section_boundaries(all_paras, all_norms):
     return boundaries
 
 
-def get_provision_range(section_num, section_boundaries, total_paras):
-    """Get the paragraph index range [start, end) for a section."""
-    start = section_boundaries.get(section_num)
-    if start is None:
-        return None, None
-    # End is the start of the next section (by numeric order)
-    all_starts = sorted(section_boundaries.values())
-    idx = all_starts.index(start)
-    end = all_starts[idx + 1] if idx + 1 < len(all_starts) else total_paras
-    return start, end
+HEADING_SIGNATURE_LINES = 3   # leading lines of original.txt matched to find a provision
+
+
+def heading_signature(original_path):
+    """Normalized first non-empty lines of a provision's original.txt."""
+    signature = []
+    if os.path.exists(original_path):
+        with open(original_path, encoding='utf-8') as f:
+            for line in f:
+                n = nm(line)
+                if n:
+                    signature.append(n)
+                    if len(signature) == HEADING_SIGNATURE_LINES:
+                        break
+    return signature
+
+
+def top_level_number(section_num):
+    """"05" / "5" / "05.02" -> "5", the key used by find_section_boundaries."""
+    head = section_num.split('.')[0]
+    return str(int(head)) if head.isdigit() else head
+
+
+def locate_provisions(folders, all_norms, section_boundaries):
+    """Paragraph range [start, end) of every provision folder, in folder order.
+
+    folders is [(folder, manifest, signature)] for all provision folders,
+    reviewed or not, sorted by name. Each provision starts at the first
+    paragraph after the previous one where its original.txt lines appear
+    (so units split from one article follow each other), falling back to the
+    "N." top-level heading for its section number. Returns
+    {folder: (start, end)}.
+    """
+    nonempty = [i for i, n in enumerate(all_norms) if n]
+    starts = {}
+    pos = 0
+    for folder, manifest, signature in folders:
+        found = None
+        if signature:
+            for p in range(pos, len(nonempty) - len(signature) + 1):
+                if all(all_norms[nonempty[p + j]] == line for j, line in enumerate(signature)):
+                    found = p
+                    break
+        if found is not None:
+            starts[folder] = nonempty[found]
+            pos = found + 1
+        elif manifest.get('part', 1) == 1:
+            start = section_boundaries.get(top_level_number(manifest.get('section_number', '')))
+            if start is not None and (not starts or start > max(starts.values())):
+                starts[folder] = start
+                pos = next((p for p, i in enumerate(nonempty) if i > start), len(nonempty))
+
+    # A provision ends where the next folder starts; if that one was not
+    # found, at the next top-level heading
+    headings = sorted(section_boundaries.values())
+    ranges = {}
+    for idx, (folder, _, _) in enumerate(folders):
+        if folder not in starts:
+            continue
+        start = starts[folder]
+        following = folders[idx + 1][0] if idx + 1 < len(folders) else None
+        if following is None:
+            end = len(all_norms)
+        elif following in starts:
+            end = starts[following]
+        else:
+            end = next((h for h in headings if h > start), len(all_norms))
+        ranges[folder] = (start, end)
+    return ranges
+
+
+# ---- Paragraph alignment within replace blocks ----
+
+DEFAULT_MATCH_THRESHOLD = 0.35
+CANDIDATES_PER_LINE = 8   # token-overlap candidates scored per revised line
+DIAGONAL_BAND = 2         # neighbours of the proportional diagonal always scored
+
+
+def _candidate_pairs(orig_norms, rev_norms):
+    """Yield (ri, oi) pairs worth scoring in a replace block.
+
+    A token inverted index over the XML paragraphs supplies, for each
+    revised line, the paragraphs sharing the most distinctive words; a
+    narrow band around the proportional diagonal is always added so short
+    or heavily reworded paragraphs still get a chance. This keeps the
+    number of ratio() calls linear in the block size.
+    """
+    n, m = len(orig_norms), len(rev_norms)
+    postings = {}
+    for oi, on in enumerate(orig_norms):
+        for tok in set(re.findall(r'\w+', on.lower())):
+            postings.setdefault(tok, []).append(oi)
+    common = max(2, n // 2)
+
+    for ri, rn in enumerate(rev_norms):
+        shared = {}
+        for tok in set(re.findall(r'\w+', rn.lower())):
+            hits = postings.get(tok, ())
+            if len(hits) > common:
+                continue
+            for oi in hits:
+                shared[oi] = shared.get(oi, 0) + 1
+        cands = set(sorted(shared, key=lambda oi: (-shared[oi], oi))[:CANDIDATES_PER_LINE])
+        center = ri * n // m if m else 0
+        cands.update(range(max(0, center - DIAGONAL_BAND),
+                           min(n, center + DIAGONAL_BAND + 1)))
+        for oi in sorted(cands):
+            yield ri, oi
+
+
+def similarity_matrix(orig_norms, rev_norms, threshold):
+    """Sparse similarity matrix for a replace block.
+
+    Returns {(oi, ri): ratio} holding only candidate pairs whose ratio
+    exceeds the threshold. Each revised line gets one SequenceMatcher (its
+    b2j table is built once and reused across its candidates), and a pair
+    only reaches the full ratio() after the length bound,
+    real_quick_ratio() and quick_ratio() all clear the threshold.
+    """
+    sims = {}
+    sm, cur = None, None
+    for ri, oi in _candidate_pairs(orig_norms, rev_norms):
+        rn, on = rev_norms[ri], orig_norms[oi]
+        la, lb = len(on), len(rn)
+        if not la + lb or 2.0 * min(la, lb) / (la + lb) <= threshold:
+            continue
+        if ri != cur:
+            sm, cur = difflib.SequenceMatcher(None, '', rn), ri
+        sm.set_seq1(on)
+        if sm.real_quick_ratio() <= threshold or sm.quick_ratio() <= threshold:
+            continue
+        r = sm.ratio()
+        if r > threshold:
+            sims[(oi, ri)] = r
+    return sims
+
 
+def align_paragraphs(orig_norms, rev_norms, threshold=DEFAULT_MATCH_THRESHOLD):
+    """Pair XML paragraphs with revised lines, keeping document order.
 
-# ---- Apply modification to a paragraph ----
+    Monotone alignment: picks the set of non-crossing pairs with the
+    greatest total similarity, so a strong match later in the block is never
+    lost to an earlier weak one. Only the candidate pairs in the sparse
+    similarity matrix are visited: the heaviest chain increasing in both
+    indices is found with a Fenwick tree of prefix maxima over the revised
+    lines, in O(K log m) for K candidate pairs.
 
-def apply_modification(ed, para, xml_raw_text, revised_text):
-    """Apply character-level tracked changes to a paragraph.
+    Returns dict: orig_idx -> rev_idx (indices local to the block)
+    """
+    sims = similarity_matrix(orig_norms, rev_norms, threshold)
+    if not sims:
+        return {}
+
+    # Paragraph order, and within a paragraph revised lines in reverse so no
+    # two pairs of one paragraph can chain
+    pairs = sorted(sims, key=lambda p: (p[0], -p[1]))
+    m = len(rev_norms)
+    tree = [(0.0, -1)] * (m + 1)     # position ri + 1: best (score, pair) ending at ri
+    scores, back = [], []
+    for k, (oi, ri) in enumerate(pairs):
+        best, prev = 0.0, -1
+        x = ri                       # prefix max over revised lines before ri
+        while x > 0:
+            if tree[x][0] > best:
+                best, prev = tree[x]
+            x -= x & -x
+        score = best + sims[(oi, ri)]
+        scores.append(score)
+        back.append(prev)
+        x = ri + 1
+        while x <= m:
+            if score > tree[x][0]:
+                tree[x] = (score, k)
+            x += x & -x
+
+    matched = {}
+    k = max(range(len(pairs)), key=scores.__getitem__)
+    while k >= 0:
+        oi, ri = pairs[k]
+        matched[oi] = ri
+        k = back[k]
+    return matched
+
+
+# ---- Tracked-change XML for one paragraph ----
+
+def modification_xml(rec, revised_text, diff_level=DEFAULT_DIFF_LEVEL):
+    """Build the tracked-change replacement for a paragraph.
 
     Args:
-        ed: DocxXMLEditor for the document
-        para: DOM node of the paragraph
-        xml_raw_text: raw text extracted from the XML paragraph
+        rec: ParaRecord for the paragraph (text, rPr and pPr from the stream)
         revised_text: the target revised text for this paragraph
+        diff_level: 'word', 'refine' or 'char' (see diff_engine.py)
 
     Returns:
-        The new paragraph DOM node, or None on failure
+        The new w:p XML string, or None if the text is unchanged
     """
-    ppr, rpr = get_ppr(para), get_rpr(para)
+    ppr, rpr, xml_raw_text = rec.ppr, rec.rpr, rec.text
 
     # Split at first tab to separate section-number prefix from body
     if '\t' in xml_raw_text:
@@ -243,8 +276,8 @@ def apply_modification(ed, para, xml_raw_text, revised_text):
     if nm(orig_body) == nm(rev_body):
         return None  # no actual change
 
-    # Character-level diff preserves exact original text
-    ops = merge_ops(char_diff_ops(orig_body, rev_body))
+    # The diff preserves exact original text at every level
+    ops = diff_ops(orig_body, rev_body, diff_level)
     runs = tracked_runs_xml(rpr, ops)
 
     pfx_xml = ''
@@ -252,25 +285,15 @@ def apply_modification(ed, para, xml_raw_text, revised_text):
         sn = orig_pfx.rstrip('\t')
         pfx_xml = f'<w:r>{rpr}<w:t>{esc(sn)}</w:t></w:r><w:r>{rpr}<w:tab/></w:r>'
 
-    new_p_xml = f'<w:p>{ppr}{pfx_xml}{runs}</w:p>'
-    try:
-        nodes = ed.replace_node(para, new_p_xml)
-        return next(
-            (x for x in nodes if getattr(x, 'tagName', None) == 'w:p'), None
-        )
-    except Exception as e:
-        print(f"    ERR modify: {e}")
-        return None
+    return f'<w:p>{ppr}{pfx_xml}{runs}</w:p>'
 
 
-def apply_insertion(ed, anchor_para, revised_text):
-    """Insert a new tracked-change paragraph after the anchor.
+def insertion_xml(revised_text, rpr):
+    """Build a new tracked-insertion paragraph.
 
-    Returns:
-        The new paragraph DOM node, or None on failure
+    rpr is the anchor's first-run rPr, reused so the insertion matches its
+    neighbour's formatting.
     """
-    rpr = get_rpr(anchor_para)
-
     if '\t' in revised_text:
         pfx_part, body_part = revised_text.split('\t', 1)
         pfx_part += '\t'
@@ -289,19 +312,166 @@ def apply_insertion(ed, anchor_para, revised_text):
             f'<w:r>{rpr}<w:tab/></w:r>'
         )
     body_run = f'<w:r>{rpr}<w:t xml:space="preserve">{esc(body_part)}</w:t></w:r>'
-    tracked_para = (
+    return (
         f'<w:p><w:pPr><w:rPr><w:ins/></w:rPr></w:pPr>'
         f'<w:ins>{pfx_runs}{body_run}</w:ins></w:p>'
     )
 
-    try:
-        nodes = ed.insert_after(anchor_para, tracked_para)
-        return next(
-            (x for x in nodes if getattr(x, 'tagName', None) == 'w:p'), None
-        )
-    except Exception as e:
-        print(f"    ERR insert: {e}")
-        return None
+
+# ---- Phase 1: per-provision edit plans (no DOM access) ----
+
+def strip_markers(line):
+    """Strip inline commentary markers from a revised.txt line.
+
+    Uses a greedy match (.*) so nested brackets like $[X] inside a marker
+    don't prematurely close the match.
+    """
+    line = re.sub(r'\s*\[(REVISED|NOTE|COMMENT|RECOMMENDATION):.*\]', '', line)
+    return line.rstrip('\n')
+
+
+def plan_provision(job):
+    """Diff one provision and return its edit plan.
+
+    job is (revised_path, prov_recs, threshold, diff_level) where prov_recs
+    are the provision's non-empty ParaRecords. The plan's ops are, in the order they
+    must be applied (k indexes prov_recs):
+
+        ('delete', k)        suggest deletion of paragraph k
+        ('modify', k, xml)   replace paragraph k with tracked-change XML
+        ('anchor', k)        later insertions go after paragraph k
+        ('insert', xml)      insert after the anchor; it becomes the anchor
+
+    Runs in a worker process, so it only touches plain data.
+    """
+    revised_path, prov_recs, threshold, diff_level = job
+    prov_norms = [r.norm for r in prov_recs]
+    with open(revised_path) as f:
+        revised_raw = [
+            strip_markers(l)
+            for l in f if l.strip()
+        ]
+    rev_norms = [nm(l) for l in revised_raw]
+
+    # Paragraph-level alignment: XML paragraphs vs revised lines
+    with timings.span("match", items=len(prov_norms) + len(rev_norms)):
+        opcodes = difflib.SequenceMatcher(None, prov_norms, rev_norms).get_opcodes()
+    ops = []
+
+    with timings.span("diff") as diff_span:
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == 'equal':
+                continue
+
+            elif tag == 'delete':
+                ops.extend(('delete', k) for k in range(i1, i2))
+
+            elif tag == 'insert':
+                # Anchor on the paragraph just before the insertion point
+                a = i1 - 1 if i1 > 0 else 0
+                ops.append(('anchor', a))
+                ops.extend(('insert', insertion_xml(revised_raw[k], prov_recs[a].rpr))
+                           for k in range(j1, j2))
+
+            elif tag == 'replace':
+                # Order-preserving alignment: pair XML paragraphs ↔ revised lines
+                local = align_paragraphs(prov_norms[i1:i2], rev_norms[j1:j2], threshold)
+                matched = {i1 + oi: j1 + ri for oi, ri in local.items()}
+
+                # Modifications for matched pairs
+                for oi, ri in sorted(matched.items()):
+                    xml = modification_xml(prov_recs[oi], revised_raw[ri], diff_level)
+                    if xml:
+                        ops.append(('modify', oi, xml))
+
+                # Delete unmatched XML paragraphs
+                ops.extend(('delete', oi) for oi in range(i1, i2) if oi not in matched)
+
+                # Insert unmatched revised lines, each after the paragraph or
+                # insertion preceding it
+                inv_match = {ri: oi for oi, ri in matched.items()}
+                a = i1 - 1 if i1 > 0 else i1
+                ops.append(('anchor', a))
+                anchor_rpr = prov_recs[a].rpr
+                for ri in range(j1, j2):
+                    if ri in inv_match:
+                        ops.append(('anchor', inv_match[ri]))
+                        anchor_rpr = prov_recs[inv_match[ri]].rpr
+                    else:
+                        ops.append(('insert', insertion_xml(revised_raw[ri], anchor_rpr)))
+        diff_span.count(len(ops))
+
+    return {'revised_lines': len(revised_raw), 'ops': ops}
+
+
+# ---- Phase 2: apply plans to the shared DOM ----
+
+def _first_para(nodes):
+    return next((x for x in nodes if getattr(x, 'tagName', None) == 'w:p'), None)
+
+
+def apply_plan(ed, current_paras, ops):
+    """Apply one provision's plan; current_paras holds its paragraph nodes.
+
+    Returns (modifications, deletions, insertions) actually applied.
+    """
+    mc, dc, ic = 0, 0, 0
+    anchor = None
+    for op in ops:
+        kind = op[0]
+        if kind == 'anchor':
+            anchor = current_paras[op[1]]
+        elif kind == 'delete':
+            try:
+                ed.suggest_deletion(current_paras[op[1]])
+                dc += 1
+            except Exception as e:
+                print(f"    ERR delete: {e}")
+        elif kind == 'modify':
+            try:
+                new_p = _first_para(ed.replace_node(current_paras[op[1]], op[2]))
+            except Exception as e:
+                print(f"    ERR modify: {e}")
+                new_p = None
+            if new_p:
+                current_paras[op[1]] = new_p
+                mc += 1
+        elif kind == 'insert':
+            try:
+                new_p = _first_para(ed.insert_after(anchor, op[1]))
+            except Exception as e:
+                print(f"    ERR insert: {e}")
+                new_p = None
+            if new_p:
+                anchor = new_p  # chain insertions
+                ic += 1
+    return mc, dc, ic
+
+
+def _timed_plan(job):
+    """plan_provision() inside an "align" span named for the provision folder."""
+    folder = os.path.basename(os.path.dirname(job[0]))
+    with timings.span("align", label=folder, items=len(job[1])):
+        return plan_provision(job)
+
+
+def plan_all(jobs, workers):
+    """Run plan_provision over jobs, in a process pool if workers > 1.
+
+    With --timings each provision is an "align" span; pool workers record
+    theirs apart and the spans are attached here.
+    """
+    plan = _timed_plan if timings.enabled() else plan_provision
+    if workers <= 1 or len(jobs) <= 1:
+        return [plan(job) for job in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if plan is plan_provision:
+            return list(pool.map(plan_provision, jobs))
+        results = list(pool.map(partial(timings.collect, _timed_plan), jobs))
+    for _, spans in results:
+        timings.attach(spans)
+    return [result for result, _ in results]
 
 
 # ---- Main ----
@@ -318,6 +488,27 @@ def main():
         '--output', '-o', default='redline_agreement.docx',
         help='Output filename (default: redline_agreement.docx)'
     )
+    parser.add_argument(
+        '--match-threshold', type=float, default=DEFAULT_MATCH_THRESHOLD,
+        help='Minimum similarity for pairing an XML paragraph with a revised '
+             f'line inside a replaced block (default: {DEFAULT_MATCH_THRESHOLD})'
+    )
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=None,
+        help='Worker processes for diffing provisions (default: CPU count)'
+    )
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help='Plan the tracked changes and print counts without loading the '
+             'docx skill or writing anything'
+    )
+    parser.add_argument(
+        '--diff', choices=DIFF_LEVELS, default=DEFAULT_DIFF_LEVEL,
+        help='Diff level for tracked changes: word (whole words), refine (words, '
+             'then characters inside a reworded word) or char '
+             f'(default: {DEFAULT_DIFF_LEVEL})'
+    )
+    timings.add_arguments(parser, 'align')
     args = parser.parse_args()
 
     deal = os.path.abspath(args.deal_dir)
@@ -329,41 +520,53 @@ def main():
                  "This command requires a .docx-based deal prepared by prepare_deal.py.")
     if not os.path.isdir(prov_dir):
         sys.exit(f"ERROR: No provisions/ directory found in {deal}.")
+    timings.enable_from_args(args, 'apply_redlines', deal)
 
-    # Fix any UTF-16 encoded XML files
-    print("Checking for UTF-16 encoded files...")
-    fix_utf16_files(unpacked)
-
-    # Initialize Document library (handles infrastructure automatically)
-    print("Initializing Document library...")
-    doc = Document(unpacked, author="HK")
-    ed = doc["word/document.xml"]
-
-    # Build ordered list of all paragraphs with their text
-    all_paras = list(ed.dom.getElementsByTagName('w:p'))
-    all_texts = [extract_text(p) for p in all_paras]
-    all_norms = [nm(t) for t in all_texts]
-    print(f"  {len(all_paras)} total paragraphs")
+    # Stream all paragraphs (text, rPr, pPr) in a single pass over the XML
+    with timings.span("stream") as span:
+        records = stream_paragraphs(os.path.join(unpacked, 'word', 'document.xml'))
+        all_norms = [r.norm for r in records]
+        span.count(len(records))
+    print(f"  {len(records)} total paragraphs")
 
     # Find section boundaries
-    section_boundaries = find_section_boundaries(all_paras, all_norms)
+    section_boundaries = find_section_boundaries(records, all_norms)
     print(f"  Found sections: {sorted(section_boundaries.keys(), key=int)}")
 
-    # Collect reviewed provisions
+    # Locate every provision folder (review units included) in the XML, then
+    # collect the reviewed ones. Manifests come from deal.db when the deal has one.
+    with timings.span("locate") as span:
+        manifests = {}
+        deal_index = DealIndex.open_existing(deal)
+        if deal_index is not None:
+            with deal_index:
+                deal_index.sync()
+                manifests = deal_index.manifests()
+        folders = []
+        for prov_folder in sorted(os.listdir(prov_dir)):
+            prov_path = os.path.join(prov_dir, prov_folder)
+            manifest_path = os.path.join(prov_path, 'manifest.json')
+            if not os.path.isdir(prov_path) or not os.path.exists(manifest_path):
+                continue
+            manifest = manifests.get(prov_folder)
+            if manifest is None:
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+            folders.append((prov_folder, manifest,
+                            heading_signature(os.path.join(prov_path, 'original.txt'))))
+        ranges = locate_provisions(folders, all_norms, section_boundaries)
+        span.count(len(folders))
+
     provisions = []
-    for prov_folder in sorted(os.listdir(prov_dir)):
+    for prov_folder, manifest, _ in folders:
         prov_path = os.path.join(prov_dir, prov_folder)
-        if not os.path.isdir(prov_path):
-            continue
-        manifest_path = os.path.join(prov_path, 'manifest.json')
         revised_path = os.path.join(prov_path, 'revised.txt')
-        if not os.path.exists(revised_path) or not os.path.exists(manifest_path):
+        if not os.path.exists(revised_path):
             continue
-        with open(manifest_path) as f:
-            manifest = json.load(f)
         if manifest.get('status') != 'reviewed':
             continue
-        if 'full_agreement' in prov_folder:
+        # The unsplit fallback provision (units cut from it are applied)
+        if 'full_agreement' in prov_folder and 'parent' not in manifest:
             continue
         provisions.append({
             'folder': prov_folder,
@@ -375,7 +578,52 @@ def main():
 
     print(f"  {len(provisions)} reviewed provisions to apply")
 
-    # Process each provision
+    # Phase 1: diff every provision and prebuild its XML, in parallel
+    jobs, planned = [], []
+    for prov in provisions:
+        if prov['folder'] not in ranges:
+            continue
+        start, end = ranges[prov['folder']]
+        # This provision's non-empty XML paragraphs
+        prov_recs = [records[i] for i in range(start, end) if records[i].norm]
+        jobs.append((prov['revised_path'], prov_recs, args.match_threshold, args.diff))
+        planned.append((prov, prov_recs))
+    workers = max(1, min(args.jobs or os.cpu_count() or 1, len(jobs) or 1))
+    if timings.profiled():
+        workers = 1     # cProfile only sees this process
+    print(f"Planning {len(jobs)} provision(s) with {workers} worker(s)...")
+    with timings.span("plan", items=len(jobs)):
+        plans = iter(plan_all(jobs, workers))
+    plan_for = {prov['folder']: (prov_recs, next(plans)) for prov, prov_recs in planned}
+
+    if args.dry_run:
+        for prov in provisions:
+            print(f"\n--- {prov['title']} (Section {prov['section_number']}) ---")
+            if prov['folder'] not in plan_for:
+                print(f"  SKIP: Section {prov['section_number']} not found in XML")
+                continue
+            kinds = [op[0] for op in plan_for[prov['folder']][1]['ops']]
+            print(f"  Planned: {kinds.count('modify')} modifications, "
+                  f"{kinds.count('delete')} deletions, {kinds.count('insert')} insertions")
+        print("\nDry run: nothing written.")
+        return
+
+    # Fix any UTF-16 encoded XML files
+    print("Checking for UTF-16 encoded files...")
+    fix_utf16_files(unpacked)
+
+    # Initialize Document library (handles infrastructure automatically).
+    # The DOM is only used to locate and replace paragraphs that change.
+    print("Initializing Document library...")
+    with timings.span("load_dom"):
+        doc = load_skill().Document(unpacked, author="HK")
+        ed = doc["word/document.xml"]
+        all_paras = ed.dom.getElementsByTagName('w:p')
+    if len(all_paras) != len(records):
+        sys.exit(f"ERROR: Paragraph count mismatch between stream ({len(records)}) "
+                 f"and DOM ({len(all_paras)}) for word/document.xml")
+
+    # Phase 2: apply each provision's plan to the shared DOM, in document order
     total_mc, total_dc, total_ic = 0, 0, 0
 
     for prov in provisions:
@@ -383,118 +631,17 @@ def main():
         title = prov['title']
         print(f"\n--- {title} (Section {sec_num}) ---")
 
-        start, end = get_provision_range(sec_num, section_boundaries, len(all_paras))
-        if start is None:
+        if prov['folder'] not in plan_for:
             print(f"  SKIP: Section {sec_num} not found in XML")
             continue
+        prov_recs, plan = plan_for[prov['folder']]
+        print(f"  XML paragraphs: {len(prov_recs)}, Revised lines: {plan['revised_lines']}")
 
-        # Extract this provision's non-empty XML paragraphs
-        prov_paras = []
-        prov_texts = []
-        prov_norms = []
-        for i in range(start, end):
-            if all_norms[i]:
-                prov_paras.append(all_paras[i])
-                prov_texts.append(all_texts[i])
-                prov_norms.append(all_norms[i])
-
-        # Read revised.txt, stripping inline commentary markers.
-        # Use greedy match (.*) so nested brackets like $[X] inside a marker
-        # don't prematurely close the match.
-        def strip_markers(line):
-            line = re.sub(r'\s*\[(REVISED|NOTE|COMMENT|RECOMMENDATION):.*\]', '', line)
-            return line.rstrip('\n')
-
-        with open(prov['revised_path']) as f:
-            revised_raw = [
-                strip_markers(l)
-                for l in f if l.strip()
-            ]
-        rev_norms = [nm(l) for l in revised_raw]
-
-        print(f"  XML paragraphs: {len(prov_paras)}, Revised lines: {len(revised_raw)}")
-
-        # Paragraph-level alignment: XML paragraphs vs revised lines
-        sm = difflib.SequenceMatcher(None, prov_norms, rev_norms)
-        mc, dc, ic = 0, 0, 0
-
-        # We need to track the current anchor for insertions as paragraphs
-        # get modified. Use a mutable list to hold current paragraph nodes.
-        current_paras = list(prov_paras)  # copy — will be updated as we go
-
-        for tag, i1, i2, j1, j2 in sm.get_opcodes():
-            if tag == 'equal':
-                continue
-
-            elif tag == 'delete':
-                for k in range(i1, i2):
-                    try:
-                        ed.suggest_deletion(current_paras[k])
-                        dc += 1
-                    except Exception as e:
-                        print(f"    ERR delete: {e}")
-
-            elif tag == 'insert':
-                # Find anchor paragraph (the one just before the insertion point)
-                anchor = current_paras[i1 - 1] if i1 > 0 else current_paras[0]
-                for k in range(j1, j2):
-                    new_p = apply_insertion(ed, anchor, revised_raw[k])
-                    if new_p:
-                        anchor = new_p  # chain insertions
-                        ic += 1
-
-            elif tag == 'replace':
-                # Bipartite matching: pair XML paragraphs ↔ revised lines
-                orig_range = list(range(i1, i2))
-                rev_range = list(range(j1, j2))
-
-                used_rev = set()
-                matched = {}  # orig_idx -> rev_idx
-                for oi in orig_range:
-                    best_ri, best_r = None, 0
-                    for ri in rev_range:
-                        if ri in used_rev:
-                            continue
-                        r = difflib.SequenceMatcher(
-                            None, prov_norms[oi], rev_norms[ri]
-                        ).ratio()
-                        if r > best_r:
-                            best_ri, best_r = ri, r
-                    if best_ri is not None and best_r > 0.35:
-                        matched[oi] = best_ri
-                        used_rev.add(best_ri)
-
-                # Apply modifications for matched pairs
-                for oi, ri in sorted(matched.items()):
-                    new_p = apply_modification(
-                        ed, current_paras[oi],
-                        prov_texts[oi], revised_raw[ri]
-                    )
-                    if new_p:
-                        current_paras[oi] = new_p
-                        mc += 1
-
-                # Delete unmatched XML paragraphs
-                for oi in orig_range:
-                    if oi not in matched:
-                        try:
-                            ed.suggest_deletion(current_paras[oi])
-                            dc += 1
-                        except Exception as e:
-                            print(f"    ERR delete: {e}")
-
-                # Insert unmatched revised lines
-                inv_match = {ri: oi for oi, ri in matched.items()}
-                anchor = current_paras[i1 - 1] if i1 > 0 else current_paras[i1]
-                for ri in rev_range:
-                    if ri in inv_match:
-                        # Matched pair — update anchor to this paragraph
-                        anchor = current_paras[inv_match[ri]]
-                    else:
-                        new_p = apply_insertion(ed, anchor, revised_raw[ri])
-                        if new_p:
-                            anchor = new_p
-                            ic += 1
+        # Insertions anchor on the current node of each paragraph, so
+        # modified paragraphs are tracked as they are replaced.
+        current_paras = [all_paras[r.index] for r in prov_recs]
+        with timings.span("apply", label=prov['folder'], items=len(plan['ops'])):
+            mc, dc, ic = apply_plan(ed, current_paras, plan['ops'])
 
         print(f"  Applied: {mc} modifications, {dc} deletions, {ic} insertions")
         total_mc += mc
@@ -506,18 +653,29 @@ def main():
 
     # ---- Save with validation ----
     print("\nSaving and validating...")
-    try:
-        doc.save(unpacked)
-        print("  Validation passed!")
-    except ValueError as e:
-        print(f"  Validation failed: {e}")
-        doc.save(unpacked, validate=False)
-        print("  Saved without validation (review output manually)")
+    with timings.span("save"):
+        try:
+            doc.save(unpacked)
+            print("  Validation passed!")
+        except ValueError as e:
+            print(f"  Validation failed: {e}")
+            doc.save(unpacked, validate=False)
+            print("  Saved without validation (review output manually)")
 
     # ---- Pack to .docx ----
+    # Start from original.docx so media and other untouched parts are copied
+    # as stored; only the XML parts the Document library changed are rewritten.
     output_path = os.path.join(deal, args.output)
-    print(f"Packing → {args.output}")
-    pack_document(unpacked, output_path)
+    original_docx = os.path.join(deal, 'original.docx')
+    with timings.span("pack"):
+        if os.path.isfile(original_docx):
+            package = DocxPackage(original_docx)
+            changed = package.update_from(unpacked)
+            print(f"Packing → {args.output} ({len(changed)} part(s) rewritten)")
+            package.save(output_path)
+        else:
+            print(f"Packing → {args.output}")
+            load_skill().pack_document(unpacked, output_path)
     print(f"\nDone! Output: {output_path}")
 
 
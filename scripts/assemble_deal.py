@@ -9,91 +9,330 @@ Usage:
     python scripts/assemble_deal.py ./deal_review/
     python scripts/assemble_deal.py ./deal_review/ --format docx
     python scripts/assemble_deal.py ./deal_review/ --memo-only
+    python scripts/assemble_deal.py ./deal_review/ --format docx --timings
+
+When the deal has a deal.db index (see deal_index.py) it is synced first and
+the memo and changes tracker are built from indexed queries.
 """
 
 import argparse
+import hashlib
 import json
+import re
+import shutil
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from deal_index import DealIndex
+from docx_writer import write_markdown_docx
+from markup_core import timings
+from provision_lsh import ProvisionIndex
+from review_cache import ReviewCache
+
+
+# Provision files read lazily, and the attribute each is exposed as
+PROVISION_FILES = {
+    "original_text": "original.txt",
+    "revised_text": "revised.txt",
+    "analysis": "analysis.md",
+    "changes_summary": "changes_summary.md",
+}
+STORE_STATE_FILENAME = ".provision_store.json"
+REVISED_MARKER_RE = re.compile(r'\[REVISED:.*?\]')
+LEADING_BLANK_LINES_RE = re.compile(r'^(?:[ \t]*\n)+')
+TRAILING_BLANK_LINES_RE = re.compile(r'(?:\n[ \t]*)+$')
+
+
+class LazyProvision(dict):
+    """A provision dict whose text fields are read on first access."""
+
+    def __missing__(self, key):
+        filename = PROVISION_FILES.get(key)
+        if filename is None:
+            raise KeyError(key)
+        path = self["folder_path"] / filename
+        value = path.read_text(encoding='utf-8') if path.exists() else None
+        self[key] = value
+        return value
+
+    def read(self, key):
+        """Value of a lazy field without caching it (for one-pass streaming)."""
+        if key in self:
+            return self[key]
+        filename = PROVISION_FILES[key]
+        path = self["folder_path"] / filename
+        return path.read_text(encoding='utf-8') if path.exists() else None
+
+
+class ProvisionStore:
+    """Provisions of a deal, loaded lazily with a persistent manifest cache.
+
+    Parsed manifests and changes summaries are kept in
+    <deal_dir>/.provision_store.json keyed by file mtime and size, so a repeat
+    run only re-reads the provisions that changed. Other text is read on first
+    access. Consumers that must see each provision once (the review cache,
+    the similarity index) ask for pending(name) and call mark(name, ...).
+    """
+
+    def __init__(self, deal_dir: Path):
+        self.deal_dir = deal_dir
+        self.state_path = deal_dir / STORE_STATE_FILENAME
+        try:
+            self.state = json.loads(self.state_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.state = {}
+        self.state.setdefault("files", {})
+        self.state.setdefault("consumers", {})
+        self.fingerprints = {}   # folder -> {filename: [mtime_ns, size] or None}
+        self.reloaded = 0
+        self._dirty = False
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[list]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def _cached(self, folder: Path, filename: str, parse):
+        """Content of a stored file, re-read only if its mtime/size changed."""
+        entries = self.state["files"].setdefault(folder.name, {})
+        stat = self._stat(folder / filename)
+        entry = entries.get(filename)
+        if entry is not None and entry["stat"] == stat:
+            return entry["value"], False
+        value = parse((folder / filename).read_text(encoding='utf-8')) if stat else None
+        entries[filename] = {"stat": stat, "value": value}
+        self._dirty = True
+        return value, True
+
+    def load(self) -> list[dict]:
+        """All provisions in order, as LazyProvision dicts."""
+        provisions_dir = self.deal_dir / "provisions"
+        if not provisions_dir.exists():
+            return []
+
+        provisions = []
+        seen = set()
+        for folder in sorted(provisions_dir.iterdir()):
+            if not folder.is_dir() or not (folder / "manifest.json").exists():
+                continue
+            seen.add(folder.name)
+            manifest, m_changed = self._cached(folder, "manifest.json", json.loads)
+            summary, s_changed = self._cached(folder, "changes_summary.md", lambda t: t)
+            if m_changed or s_changed:
+                self.reloaded += 1
+            self.fingerprints[folder.name] = {
+                name: self._stat(folder / name) for name in PROVISION_FILES.values()
+            }
+            self.fingerprints[folder.name]["manifest.json"] = \
+                self.state["files"][folder.name]["manifest.json"]["stat"]
+            provisions.append(LazyProvision(
+                folder=folder.name,
+                folder_path=folder,
+                manifest=manifest,
+                changes_summary=summary,
+            ))
+
+        for name in set(self.state["files"]) - seen:
+            del self.state["files"][name]
+            self._dirty = True
+        return provisions
+
+    def pending(self, consumer: str, provisions: list[dict]) -> list[dict]:
+        """Provisions changed since consumer last marked them."""
+        done = self.state["consumers"].get(consumer, {})
+        return [p for p in provisions if done.get(p["folder"]) != self.fingerprints[p["folder"]]]
+
+    def mark(self, consumer: str, provisions: list[dict]) -> None:
+        """Record that consumer has processed these provisions."""
+        done = self.state["consumers"].setdefault(consumer, {})
+        for p in provisions:
+            done[p["folder"]] = self.fingerprints[p["folder"]]
+            self._dirty = True
+
+    def save(self) -> None:
+        if self._dirty:
+            self.state_path.write_text(json.dumps(self.state), encoding='utf-8')
+            self._dirty = False
+
+
+BUILD_STATE_FILENAME = ".build_state.json"
+
+
+class BuildState:
+    """Input fingerprints of each deliverable, in <output_dir>/.build_state.json.
+
+    A deliverable is rebuilt only when the fingerprint of its inputs differs
+    from the one recorded when it was last written, or its output is missing.
+    """
+
+    def __init__(self, output_dir: Path, force: bool = False):
+        self.output_dir = output_dir
+        self.path = output_dir / BUILD_STATE_FILENAME
+        self.state = {}
+        if not force:
+            try:
+                self.state = json.loads(self.path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def fingerprint(*inputs) -> str:
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def current(self, name: str, digest: str) -> Optional[Path]:
+        """The existing output if name was built from these inputs, else None."""
+        entry = self.state.get(name)
+        if entry and entry["inputs"] == digest and (self.output_dir / entry["output"]).exists():
+            return self.output_dir / entry["output"]
+        return None
+
+    def record(self, name: str, digest: str, output: Path) -> None:
+        self.state[name] = {"inputs": digest, "output": Path(output).name,
+                            "built_at": datetime.now(timezone.utc).isoformat()}
+
+    def save(self) -> None:
+        self.path.write_text(json.dumps(self.state, indent=2), encoding='utf-8')
+
+
+def provision_inputs(store: ProvisionStore, provisions: list[dict], files: list[str]) -> list:
+    """Fingerprint inputs for the given provision files, in provision order."""
+    return [[p["folder"], [store.fingerprints[p["folder"]][f] for f in files]]
+            for p in provisions]
+
+
+def file_input(path: Path) -> Optional[str]:
+    """Content hash of a deal-level input file (None if absent)."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def generator_inputs() -> dict:
+    """Content hash of this script and of every local module it imported.
+
+    Part of each deliverable's fingerprint, so a change to docx_writer.py,
+    deal_index.py or markup_core rebuilds the outputs as well as a change here.
+    """
+    scripts_dir = Path(__file__).resolve().parent
+    hashes = {}
+    for module in list(sys.modules.values()):
+        path = getattr(module, '__file__', None)
+        if not path:
+            continue
+        path = Path(path).resolve()
+        if path.suffix == '.py' and path.is_relative_to(scripts_dir):
+            hashes[path.relative_to(scripts_dir).as_posix()] = file_input(path)
+    return hashes
+
 
 def load_provisions(deal_dir: Path) -> list[dict]:
     """Load all provisions in order with their review status and content."""
-    provisions_dir = deal_dir / "provisions"
-    if not provisions_dir.exists():
-        return []
+    return ProvisionStore(deal_dir).load()
 
-    provisions = []
-    for folder in sorted(provisions_dir.iterdir()):
-        if not folder.is_dir():
-            continue
-
-        manifest_path = folder / "manifest.json"
-        if not manifest_path.exists():
-            continue
 
-        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+def store_in_review_cache(deal_dir: Path, provisions: list[dict], config: dict,
+                          cache: ReviewCache) -> int:
+    """Add this deal's reviewed provisions to the cross-deal review cache.
 
-        provision = {
-            "folder": folder.name,
-            "folder_path": folder,
-            "manifest": manifest,
-            "original_text": None,
-            "revised_text": None,
-            "analysis": None,
-            "changes_summary": None,
+    Provisions that were themselves filled from the cache are skipped, and
+    an entry from an earlier review of the same text is replaced. Returns the
+    number of entries written.
+    """
+    posture = config.get("review_posture", "")
+    skills = [s["name"] for s in config.get("skills", [])]
+    stored = 0
+    for p in provisions:
+        m = p["manifest"]
+        if m.get("status") != "reviewed" or m.get("review_source") == "cache":
+            continue
+        if not p["original_text"] or not p["revised_text"]:
+            continue
+        key = ReviewCache.key(p["original_text"], posture, skills)
+        files = {
+            "revised.txt": p["revised_text"],
+            "analysis.md": p["analysis"],
+            "changes_summary.md": p["changes_summary"],
         }
+        if cache.put(key, files, m, source=f"{deal_dir.resolve().name}/{p['folder']}"):
+            stored += 1
+    if stored:
+        cache.evict()
+    return stored
 
-        # Load available content
-        for filename, key in [
-            ("original.txt", "original_text"),
-            ("revised.txt", "revised_text"),
-            ("analysis.md", "analysis"),
-            ("changes_summary.md", "changes_summary"),
-        ]:
-            file_path = folder / filename
-            if file_path.exists():
-                provision[key] = file_path.read_text(encoding='utf-8')
 
-        provisions.append(provision)
+def _provision_text(p: dict) -> str:
+    """Revised text if available, otherwise original, without keeping it cached."""
+    read = p.read if isinstance(p, LazyProvision) else p.__getitem__
+    return read("revised_text") or read("original_text") or ""
 
-    return provisions
 
+def _stitch(provisions: list[dict], clean=lambda text: text):
+    """Yield provision texts with the separator before each.
 
-def assemble_revised_agreement(provisions: list[dict]) -> str:
-    """Combine all revised (or original) provisions into a single document."""
-    parts = []
+    Review units split from one article (see provision_units.py) are
+    rejoined with the spacing and indentation they had in the article;
+    everything else is stripped and separated by a blank line.
+    """
+    started, parent = False, None
     for p in provisions:
-        # Use revised text if available, otherwise original
-        text = p["revised_text"] or p["original_text"] or ""
+        m = p["manifest"]
+        text = _provision_text(p)
         if text:
-            # Remove inline revision markers for the clean version
-            import re
-            clean_text = re.sub(r'\[REVISED:.*?\]', '', text)
-            parts.append(clean_text.strip())
+            text = clean(text)
+            if m.get("part", 1) < m.get("parts", 1):
+                # More of the article follows: keep the last line's own whitespace
+                text = TRAILING_BLANK_LINES_RE.sub('', text)
+            else:
+                text = text.rstrip()
+            if started and m.get("part", 1) > 1 and m.get("parent") == parent:
+                yield '\n' * (m.get("blank_lines_before", 1) + 1) + \
+                    LEADING_BLANK_LINES_RE.sub('', text)
+            else:
+                yield ('\n\n' if started else '') + text.lstrip()
+            started = True
+        parent = m.get("parent")
 
-    return '\n\n'.join(parts)
+
+def iter_revised_agreement(provisions: list[dict]):
+    """Yield the clean revised agreement provision by provision."""
+    # Remove inline revision markers for the clean version
+    return _stitch(provisions, lambda text: REVISED_MARKER_RE.sub('', text))
+
+
+def iter_redline_agreement(provisions: list[dict]):
+    """Yield the agreement with revision markers, provision by provision."""
+    return _stitch(provisions)
+
+
+def assemble_revised_agreement(provisions: list[dict]) -> str:
+    """Combine all revised (or original) provisions into a single document."""
+    return ''.join(iter_revised_agreement(provisions))
 
 
 def assemble_redline_agreement(provisions: list[dict]) -> str:
     """Combine all provisions keeping revision markers visible."""
-    parts = []
-    for p in provisions:
-        text = p["revised_text"] or p["original_text"] or ""
-        if text:
-            parts.append(text.strip())
+    return ''.join(iter_redline_agreement(provisions))
+
 
-    return '\n\n'.join(parts)
+def write_chunks(chunks, output_path: Path) -> Path:
+    """Write an iterable of text chunks to a file without joining them."""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.writelines(chunks)
+    return output_path
 
 
-def generate_review_memo(
+def iter_review_memo(
     deal_dir: Path,
     provisions: list[dict],
     config: dict,
-) -> str:
-    """Generate a client-facing review summary memo."""
+):
+    """Yield a client-facing review summary memo in pieces."""
     posture = config.get("review_posture", "unknown")
     now = datetime.now(timezone.utc).strftime("%B %d, %Y")
 
@@ -111,7 +350,7 @@ def generate_review_memo(
         for issue in m.get("open_issues", []):
             all_open_issues.append(f"  - [{m['title']}] {issue}")
 
-    memo = f"""# DEAL REVIEW MEMORANDUM
+    yield f"""# DEAL REVIEW MEMORANDUM
 ## Confidential — Attorney Work Product
 
 **Date:** {now}
@@ -140,31 +379,31 @@ before delivery to any party.
     for p in provisions:
         m = p["manifest"]
         status_icon = "✅" if m.get("status") == "reviewed" else "⏳"
-        memo += f"### {status_icon} {m['title']}\n\n"
+        yield f"### {status_icon} {m['title']}\n\n"
 
         if p["changes_summary"]:
             # Extract just the key points from the changes summary
-            memo += p["changes_summary"] + "\n\n"
+            yield p["changes_summary"] + "\n\n"
         elif m.get("status") == "reviewed":
-            memo += "*Reviewed — see individual provision analysis for details.*\n\n"
+            yield "*Reviewed — see individual provision analysis for details.*\n\n"
         else:
-            memo += "*Pending review.*\n\n"
+            yield "*Pending review.*\n\n"
 
-        memo += "---\n\n"
+        yield "---\n\n"
 
     # Cross-reference issues
     if all_flags:
-        memo += "## Cross-Reference Issues\n\n"
-        memo += "The following cross-reference conflicts were identified during review:\n\n"
-        memo += '\n'.join(all_flags) + "\n\n---\n\n"
+        yield "## Cross-Reference Issues\n\n"
+        yield "The following cross-reference conflicts were identified during review:\n\n"
+        yield '\n'.join(all_flags) + "\n\n---\n\n"
 
     # Open issues
     if all_open_issues:
-        memo += "## Open Issues Requiring Client Input\n\n"
-        memo += "The following items require business-point decisions:\n\n"
-        memo += '\n'.join(all_open_issues) + "\n\n---\n\n"
+        yield "## Open Issues Requiring Client Input\n\n"
+        yield "The following items require business-point decisions:\n\n"
+        yield '\n'.join(all_open_issues) + "\n\n---\n\n"
 
-    memo += """## Disclaimer
+    yield """## Disclaimer
 
 This review was performed using an AI-assisted workflow. While the AI agent had access
 to the full agreement for context and followed structured legal analysis methodology,
@@ -172,56 +411,53 @@ all output should be treated as a first draft requiring attorney review. Defined
 cross-references, and legal conclusions should be independently verified.
 """
 
-    return memo
 
+def generate_review_memo(
+    deal_dir: Path,
+    provisions: list[dict],
+    config: dict,
+) -> str:
+    """Generate a client-facing review summary memo."""
+    return ''.join(iter_review_memo(deal_dir, provisions, config))
 
-def generate_changes_tracker(provisions: list[dict]) -> str:
-    """Generate a consolidated changes tracking document."""
-    tracker = "# CHANGES TRACKER\n\n"
-    tracker += "| # | Provision | Status | Changes | Open Issues |\n"
-    tracker += "|---|-----------|--------|---------|-------------|\n"
+
+def iter_changes_tracker(provisions: list[dict]):
+    """Yield a consolidated changes tracking document row by row."""
+    yield "# CHANGES TRACKER\n\n"
+    yield "| # | Provision | Status | Changes | Open Issues |\n"
+    yield "|---|-----------|--------|---------|-------------|\n"
 
     for p in provisions:
         m = p["manifest"]
         status = m.get("status", "pending")
         changes = "See analysis" if p["changes_summary"] else "—"
         issues = str(len(m.get("open_issues", []))) + " issues" if m.get("open_issues") else "None"
-        tracker += f"| {m['section_number']} | {m['title'][:40]} | {status} | {changes} | {issues} |\n"
+        yield f"| {m['section_number']} | {m['title'][:40]} | {status} | {changes} | {issues} |\n"
 
-    return tracker
 
+def generate_changes_tracker(provisions: list[dict]) -> str:
+    """Generate a consolidated changes tracking document."""
+    return ''.join(iter_changes_tracker(provisions))
 
-def write_docx(text: str, output_path: Path, title: str = "Document"):
-    """Write text to a .docx file (requires python-docx)."""
-    try:
-        from docx import Document
-        from docx.shared import Pt, Inches
-    except ImportError:
-        print("Warning: python-docx not available. Saving as .txt instead.")
-        output_path = output_path.with_suffix('.txt')
-        output_path.write_text(text, encoding='utf-8')
-        return output_path
-
-    doc = Document()
-
-    # Simple conversion: split by lines and headings
-    for line in text.split('\n'):
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if stripped.startswith('# '):
-            doc.add_heading(stripped[2:], level=1)
-        elif stripped.startswith('## '):
-            doc.add_heading(stripped[3:], level=2)
-        elif stripped.startswith('### '):
-            doc.add_heading(stripped[4:], level=3)
-        elif stripped.startswith('---'):
-            doc.add_paragraph('_' * 50)
-        else:
-            doc.add_paragraph(stripped)
 
-    doc.save(str(output_path))
-    return output_path
+def iter_lines(chunks):
+    """Split an iterable of text chunks into lines (like str.split('\\n'))."""
+    pending = ''
+    for chunk in chunks:
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()
+        yield from lines
+    yield pending
+
+
+def write_docx(text, output_path: Path, title: str = "Document", tables: bool = True):
+    """Write markdown text (a string or an iterable of chunks) to a .docx file.
+
+    Pass tables=False for agreement text, whose lines may start with "|".
+    """
+    chunks = [text] if isinstance(text, str) else text
+    with timings.span("docx", label=Path(output_path).name):
+        return write_markdown_docx(iter_lines(chunks), output_path, title, tables)
 
 
 def main():
@@ -235,6 +471,19 @@ def main():
                         help='Generate only the review memo')
     parser.add_argument('--output-dir', '-o',
                         help='Output directory (default: <deal_dir>/deliverables/)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every deliverable even if its inputs are unchanged')
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help='Do not add reviewed provisions to the cross-deal review cache')
+    parser.add_argument('--cache-dir',
+                        help='Review cache location (default: $MARKUP_CACHE_DIR or '
+                             '~/.cache/markup/review_cache)')
+    parser.add_argument('--no-index', dest='index', action='store_false',
+                        help='Do not add reviewed provisions to the similarity index')
+    parser.add_argument('--library-dir',
+                        help='Deals root holding the similarity index '
+                             '(default: parent of deal_dir)')
+    timings.add_arguments(parser, 'docx')
 
     args = parser.parse_args()
 
@@ -242,6 +491,7 @@ def main():
     if not deal_dir.exists():
         print(f"Error: Directory not found: {deal_dir}")
         return 1
+    timings.enable_from_args(args, 'assemble_deal', deal_dir)
 
     output_dir = Path(args.output_dir) if args.output_dir else deal_dir / "deliverables"
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -253,78 +503,129 @@ def main():
         config = json.loads(config_path.read_text(encoding='utf-8'))
 
     # Load provisions
-    provisions = load_provisions(deal_dir)
+    store = ProvisionStore(deal_dir)
+    with timings.span("load") as span:
+        provisions = store.load()
+        span.count(len(provisions))
     if not provisions:
         print("Error: No provisions found in deal directory.")
         return 1
 
+    # Memo and tracker rows: indexed queries when the deal has deal.db
+    summaries = provisions
+    deal_index = DealIndex.open_existing(deal_dir)
+    if deal_index is not None:
+        with deal_index, timings.span("deal_db") as span:
+            span.count(deal_index.sync())
+            summaries = deal_index.summaries()
+
     reviewed = sum(1 for p in provisions if p["manifest"].get("status") == "reviewed")
     print(f"\n{'='*60}")
     print(f"Assembling Deliverables")
     print(f"{'='*60}")
-    print(f"Provisions: {len(provisions)} total, {reviewed} reviewed")
+    print(f"Provisions: {len(provisions)} total, {reviewed} reviewed "
+          f"({store.reloaded} changed since last run)")
     print()
 
+    if args.cache:
+        changed = store.pending("review_cache", provisions)
+        with timings.span("review_cache", items=len(changed)):
+            stored = store_in_review_cache(deal_dir, changed, config,
+                                           ReviewCache(args.cache_dir))
+        store.mark("review_cache", changed)
+        if stored:
+            print(f"♻️  {stored} reviewed provision(s) stored in the review cache")
+
+    if args.index:
+        changed = store.pending("similarity_index", provisions)
+        with timings.span("similarity_index", items=len(changed)):
+            index = ProvisionIndex(Path(args.library_dir or deal_dir.resolve().parent))
+            indexed = index.add_deal(deal_dir, folders=[p["folder"] for p in changed])
+        store.mark("similarity_index", changed)
+        if indexed:
+            print(f"🔎 {indexed} reviewed provision(s) added to the similarity index "
+                  f"({len(index):,} total)")
+
     ext = '.docx' if args.format == 'docx' else '.txt'
 
+    # Each deliverable is rebuilt only when its inputs changed since the last run
+    build = BuildState(output_dir, force=args.force)
+    generator = generator_inputs()
+    summary_inputs = provision_inputs(store, provisions, ["manifest.json", "changes_summary.md"])
+    text_inputs = provision_inputs(store, provisions, ["original.txt", "revised.txt"])
+
+    def deliverable(name, label, inputs, make):
+        digest = build.fingerprint(generator, inputs)
+        path = build.current(name, digest)
+        if path is not None:
+            print(f"✅ {label} (unchanged): {path}")
+            return
+        with timings.span("deliverable", label=name):
+            path = make()
+        build.record(name, digest, path)
+        print(f"✅ {label}: {path}")
+
     # 1. Review Memo (always generated)
-    memo = generate_review_memo(deal_dir, provisions, config)
-    if args.format == 'docx':
-        memo_path = write_docx(memo, output_dir / "review_memo.docx", "Review Memorandum")
-    else:
-        memo_path = output_dir / "review_memo.md"
-        memo_path.write_text(memo, encoding='utf-8')
-    print(f"✅ Review memo: {memo_path}")
+    def make_memo():
+        memo = iter_review_memo(deal_dir, summaries, config)
+        if args.format == 'docx':
+            return write_docx(memo, output_dir / "review_memo.docx", "Review Memorandum")
+        return write_chunks(memo, output_dir / "review_memo.md")
+
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    deliverable("review_memo", "Review memo",
+                [args.format, summary_inputs, file_input(config_path), today], make_memo)
 
     if args.memo_only:
+        build.save()
+        store.save()
         return 0
 
     # 2. Revised Agreement (clean)
-    revised = assemble_revised_agreement(provisions)
-    if args.format == 'docx':
-        revised_path = write_docx(revised, output_dir / "revised_agreement.docx")
-    else:
-        revised_path = output_dir / "revised_agreement.txt"
-        revised_path.write_text(revised, encoding='utf-8')
-    print(f"✅ Revised agreement (clean): {revised_path}")
+    def make_revised():
+        revised = iter_revised_agreement(provisions)
+        if args.format == 'docx':
+            return write_docx(revised, output_dir / "revised_agreement.docx", tables=False)
+        return write_chunks(revised, output_dir / "revised_agreement.txt")
+
+    deliverable("revised_agreement", "Revised agreement (clean)", [args.format, text_inputs],
+                make_revised)
 
     # 3. Redline Agreement (with markers)
-    redline = assemble_redline_agreement(provisions)
-    redline_path = output_dir / "redline_agreement.txt"
-    redline_path.write_text(redline, encoding='utf-8')
-    print(f"✅ Redline agreement: {redline_path}")
+    def make_redline():
+        return write_chunks(iter_redline_agreement(provisions),
+                            output_dir / "redline_agreement.txt")
+
+    deliverable("redline_agreement", "Redline agreement", text_inputs, make_redline)
 
     # 4. Changes Tracker
-    tracker = generate_changes_tracker(provisions)
-    tracker_path = output_dir / "changes_tracker.md"
-    tracker_path.write_text(tracker, encoding='utf-8')
-    print(f"✅ Changes tracker: {tracker_path}")
-
-    # 5. Copy reconciliation report if it exists
-    recon_path = deal_dir / "reconciliation_report.md"
-    if recon_path.exists():
-        import shutil
-        dest = output_dir / "reconciliation_report.md"
-        shutil.copy2(recon_path, dest)
-        print(f"✅ Reconciliation report: {dest}")
-
-    # 6. Copy term sheet compliance report if it exists
-    ts_report = deal_dir / "term_sheet_compliance_report.md"
-    if ts_report.exists():
-        dest = output_dir / "term_sheet_compliance_report.md"
-        shutil.copy2(ts_report, dest)
-        print(f"✅ Term sheet compliance report: {dest}")
-
-    # 7. Copy redline Word document if it exists
-    redline_docx = deal_dir / "redline_agreement.docx"
-    if redline_docx.exists():
-        dest = output_dir / "redline_agreement.docx"
-        shutil.copy2(redline_docx, dest)
-        print(f"✅ Redline Word document: {dest}")
-    elif (deal_dir / "unpacked").exists():
+    def make_tracker():
+        tracker = iter_changes_tracker(summaries)
+        if args.format == 'docx':
+            return write_docx(tracker, output_dir / "changes_tracker.docx", "Changes Tracker")
+        return write_chunks(tracker, output_dir / "changes_tracker.md")
+
+    deliverable("changes_tracker", "Changes tracker", [args.format, summary_inputs],
+                make_tracker)
+
+    # 5-7. Copy reconciliation / term sheet reports and the redline Word document
+    for filename, label in [
+        ("reconciliation_report.md", "Reconciliation report"),
+        ("term_sheet_compliance_report.md", "Term sheet compliance report"),
+        ("redline_agreement.docx", "Redline Word document"),
+    ]:
+        source = deal_dir / filename
+        if source.exists():
+            dest = output_dir / filename
+            deliverable(filename, label, file_input(source),
+                        lambda source=source, dest=dest: Path(shutil.copy2(source, dest)))
+    if not (deal_dir / "redline_agreement.docx").exists() and (deal_dir / "unpacked").exists():
         print(f"ℹ️  Unpacked .docx found but no redline generated yet.")
         print(f"    Run /apply-redlines to produce a Word document with tracked changes.")
 
+    build.save()
+    store.save()
+
     print(f"\n{'='*60}")
     print(f"All deliverables saved to: {output_dir}")
     print(f"{'='*60}\n")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+context_bundle.py — Per-provision context bundles for parallel review agents.
+
+Every /review-all agent used to read the whole of full_agreement.txt plus the
+full definitions provision, so a deal with N provisions loaded the agreement
+N times. This script writes a context.md into each provision folder that
+holds only what that provision needs:
+
+    - the review posture, client notes and the review_config.json
+      preferences that bear on its text (cure periods only if it mentions
+      cure, transfer restrictions only if it mentions transfers, ...)
+    - the definition paragraph of every defined term it uses that is defined
+      in another provision
+    - the text of every Section it cross-references in another provision,
+      and of the Sections those cite, to --depth levels
+
+and records an estimate of the bundle's size in manifest.json
+("context_tokens", alongside "context_terms" and "context_sections").
+
+Definitions and sections come from revised.txt where a provision has one,
+so re-running after the definitions are reviewed gives the parallel agents
+the revised definitions.
+
+Usage:
+    python scripts/context_bundle.py ./deal_review/
+    python scripts/context_bundle.py ./deal_review/ --depth 1
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from pathlib import Path
+
+from defined_terms import update_terms_index
+from provision_units import TOKENS_PER_WORD
+from xref_graph import heading_key, index_targets, scan_references
+
+
+CONTEXT_FILENAME = "context.md"
+DEFAULT_DEPTH = 2
+MAX_SECTION_WORDS = 1200      # longer targets (usually whole articles) are cut off here
+
+# Preferences shown only to provisions whose text matches the pattern;
+# everything else in "preferences" is always shown.
+PREFERENCE_TRIGGERS = {
+    "cure_period_minimum_days": re.compile(r'\bcure', re.IGNORECASE),
+    "notice_period_minimum_days": re.compile(r'\bnotice', re.IGNORECASE),
+    "flag_springing_recourse": re.compile(r'\brecourse|\bguarant', re.IGNORECASE),
+    "flag_cash_management_triggers": re.compile(
+        r'cash management|lockbox|lock box|cash sweep|cash trap|deposit account', re.IGNORECASE),
+    "flag_transfer_restrictions": re.compile(
+        r'\btransfer|\bassign|change of control|\bencumb', re.IGNORECASE),
+    "require_lender_reasonableness": re.compile(
+        r'discretion|\bconsent|\bapprov|satisfactory to', re.IGNORECASE),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (words × TOKENS_PER_WORD)."""
+    return math.ceil(len(text.split()) * TOKENS_PER_WORD)
+
+
+def load_texts(deal_dir: Path) -> dict:
+    """folder -> lines of its revised.txt (or original.txt), in agreement order."""
+    texts = {}
+    for folder in sorted((deal_dir / "provisions").iterdir()):
+        source = folder / "revised.txt"
+        if not source.exists():
+            source = folder / "original.txt"
+        if source.exists():
+            texts[folder.name] = source.read_text(encoding='utf-8').split('\n')
+    return texts
+
+
+def section_text(lines: list[str], paragraph: int, key: str) -> tuple[str, bool]:
+    """Text of the target headed at lines[paragraph], up to the next heading outside it.
+
+    A Section runs to the next heading that is not one of its subsections, an
+    Article to the next Article. Returns (text, truncated); text is cut at
+    MAX_SECTION_WORDS.
+    """
+    article = key.startswith("Article ")
+    out, words = [lines[paragraph]], len(lines[paragraph].split())
+    for line in lines[paragraph + 1:]:
+        next_key = heading_key(line)
+        if next_key and (next_key.startswith("Article ") if article
+                         else not next_key.startswith(key + '.')):
+            break
+        words += len(line.split())
+        if words > MAX_SECTION_WORDS:
+            return '\n'.join(out).strip(), True
+        out.append(line)
+    return '\n'.join(out).strip(), False
+
+
+def relevant_preferences(config: dict, text: str) -> dict:
+    """The review_config.json preferences that apply to a provision's text."""
+    return {name: value for name, value in config.get("preferences", {}).items()
+            if name not in PREFERENCE_TRIGGERS or PREFERENCE_TRIGGERS[name].search(text)}
+
+
+def collect_sections(folder: str, text: str, texts: dict, targets: dict, depth: int) -> list[dict]:
+    """Sections in other provisions cited by text, breadth-first to depth levels."""
+    found = {}
+    frontier = [(text, None)]
+    for level in range(1, depth + 1):
+        next_frontier = []
+        for source, via in frontier:
+            for display, key, _, _ in scan_references(source):
+                target = targets.get(key)
+                if target is None or target["folder"] == folder or key in found:
+                    continue
+                body, truncated = section_text(texts[target["folder"]], target["paragraph"], key)
+                found[key] = {"key": key, "ref": display, "folder": target["folder"],
+                              "paragraph": target["paragraph"], "level": level,
+                              "via": via, "text": body, "truncated": truncated}
+                next_frontier.append((body, key))
+        frontier = next_frontier
+    return sorted(found.values(), key=lambda s: (s["level"], s["folder"], s["paragraph"]))
+
+
+def collect_definitions(folder: str, terms_index: dict, texts: dict) -> list[dict]:
+    """Definition paragraphs of terms used in folder but defined in another provision."""
+    usages = terms_index["provisions"].get(folder, {}).get("usages", {})
+    definitions = []
+    for term in sorted(usages):
+        loc = terms_index["terms"].get(term, {}).get("defined_in")
+        if not loc or loc["folder"] == folder or loc["folder"] not in texts:
+            continue
+        lines = texts[loc["folder"]]
+        if loc["paragraph"] < len(lines):
+            definitions.append({"term": term, "folder": loc["folder"],
+                                "paragraph": loc["paragraph"],
+                                "text": lines[loc["paragraph"]].strip()})
+    return definitions
+
+
+def render_bundle(title: str, folder: str, config: dict, preferences: dict,
+                  definitions: list[dict], sections: list[dict]) -> str:
+    """context.md for one provision."""
+    parts = [f"# Review Context — {title}\n\n"
+             f"Everything below is quoted from other provisions of the agreement for "
+             f"reference while reviewing `provisions/{folder}/original.txt`. Open "
+             f"`full_agreement.txt` only if something you need is missing.\n\n"
+             f"## Review Preferences\n\n"
+             f"- Posture: {config.get('review_posture', 'unknown').replace('_', ' ')}\n"]
+    if config.get("client_notes"):
+        parts.append(f"- Client notes: {config['client_notes']}\n")
+    for name, value in preferences.items():
+        parts.append(f"- {name}: {json.dumps(value)}\n")
+
+    parts.append(f"\n## Defined Terms Used ({len(definitions)})\n\n")
+    if not definitions:
+        parts.append("*None defined outside this provision.*\n\n")
+    # Terms defined in the same paragraph (parties in a preamble) are listed together
+    by_paragraph = {}
+    for d in definitions:
+        by_paragraph.setdefault((d["folder"], d["paragraph"]), []).append(d)
+    for (def_folder, paragraph), group in sorted(by_paragraph.items()):
+        terms = ', '.join(f"**{d['term']}**" for d in group)
+        parts.append(f"{terms} — `{def_folder}` ¶{paragraph}\n\n> {group[0]['text']}\n\n")
+
+    parts.append(f"## Cross-Referenced Sections ({len(sections)})\n\n")
+    if not sections:
+        parts.append("*No references to other provisions.*\n\n")
+    for s in sections:
+        source = "cited directly" if s["via"] is None else f"cited by {s['via']}"
+        parts.append(f"### {s['key']} — `{s['folder']}` ¶{s['paragraph']} ({source})\n\n"
+                     + '\n'.join(line.strip() for line in s['text'].split('\n')) + "\n\n")
+        if s["truncated"]:
+            parts.append(f"*… continues in `provisions/{s['folder']}/original.txt`.*\n\n")
+    return ''.join(parts)
+
+
+def write_context_bundles(deal_dir: Path, depth: int = DEFAULT_DEPTH) -> dict:
+    """Write context.md into every provision folder and record its size in manifest.json.
+
+    The defined-term index is refreshed first (only changed provisions are
+    rescanned), so its paragraphs line up with the texts quoted here.
+    Returns {folder: estimated tokens}.
+    """
+    deal_dir = Path(deal_dir)
+    config_path = deal_dir / "review_config.json"
+    config = json.loads(config_path.read_text(encoding='utf-8')) if config_path.exists() else {}
+    terms_index, _ = update_terms_index(deal_dir)
+    texts = load_texts(deal_dir)
+    targets = index_targets([(name, '\n'.join(lines)) for name, lines in texts.items()])
+
+    sizes = {}
+    for folder, lines in texts.items():
+        folder_path = deal_dir / "provisions" / folder
+        manifest_path = folder_path / "manifest.json"
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        text = '\n'.join(lines)
+        definitions = collect_definitions(folder, terms_index, texts)
+        sections = collect_sections(folder, text, texts, targets, depth)
+        bundle = render_bundle(manifest.get("title", folder), folder, config,
+                               relevant_preferences(config, text), definitions, sections)
+        (folder_path / CONTEXT_FILENAME).write_text(bundle, encoding='utf-8')
+
+        sizes[folder] = estimate_tokens(bundle)
+        updated = {**manifest,
+                   "context_tokens": sizes[folder],
+                   "context_terms": len(definitions),
+                   "context_sections": [s["key"] for s in sections]}
+        if updated != manifest:
+            manifest_path.write_text(json.dumps(updated, indent=2), encoding='utf-8')
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write a minimal context.md into each provision folder.",
+    )
+    parser.add_argument('deal_dir', help='Path to the deal review directory')
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH,
+                        help='Levels of cross-references to follow '
+                             f'(default: {DEFAULT_DEPTH}; 0 includes none)')
+    args = parser.parse_args()
+
+    deal_dir = Path(args.deal_dir)
+    if not (deal_dir / "provisions").is_dir():
+        print(f"Error: No provisions directory in {deal_dir}")
+        return 1
+
+    sizes = write_context_bundles(deal_dir, depth=args.depth)
+    full_path = deal_dir / "full_agreement.txt"
+    full_tokens = estimate_tokens(full_path.read_text(encoding='utf-8')) if full_path.exists() else 0
+    average = sum(sizes.values()) // max(len(sizes), 1)
+    print(f"✅ context.md written for {len(sizes)} provisions "
+          f"(~{average:,} tokens on average"
+          + (f" vs ~{full_tokens:,} for full_agreement.txt)" if full_tokens else ")"))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
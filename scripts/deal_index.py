@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+deal_index.py — SQLite index of a deal workspace (deal.db).
+
+Mirrors every provision folder into <deal_dir>/deal.db: the manifest
+(status, title, section number, word count, review-unit fields and the full
+JSON), its cross-reference flags and open issues, its changes summary, and
+the size, mtime and SHA-256 of each provision file. Review status, the
+review memo and the changes tracker are then a few indexed queries instead
+of a directory walk that parses every manifest.json.
+
+The folders stay the source of truth: review agents keep writing
+manifest.json and revised.txt, and sync() re-reads only the files whose
+size or mtime changed. prepare_deal.py creates the index (--no-db skips it)
+and syncs it; --status, assemble_deal.py and apply_redlines.py sync it
+before reading. The database runs in WAL mode, so queries read while
+another process syncs. Deleting deal.db is always safe; `rebuild`
+recreates it from the folders.
+
+Usage:
+    python scripts/deal_index.py status ./deal_review/
+    python scripts/deal_index.py flagged ./deal_review/
+    python scripts/deal_index.py sync ./deal_review/
+    python scripts/deal_index.py rebuild ./deal_review/
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Optional
+
+
+DB_FILENAME = "deal.db"
+SCHEMA_VERSION = 1
+BUSY_TIMEOUT_SECONDS = 30
+# Provision files whose size, mtime and hash are mirrored
+INDEXED_FILES = ("manifest.json", "original.txt", "revised.txt", "analysis.md",
+                 "changes_summary.md", "context.md")
+# Manifest lists mirrored as flag rows, by kind
+FLAG_KINDS = {"cross_ref_flags": "cross_ref", "open_issues": "open_issue"}
+
+SCHEMA = """
+CREATE TABLE provisions (
+    folder          TEXT PRIMARY KEY,
+    section_number  TEXT,
+    title           TEXT NOT NULL,
+    status          TEXT NOT NULL,
+    reviewed_at     TEXT,
+    word_count      INTEGER,
+    parent_section  TEXT,
+    part            INTEGER,
+    parts           INTEGER,
+    content_hash    TEXT,
+    changes_summary TEXT,
+    manifest        TEXT NOT NULL
+);
+CREATE INDEX provisions_status ON provisions (status);
+
+CREATE TABLE flags (
+    folder    TEXT NOT NULL,
+    kind      TEXT NOT NULL,
+    position  INTEGER NOT NULL,
+    value     TEXT NOT NULL,
+    PRIMARY KEY (folder, kind, position)
+);
+CREATE INDEX flags_kind ON flags (kind);
+
+CREATE TABLE files (
+    folder    TEXT NOT NULL,
+    name      TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    sha256    TEXT NOT NULL,
+    PRIMARY KEY (folder, name)
+);
+"""
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class DealIndex:
+    """deal.db for one deal directory; created (empty) if missing."""
+
+    def __init__(self, deal_dir: Path):
+        self.deal_dir = Path(deal_dir)
+        self.path = self.deal_dir / DB_FILENAME
+        self.conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS,
+                                    isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._create()
+
+    @classmethod
+    def open_existing(cls, deal_dir: Path) -> Optional["DealIndex"]:
+        """The deal's index if it has one, else None (the index is optional)."""
+        return cls(deal_dir) if (Path(deal_dir) / DB_FILENAME).exists() else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _create(self) -> None:
+        self.conn.execute("BEGIN IMMEDIATE")
+        for table in ("provisions", "flags", "files"):
+            self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        # One statement at a time: executescript() would commit the open transaction
+        for statement in SCHEMA.split(";"):
+            if statement.strip():
+                self.conn.execute(statement)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.execute("COMMIT")
+
+    # ---- Keeping the mirror in sync ----
+
+    def sync(self) -> int:
+        """Re-read provision folders whose files changed; returns how many were re-read.
+
+        Folders that no longer exist are dropped. A manifest that does not
+        parse (an agent mid-write) keeps its previous row until the next sync.
+        """
+        provisions_dir = self.deal_dir / "provisions"
+        known = {}
+        for folder, name, size, mtime_ns in self.conn.execute(
+                "SELECT folder, name, size, mtime_ns FROM files"):
+            known.setdefault(folder, {})[name] = (size, mtime_ns)
+        indexed = {row[0] for row in self.conn.execute("SELECT folder FROM provisions")}
+
+        seen, reread = set(), 0
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            folders = sorted(provisions_dir.iterdir()) if provisions_dir.is_dir() else []
+            for folder in folders:
+                if not folder.is_dir() or not (folder / "manifest.json").exists():
+                    continue
+                seen.add(folder.name)
+                stats = {}
+                for name in INDEXED_FILES:
+                    try:
+                        st = (folder / name).stat()
+                    except OSError:
+                        continue
+                    stats[name] = (st.st_size, st.st_mtime_ns)
+                if folder.name in indexed and stats == known.get(folder.name, {}):
+                    continue
+                if self._index_folder(folder, stats, known.get(folder.name, {})):
+                    reread += 1
+            for name in indexed - seen:
+                for table in ("provisions", "flags", "files"):
+                    self.conn.execute(f"DELETE FROM {table} WHERE folder = ?", (name,))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return reread
+
+    def _index_folder(self, folder: Path, stats: dict, previous: dict) -> bool:
+        try:
+            manifest = json.loads((folder / "manifest.json").read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  {folder.name}/manifest.json not indexed: {e}")
+            return False
+        summary_path = folder / "changes_summary.md"
+        summary = summary_path.read_text(encoding='utf-8') if "changes_summary.md" in stats else None
+        parent = manifest.get("parent") or {}
+
+        name = folder.name
+        self.conn.execute(
+            "INSERT OR REPLACE INTO provisions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (name, manifest.get("section_number"), manifest.get("title", "Unknown"),
+             manifest.get("status", "pending"), manifest.get("reviewed_at"),
+             manifest.get("word_count"), parent.get("section_number"),
+             manifest.get("part"), manifest.get("parts"), manifest.get("content_hash"),
+             summary, json.dumps(manifest)))
+        self.conn.execute("DELETE FROM flags WHERE folder = ?", (name,))
+        self.conn.executemany(
+            "INSERT INTO flags VALUES (?, ?, ?, ?)",
+            [(name, kind, i, json.dumps(value))
+             for key, kind in FLAG_KINDS.items()
+             for i, value in enumerate(manifest.get(key) or [])])
+
+        for filename in set(previous) - set(stats):
+            self.conn.execute("DELETE FROM files WHERE folder = ? AND name = ?", (name, filename))
+        for filename, (size, mtime_ns) in stats.items():
+            if previous.get(filename) == (size, mtime_ns):
+                continue
+            self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                              (name, filename, size, mtime_ns, _sha256(folder / filename)))
+        return True
+
+    def rebuild(self) -> int:
+        """Recreate the index from the provision folders; returns provisions indexed."""
+        self._create()
+        self.sync()
+        return self.conn.execute("SELECT COUNT(*) FROM provisions").fetchone()[0]
+
+    # ---- Queries ----
+
+    def status(self) -> dict:
+        """Review progress, in the shape of prepare_deal.get_review_status()."""
+        provisions = [
+            {"folder": folder, "title": title, "status": status, "reviewed_at": reviewed_at}
+            for folder, title, status, reviewed_at in self.conn.execute(
+                "SELECT folder, title, status, reviewed_at FROM provisions ORDER BY folder")
+        ]
+        reviewed = self.conn.execute(
+            "SELECT COUNT(*) FROM provisions WHERE status = 'reviewed'").fetchone()[0]
+        return {
+            "total": len(provisions),
+            "reviewed": reviewed,
+            "pending": len(provisions) - reviewed,
+            "provisions": provisions,
+        }
+
+    def overview(self) -> list[dict]:
+        """Each provision with its word count and number of flags and open issues."""
+        rows = self.conn.execute("""
+            SELECT p.folder, p.title, p.status, p.word_count,
+                   SUM(f.kind = 'cross_ref'), SUM(f.kind = 'open_issue')
+            FROM provisions p LEFT JOIN flags f ON f.folder = p.folder
+            GROUP BY p.folder ORDER BY p.folder""")
+        return [{"folder": folder, "title": title, "status": status, "word_count": words,
+                 "cross_ref_flags": flags or 0, "open_issues": issues or 0}
+                for folder, title, status, words, flags, issues in rows]
+
+    def flags(self, kind: Optional[str] = None) -> list[dict]:
+        """Cross-reference flags and open issues in agreement order (kind filters)."""
+        query = ("SELECT f.folder, p.title, f.kind, f.value FROM flags f "
+                 "JOIN provisions p ON p.folder = f.folder")
+        params = ()
+        if kind:
+            query += " WHERE f.kind = ?"
+            params = (kind,)
+        query += " ORDER BY f.folder, f.kind, f.position"
+        return [{"folder": folder, "title": title, "kind": k, "value": json.loads(value)}
+                for folder, title, k, value in self.conn.execute(query, params)]
+
+    def summaries(self) -> list[dict]:
+        """Provisions as the memo and changes tracker read them.
+
+        Each is {"folder", "manifest", "changes_summary"} where manifest
+        holds only section_number, title, status, cross_ref_flags and
+        open_issues.
+        """
+        provisions, by_folder = [], {}
+        for folder, section, title, status, summary in self.conn.execute(
+                "SELECT folder, section_number, title, status, changes_summary "
+                "FROM provisions ORDER BY folder"):
+            manifest = {"section_number": section, "title": title, "status": status,
+                        "cross_ref_flags": [], "open_issues": []}
+            by_folder[folder] = manifest
+            provisions.append({"folder": folder, "manifest": manifest,
+                               "changes_summary": summary})
+        keys = {kind: key for key, kind in FLAG_KINDS.items()}
+        for folder, kind, value in self.conn.execute(
+                "SELECT folder, kind, value FROM flags ORDER BY folder, kind, position"):
+            by_folder[folder][keys[kind]].append(json.loads(value))
+        return provisions
+
+    def manifests(self) -> dict:
+        """folder -> full manifest dict."""
+        return {folder: json.loads(manifest) for folder, manifest in self.conn.execute(
+            "SELECT folder, manifest FROM provisions ORDER BY folder")}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Query or rebuild a deal's SQLite index (deal.db).",
+    )
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in [
+        ('status', 'Sync the index and show review progress'),
+        ('flagged', 'Sync the index and list cross-reference flags and open issues'),
+        ('sync', 'Re-read the provision folders that changed'),
+        ('rebuild', 'Recreate deal.db from the provision folders'),
+    ]:
+        sub.add_parser(name, help=help_text).add_argument(
+            'deal_dir', help='Path to the deal review directory')
+    args = parser.parse_args()
+
+    deal_dir = Path(args.deal_dir)
+    if not (deal_dir / "provisions").is_dir():
+        print(f"Error: No provisions directory in {deal_dir}")
+        return 1
+
+    with DealIndex(deal_dir) as index:
+        if args.command == 'rebuild':
+            count = index.rebuild()
+            print(f"✅ {DB_FILENAME} rebuilt: {count} provisions")
+            return 0
+        reread = index.sync()
+        if args.command == 'sync':
+            print(f"✅ {DB_FILENAME} synced: {reread} provision(s) re-read")
+            return 0
+
+        if args.command == 'flagged':
+            flags = index.flags()
+            labels = {"cross_ref": "Cross-reference flag", "open_issue": "Open issue"}
+            print(f"{len(flags)} flag(s) and open issue(s) in {deal_dir}")
+            for f in flags:
+                print(f"  [{f['title']}] {labels[f['kind']]}: {f['value']}")
+            return 0
+
+        status = index.status()
+        print(f"\n{'='*60}")
+        print(f"Deal Review Status: {deal_dir}")
+        print(f"{'='*60}")
+        print(f"Total provisions:    {status['total']}")
+        print(f"Reviewed:            {status['reviewed']}")
+        print(f"Pending:             {status['pending']}")
+        print(f"\nProvision Details:")
+        print(f"{'-'*60}")
+        for p in index.overview():
+            icon = "✅" if p['status'] == 'reviewed' else "⏳"
+            words = f"{p['word_count']:,} words" if p['word_count'] is not None else "? words"
+            print(f"  {icon} {p['folder']}: {p['status']} ({words}, "
+                  f"{p['cross_ref_flags']} flags, {p['open_issues']} open issues)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+defined_terms.py — Defined-term index for Markup deal workspaces.
+
+Finds where each defined term is defined (the quoted "Term" in its
+definition) and every place it is used across all provisions, and writes the
+result to defined_terms_index.json in the deal directory. Usages are found
+with an Aho–Corasick automaton over all defined terms, so each provision is
+scanned once no matter how many terms the agreement defines.
+
+Each provision is indexed from revised.txt if it has one, else original.txt.
+Re-running the script only rescans provisions whose text changed since the
+last run, unless a change adds or removes a defined term, in which case every
+provision is rescanned.
+
+Usage:
+    python scripts/defined_terms.py ./deal_review/
+    python scripts/defined_terms.py ./deal_review/ --rebuild
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+INDEX_FILENAME = "defined_terms_index.json"
+
+DEFINITION_PATTERNS = [
+    re.compile(r'"([A-Z][A-Za-z\s]+)"'),              # "Defined Term"
+    re.compile(r'\u201c([A-Z][A-Za-z\s]+)\u201d'),  # "Defined Term" (smart quotes)
+]
+
+
+def find_definitions(text: str) -> list[tuple[str, int]]:
+    """(term, offset) for each quoted capitalized phrase, in text order."""
+    found = []
+    for pattern in DEFINITION_PATTERNS:
+        for match in pattern.finditer(text):
+            term = match.group(1).strip()
+            if 2 < len(term) < 60:
+                found.append((term, match.start(1)))
+    return sorted(found, key=lambda x: x[1])
+
+
+def detect_defined_terms(text: str) -> list[str]:
+    """Sorted terms defined (quoted) in text."""
+    return sorted({term for term, _ in find_definitions(text)})
+
+
+class TermAutomaton:
+    """Aho–Corasick automaton over a set of terms (case-sensitive).
+
+    find() returns whole-word, leftmost-longest, non-overlapping matches; a
+    trailing "s" is accepted so "Loan Documents" counts as a use of
+    "Loan Document".
+    """
+
+    def __init__(self, terms):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]          # lengths of terms ending at each node
+        for term in terms:
+            node = 0
+            for ch in term:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                node = nxt
+            self.out[node] = (len(term),)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, text: str) -> list[tuple[int, str]]:
+        """(offset, term) for every use of a term in text."""
+        hits = []
+        node = 0
+        goto, fail, out = self.goto, self.fail, self.out
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length in out[node]:
+                start = i + 1 - length
+                if start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
+                    continue
+                end = i + 1
+                if end < len(text) and text[end] == 's':
+                    end += 1
+                if end < len(text) and (text[end].isalnum() or text[end] == '_'):
+                    continue
+                hits.append((start, length))
+
+        matches = []
+        last_end = -1
+        for start, length in sorted(hits, key=lambda h: (h[0], -h[1])):
+            if start >= last_end:
+                matches.append((start, text[start:start + length]))
+                last_end = start + length
+        return matches
+
+
+def _line_starts(text: str) -> list[int]:
+    starts = [0]
+    pos = text.find('\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = text.find('\n', pos + 1)
+    return starts
+
+
+def _paragraph(starts: list[int], offset: int) -> int:
+    return bisect_right(starts, offset) - 1
+
+
+def _source_file(folder: Path) -> Path:
+    revised = folder / "revised.txt"
+    return revised if revised.exists() else folder / "original.txt"
+
+
+def scan_definitions(text: str) -> list[dict]:
+    """Definition locations in one provision text."""
+    starts = _line_starts(text)
+    return [{"term": term, "paragraph": _paragraph(starts, offset), "offset": offset}
+            for term, offset in find_definitions(text)]
+
+
+def scan_usages(text: str, automaton: TermAutomaton, definitions: list[dict]) -> dict:
+    """term -> [[paragraph, offset], ...] for every use of a term in one text.
+
+    The quoted definition itself is not counted as a use.
+    """
+    starts = _line_starts(text)
+    defined_at = {d["offset"] for d in definitions}
+    usages = {}
+    for offset, term in automaton.find(text):
+        if offset in defined_at:
+            continue
+        usages.setdefault(term, []).append([_paragraph(starts, offset), offset])
+    return usages
+
+
+def build_index(deal_dir: Path, previous: dict = None) -> tuple[dict, list[str]]:
+    """Build (or incrementally refresh) the index. Returns (index, rescanned folders)."""
+    folders = [f for f in sorted((deal_dir / "provisions").iterdir())
+               if (f / "original.txt").exists()]
+
+    texts = {}
+    sources = {}
+    for folder in folders:
+        path = _source_file(folder)
+        text = path.read_text(encoding='utf-8')
+        texts[folder.name] = text
+        sources[folder.name] = {
+            "file": path.name,
+            "hash": hashlib.sha256(text.encode('utf-8')).hexdigest()[:16],
+        }
+
+    prev_sources = (previous or {}).get("sources", {})
+    prev_provisions = (previous or {}).get("provisions", {})
+    changed = [name for name in texts
+               if prev_sources.get(name, {}).get("hash") != sources[name]["hash"]
+               or name not in prev_provisions]
+
+    definitions = {}
+    for name in texts:
+        if name in changed:
+            definitions[name] = scan_definitions(texts[name])
+        else:
+            definitions[name] = prev_provisions[name]["definitions"]
+
+    terms = sorted({d["term"] for defs in definitions.values() for d in defs})
+    prev_terms = sorted((previous or {}).get("terms", {}))
+    if terms != prev_terms:
+        changed = list(texts)      # the automaton changed: rescan everything
+
+    automaton = TermAutomaton(terms)
+    provisions = {}
+    for name in texts:
+        if name in changed:
+            usages = scan_usages(texts[name], automaton, definitions[name])
+        else:
+            usages = prev_provisions[name]["usages"]
+        provisions[name] = {"definitions": definitions[name], "usages": usages}
+
+    index_terms = {}
+    for term in terms:
+        index_terms[term] = {"defined_in": None, "definitions": [], "usages": {}, "usage_count": 0}
+    for name in texts:     # agreement order: the first definition is the primary one
+        for d in provisions[name]["definitions"]:
+            loc = {"folder": name, "paragraph": d["paragraph"], "offset": d["offset"]}
+            entry = index_terms[d["term"]]
+            entry["definitions"].append(loc)
+            if entry["defined_in"] is None:
+                entry["defined_in"] = loc
+        for term, locs in provisions[name]["usages"].items():
+            index_terms[term]["usages"][name] = locs
+            index_terms[term]["usage_count"] += len(locs)
+
+    index = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "sources": sources,
+        "terms": index_terms,
+        "provisions": provisions,
+    }
+    return index, changed
+
+
+def load_index(deal_dir: Path):
+    """Read defined_terms_index.json, or None if absent or unreadable."""
+    try:
+        return json.loads((deal_dir / INDEX_FILENAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def update_terms_index(deal_dir: Path, rebuild: bool = False) -> tuple[dict, list[str]]:
+    """Refresh defined_terms_index.json on disk. Returns (index, rescanned folders)."""
+    index, changed = build_index(deal_dir, None if rebuild else load_index(deal_dir))
+    fd, tmp = tempfile.mkstemp(prefix=".terms_", dir=deal_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp, deal_dir / INDEX_FILENAME)
+    return index, changed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build or refresh the defined-term index for a deal.",
+    )
+    parser.add_argument('deal_dir', help='Path to the deal review directory')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Rescan every provision instead of only changed ones')
+    args = parser.parse_args()
+
+    deal_dir = Path(args.deal_dir)
+    if not (deal_dir / "provisions").is_dir():
+        print(f"Error: No provisions directory in {deal_dir}")
+        return 1
+
+    index, changed = update_terms_index(deal_dir, rebuild=args.rebuild)
+    unused = sum(1 for t in index["terms"].values() if not t["usage_count"])
+    print(f"✅ {len(index['terms'])} defined terms, "
+          f"{sum(t['usage_count'] for t in index['terms'].values()):,} usages "
+          f"({len(changed)} of {len(index['sources'])} provisions scanned) → "
+          f"{deal_dir / INDEX_FILENAME}")
+    if unused:
+        print(f"ℹ️  {unused} defined term(s) never used outside their definition")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+diff_engine.py — Pluggable paragraph diff for the tracked-change scripts.
+
+apply_redlines.py and review_draft.py turn each changed paragraph into a list
+of ('eq' | 'del' | 'ins', text) operations and build one w:del / w:ins run
+per non-equal operation. The level picks how that list is computed:
+
+    word    Myers diff over word / whitespace / punctuation tokens, so
+            tracked changes never split a word (default)
+    refine  word diff, then a character diff inside a single reworded word
+            ("Lender" → "Lenders" shows only the inserted "s")
+    char    character-level difflib.SequenceMatcher (the original behaviour)
+
+Every level reproduces the original text exactly from its eq + del
+operations and the revised text from its eq + ins operations, so redlining
+validation holds. The Myers diff runs in O((N+M)D) time for N and M tokens
+and D edits.
+
+Usage:
+    from diff_engine import diff_ops
+    ops = diff_ops(old_text, new_text, level='word')
+
+    python scripts/diff_engine.py bench ./deal_review/
+"""
+
+import argparse
+import difflib
+import re
+import sys
+from pathlib import Path
+
+
+DIFF_LEVELS = ('word', 'refine', 'char')
+DEFAULT_DIFF_LEVEL = 'word'
+
+TOKEN_RE = re.compile(r'\w+|\s+|[^\w\s]')
+
+
+def tokenize(text):
+    """Split text into word, whitespace-run and single punctuation tokens."""
+    return TOKEN_RE.findall(text)
+
+
+def _myers_matches(a, b):
+    """Matched (i, j) index pairs of a shortest edit script between a and b."""
+    n, m = len(a), len(b)
+    max_d = n + m
+    off = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+    for d in range(max_d + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[off + k - 1] < v[off + k + 1]):
+                x = v[off + k + 1]          # step down: insertion
+            else:
+                x = v[off + k - 1] + 1      # step right: deletion
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[off + k] = x
+            if x >= n and y >= m:
+                trace.append(v[off - d:off + d + 1])
+                return _backtrack(trace, n, m)
+        trace.append(v[off - d:off + d + 1])
+    return []
+
+
+def _backtrack(trace, n, m):
+    matches = []
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        prev = trace[d - 1]                 # diagonals -(d-1)..(d-1)
+        k = x - y
+        if k == -d or (k != d and prev[k - 1 + d - 1] < prev[k + 1 + d - 1]):
+            pk = k + 1
+        else:
+            pk = k - 1
+        px = prev[pk + d - 1]
+        py = px - pk
+        mid_x, mid_y = (px, py + 1) if pk == k + 1 else (px + 1, py)
+        while x > mid_x and y > mid_y:
+            x -= 1
+            y -= 1
+            matches.append((x, y))
+        x, y = px, py
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        matches.append((x, y))
+    matches.reverse()
+    return matches
+
+
+def myers_opcodes(a, b):
+    """SequenceMatcher-style (tag, i1, i2, j1, j2) opcodes from a Myers diff."""
+    n, m = len(a), len(b)
+    pre = 0
+    while pre < n and pre < m and a[pre] == b[pre]:
+        pre += 1
+    suf = 0
+    while suf < n - pre and suf < m - pre and a[n - 1 - suf] == b[m - 1 - suf]:
+        suf += 1
+    matches = [(i + pre, j + pre) for i, j in _myers_matches(a[pre:n - suf], b[pre:m - suf])]
+    matches = [(i, i) for i in range(pre)] + matches + \
+              [(n - suf + t, m - suf + t) for t in range(suf)]
+
+    opcodes = []
+    i = j = 0
+    for mi, mj in matches + [(n, m)]:
+        if i < mi and j < mj:
+            opcodes.append(('replace', i, mi, j, mj))
+        elif i < mi:
+            opcodes.append(('delete', i, mi, j, j))
+        elif j < mj:
+            opcodes.append(('insert', i, i, j, mj))
+        if mi < n or mj < m:
+            if opcodes and opcodes[-1][0] == 'equal':
+                tag, i1, _, j1, _ = opcodes[-1]
+                opcodes[-1] = ('equal', i1, mi + 1, j1, mj + 1)
+            else:
+                opcodes.append(('equal', mi, mi + 1, mj, mj + 1))
+        i, j = mi + 1, mj + 1
+    return opcodes
+
+
+def merge_ops(ops):
+    """Merge consecutive ops of the same type."""
+    if not ops:
+        return ops
+    merged = [ops[0]]
+    for op, text in ops[1:]:
+        if merged[-1][0] == op:
+            merged[-1] = (op, merged[-1][1] + text)
+        else:
+            merged.append((op, text))
+    return merged
+
+
+def char_diff_ops(old, new):
+    """Character-level diff preserving exact original text."""
+    ops = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old, new).get_opcodes():
+        if tag == 'equal':
+            ops.append(('eq', old[i1:i2]))
+        elif tag == 'delete':
+            ops.append(('del', old[i1:i2]))
+        elif tag == 'insert':
+            ops.append(('ins', new[j1:j2]))
+        elif tag == 'replace':
+            ops.append(('del', old[i1:i2]))
+            ops.append(('ins', new[j1:j2]))
+    return ops
+
+
+def _token_ops(a, b):
+    ops = []
+    for tag, i1, i2, j1, j2 in myers_opcodes(a, b):
+        if tag == 'equal':
+            ops.append(('eq', ''.join(a[i1:i2])))
+            continue
+        if i2 > i1:
+            ops.append(('del', ''.join(a[i1:i2])))
+        if j2 > j1:
+            ops.append(('ins', ''.join(b[j1:j2])))
+    return ops
+
+
+def _absorb_gaps(ops):
+    """Fold whitespace-only equalities between two changes into the change.
+
+    "a b c" → "x y z" then reads as one deletion and one insertion instead
+    of three interleaved pairs around the matching spaces.
+    """
+    out = []
+    for idx, (op, text) in enumerate(ops):
+        if (op == 'eq' and not text.strip() and 0 < idx < len(ops) - 1
+                and ops[idx - 1][0] != 'eq' and ops[idx + 1][0] != 'eq'):
+            out.append(('del', text))
+            out.append(('ins', text))
+        else:
+            out.append((op, text))
+
+    # Regroup each run of changes as all deletions, then all insertions
+    result, dels, ins = [], [], []
+    for op, text in out + [('eq', '')]:
+        if op == 'del':
+            dels.append(text)
+        elif op == 'ins':
+            ins.append(text)
+        else:
+            if dels:
+                result.append(('del', ''.join(dels)))
+            if ins:
+                result.append(('ins', ''.join(ins)))
+            dels, ins = [], []
+            if text:
+                result.append(('eq', text))
+    return result
+
+
+def _refine(ops):
+    """Character diff inside changes that swap one word for another."""
+    out = []
+    i = 0
+    while i < len(ops):
+        if (i + 1 < len(ops) and ops[i][0] == 'del' and ops[i + 1][0] == 'ins'
+                and re.fullmatch(r'\w+', ops[i][1]) and re.fullmatch(r'\w+', ops[i + 1][1])):
+            old, new = ops[i][1], ops[i + 1][1]
+            for tag, i1, i2, j1, j2 in myers_opcodes(old, new):
+                if tag == 'equal':
+                    out.append(('eq', old[i1:i2]))
+                    continue
+                if i2 > i1:
+                    out.append(('del', old[i1:i2]))
+                if j2 > j1:
+                    out.append(('ins', new[j1:j2]))
+            i += 2
+        else:
+            out.append(ops[i])
+            i += 1
+    return out
+
+
+def diff_ops(old, new, level=DEFAULT_DIFF_LEVEL):
+    """Merged ('eq' | 'del' | 'ins', text) operations turning old into new."""
+    if level == 'char':
+        return merge_ops(char_diff_ops(old, new))
+    if level not in DIFF_LEVELS:
+        raise ValueError(f"Unknown diff level: {level!r} (expected one of {', '.join(DIFF_LEVELS)})")
+    ops = _absorb_gaps(_token_ops(tokenize(old), tokenize(new)))
+    if level == 'refine':
+        ops = _refine(ops)
+    return merge_ops(ops)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare diff levels on a reviewed deal's changed paragraphs.",
+    )
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_bench = sub.add_parser('bench', help='Time each diff level and count tracked-change runs')
+    p_bench.add_argument('deal_dir', help='Path to a deal with revised.txt files')
+    p_bench.add_argument('--repeat', type=int, default=3, help='Timing repetitions (default: 3)')
+    args = parser.parse_args()
+
+    from markup_core.bench import benchmark_deal
+    if not (Path(args.deal_dir) / "provisions").is_dir():
+        print(f"Error: No provisions directory in {args.deal_dir}")
+        return 1
+    return benchmark_deal(args.deal_dir, args.repeat)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+docx_package.py — In-memory .docx package with raw pass-through of untouched parts.
+
+Reads a .docx zip once and keeps every member's compressed bytes exactly as
+stored. Only the XML parts the redline scripts actually change are re-deflated
+on save; media, fonts, embeddings and every other untouched part are copied
+into the output byte for byte, so redlining an agreement full of images costs
+about the same as redlining a plain one.
+
+The Document library from the docx skill works on a directory, so the
+package can materialize just its XML/.rels parts (extract_xml) and later pick
+up whatever the library changed there (update_from) before saving.
+
+Usage:
+    python scripts/docx_package.py unpack original.docx unpacked/
+    python scripts/docx_package.py pack original.docx unpacked/ redline_agreement.docx
+
+    from docx_package import DocxPackage
+    pkg = DocxPackage('original.docx')
+    pkg.extract_xml('unpacked')
+    ...                             # Document library edits unpacked/
+    pkg.update_from('unpacked')
+    pkg.save('redline_agreement.docx')
+"""
+import argparse, os, struct, sys, tempfile, time, zipfile, zlib
+
+
+XML_SUFFIXES = ('.xml', '.rels')
+
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+
+def is_xml_part(name):
+    """True for parts the Document library reads or writes."""
+    return name.lower().endswith(XML_SUFFIXES)
+
+
+def _dos_datetime(date_time):
+    y, mo, d, h, mi, s = date_time
+    return ((h << 11) | (mi << 5) | (s // 2)), (((y - 1980) << 9) | (mo << 5) | d)
+
+
+def _encode_name(name, flags):
+    if not flags & 0x800:
+        try:
+            return name.encode('ascii'), flags
+        except UnicodeEncodeError:
+            pass
+    return name.encode('utf-8'), flags | 0x800
+
+
+def _target_mode(path):
+    """Permission bits for a file written to path."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+class DocxPackage:
+    """A .docx zip held in memory; untouched members are saved without re-compression."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        with zipfile.ZipFile(path) as zf:
+            self.infos = zf.infolist()
+        self.by_name = {i.filename: i for i in self.infos}
+        self.modified = {}     # name -> new uncompressed bytes
+        self.added = []        # names of new parts, in insertion order
+
+    def names(self):
+        return [i.filename for i in self.infos] + self.added
+
+    def __contains__(self, name):
+        return name in self.by_name or name in self.modified
+
+    def _raw(self, info):
+        """Compressed bytes of an original member, straight from the archive."""
+        offset = info.header_offset
+        header = _LOCAL_HEADER.unpack_from(self.data, offset)
+        start = offset + _LOCAL_HEADER.size + header[9] + header[10]
+        return self.data[start:start + info.compress_size]
+
+    def read(self, name):
+        """Uncompressed bytes of a part (its modified contents, if any)."""
+        if name in self.modified:
+            return self.modified[name]
+        info = self.by_name[name]
+        raw = self._raw(info)
+        if info.compress_type == zipfile.ZIP_STORED:
+            return raw
+        if info.compress_type != zipfile.ZIP_DEFLATED:
+            with zipfile.ZipFile(self.path) as zf:
+                return zf.read(info)
+        return zlib.decompress(raw, -15)
+
+    def unchanged(self, name, data):
+        """True if data is identical to the original part (by CRC and size)."""
+        info = self.by_name.get(name)
+        return (info is not None and name not in self.modified
+                and info.file_size == len(data) and info.CRC == zlib.crc32(data))
+
+    def write(self, name, data):
+        """Replace (or add) a part's contents."""
+        if name not in self.by_name and name not in self.modified:
+            self.added.append(name)
+        self.modified[name] = data
+
+    def extract_xml(self, directory):
+        """Write only the XML/.rels parts to directory. Returns the number written."""
+        count = 0
+        for name in self.names():
+            if not is_xml_part(name):
+                continue
+            dest = os.path.join(directory, *name.split('/'))
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            with open(dest, 'wb') as f:
+                f.write(self.read(name))
+            count += 1
+        return count
+
+    def update_from(self, directory):
+        """Pick up parts changed or added under directory. Returns their names.
+
+        Parts missing from the directory (media left in the archive) are kept
+        as they are.
+        """
+        changed = []
+        for root, _, files in os.walk(directory):
+            for fname in files:
+                path = os.path.join(root, fname)
+                name = os.path.relpath(path, directory).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    data = f.read()
+                if name in self.modified:
+                    if self.modified[name] == data:
+                        continue
+                elif self.unchanged(name, data):
+                    continue
+                self.write(name, data)
+                changed.append(name)
+        return sorted(changed)
+
+    def save(self, path):
+        """Write the package to path (which may be the file it was read from).
+
+        The file keeps the mode of the one it replaces; a new file gets the
+        usual 0o666 less the umask (mkstemp would leave it 0600).
+        """
+        dest_dir = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(prefix='.docx_', suffix='.tmp', dir=dest_dir)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                self._write_zip(out)
+            os.chmod(tmp, _target_mode(path))
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _members(self):
+        """(name, flags, method, dos time, dos date, crc, raw, size, info) in archive order."""
+        now = time.localtime()[:6]
+        for name in self.names():
+            info = self.by_name.get(name)
+            if name not in self.modified:
+                dtime, ddate = _dos_datetime(info.date_time)
+                yield (name, info.flag_bits & ~0x08, info.compress_type, dtime, ddate,
+                       info.CRC, self._raw(info), info.file_size, info)
+                continue
+            data = self.modified[name]
+            comp = zlib.compressobj(6, zlib.DEFLATED, -15)
+            raw = comp.compress(data) + comp.flush()
+            dtime, ddate = _dos_datetime(info.date_time if info else now)
+            yield (name, 0, zipfile.ZIP_DEFLATED, dtime, ddate,
+                   zlib.crc32(data), raw, len(data), info)
+
+    def _write_zip(self, out):
+        central = []
+        offset = 0
+        for name, flags, method, dtime, ddate, crc, raw, size, info in self._members():
+            if offset > _ZIP32_LIMIT or len(raw) > _ZIP32_LIMIT or size > _ZIP32_LIMIT:
+                raise ValueError(f"{self.path}: too large for a zip32 archive")
+            fname, flags = _encode_name(name, flags)
+            flags &= ~0x01      # never encrypted in a .docx
+            out.write(_LOCAL_HEADER.pack(b'PK\x03\x04', 20, flags, method, dtime, ddate,
+                                         crc, len(raw), size, len(fname), 0))
+            out.write(fname)
+            out.write(raw)
+            central.append(_CENTRAL_HEADER.pack(
+                b'PK\x01\x02', (info.create_system << 8 | info.create_version) if info else 20, 20, flags, method,
+                dtime, ddate, crc, len(raw), size, len(fname), 0, 0, 0,
+                info.internal_attr if info else 0,
+                info.external_attr if info else 0o600 << 16, offset) + fname)
+            offset += _LOCAL_HEADER.size + len(fname) + len(raw)
+        directory = b''.join(central)
+        if len(central) > 0xFFFF or offset > _ZIP32_LIMIT:
+            raise ValueError(f"{self.path}: too large for a zip32 archive")
+        out.write(directory)
+        out.write(_END_RECORD.pack(b'PK\x05\x06', 0, 0, len(central), len(central),
+                                   len(directory), offset, 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack the XML parts of a .docx, or pack them back over the original.",
+    )
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_unpack = sub.add_parser('unpack', help='Extract XML/.rels parts to a directory')
+    p_unpack.add_argument('docx', help='Source .docx')
+    p_unpack.add_argument('directory', help='Destination directory')
+    p_pack = sub.add_parser('pack', help='Write a .docx from the original plus edited XML')
+    p_pack.add_argument('docx', help='Original .docx (source of untouched parts)')
+    p_pack.add_argument('directory', help='Directory with the edited XML parts')
+    p_pack.add_argument('output', help='Output .docx')
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.docx):
+        print(f"Error: File not found: {args.docx}")
+        return 1
+    pkg = DocxPackage(args.docx)
+    if args.command == 'unpack':
+        count = pkg.extract_xml(args.directory)
+        print(f"✅ {count} XML parts → {args.directory}")
+        return 0
+    changed = pkg.update_from(args.directory)
+    pkg.save(args.output)
+    copied = sum(1 for name in pkg.by_name if name not in pkg.modified)
+    print(f"✅ {len(changed)} part(s) rewritten, {copied} copied as stored → {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Single-pass streaming paragraph extractor for OOXML document parts.
+
+Reads word/document.xml with expat and produces, for every w:p element in
+document order, the same text, first-run rPr and pPr that the minidom
+helpers (extract_text / get_rpr / get_ppr) produce. The redline scripts use
+these records for all matching and diffing; the Document library's DOM is
+only used to apply the tracked changes to the paragraphs that change.
+
+Usage:
+    from docx_stream import stream_paragraphs
+    records = stream_paragraphs('unpacked/word/document.xml')
+"""
+from functools import lru_cache
+from xml.parsers import expat
+
+from markup_core.text import nm
+
+
+def _esc(data):
+    """Escape text/attribute data the way minidom's toxml() does."""
+    return (data.replace('&', '&amp;').replace('<', '&lt;')
+            .replace('"', '&quot;').replace('>', '&gt;'))
+
+
+@lru_cache(maxsize=4096)
+def _start_tag(tag, attrs):
+    """Serialized start tag (without its closing '>'); rPr/pPr elements repeat heavily."""
+    parts = [f'<{tag}']
+    for k in range(0, len(attrs), 2):
+        if not attrs[k].startswith('xmlns:'):
+            parts.append(f' {attrs[k]}="{_esc(attrs[k + 1])}"')
+    return ''.join(parts)
+
+
+# Identical rPr/pPr serializations share one string object, so records from
+# a long document hold one copy of each distinct formatting and the
+# markup_core run cache hits on them.
+_SERIALIZED = {}
+
+
+class ParaRecord:
+    """One w:p element as seen by the streaming extractor.
+
+    Attributes:
+        index: ordinal among all w:p elements (matches getElementsByTagName order)
+        text: run text including tabs, as extract_text() would return it
+        norm: whitespace-normalized text
+        rpr: serialized w:rPr of the first run ('' if none)
+        ppr: serialized w:pPr of the paragraph ('' if none)
+    """
+    __slots__ = ('index', 'text', 'norm', 'rpr', 'ppr')
+
+    def __init__(self, index):
+        self.index = index
+        self.text = ''
+        self.norm = ''
+        self.rpr = ''
+        self.ppr = ''
+
+    def set_text(self, text):
+        """Update text (and normalized text) after a paragraph is rewritten."""
+        self.text = text
+        self.norm = nm(text)
+
+
+class _Capture:
+    """Serializes one w:rPr / w:pPr subtree the way get_rpr/get_ppr did.
+
+    Mirrors minidom's toxml(): attributes in source order, empty elements
+    self-closed, character data escaped, with xmlns:* declarations dropped.
+    """
+
+    def __init__(self, record, field):
+        self.record = record
+        self.field = field
+        self.parts = []
+        self.open = []    # per open element: True once its start tag is closed
+
+    def start(self, tag, attrs):
+        self._close_start()
+        self.parts.append(_start_tag(tag, tuple(attrs)))
+        self.open.append(False)
+
+    def text(self, data):
+        self._close_start()
+        self.parts.append(_esc(data))
+
+    def end(self, tag):
+        """Close an element; returns True when the captured subtree is done."""
+        if self.open.pop():
+            self.parts.append(f'</{tag}>')
+        else:
+            self.parts.append('/>')
+        if not self.open:
+            value = ''.join(self.parts)
+            setattr(self.record, self.field, _SERIALIZED.setdefault(value, value))
+            return True
+        return False
+
+    def _close_start(self):
+        if self.open and not self.open[-1]:
+            self.parts.append('>')
+            self.open[-1] = True
+
+
+def stream_paragraphs(xml_path):
+    """Parse a document part once and return a list of ParaRecord objects."""
+    with open(xml_path, 'rb') as f:
+        data = f.read()
+    return parse_paragraphs(data)
+
+
+def parse_paragraphs(data):
+    """Parse document part bytes and return a list of ParaRecord objects."""
+    parser = expat.ParserCreate()
+    parser.ordered_attributes = True
+    parser.buffer_text = True
+
+    records = []
+    paras = []        # open paragraphs: [record, text parts, first-run depth, in first run]
+    stack = []        # tag names of open elements
+    captures = []     # active rPr / pPr serializations
+    text = None       # character data of the current run-level w:t
+
+    def start(tag, attrs):
+        nonlocal text
+        for cap in captures:
+            cap.start(tag, attrs)
+        parent = stack[-1] if stack else None
+        depth = len(stack)
+        stack.append(tag)
+
+        if tag == 'w:p':
+            rec = ParaRecord(len(records))
+            records.append(rec)
+            paras.append([rec, [], None, False])
+        elif tag == 'w:r':
+            for para in paras:
+                if para[2] is None:
+                    para[2], para[3] = depth, True
+        elif tag == 'w:rPr' and parent == 'w:r':
+            for para in paras:
+                if para[3] and para[2] == depth - 1:
+                    cap = _Capture(para[0], 'rpr')
+                    cap.start(tag, attrs)
+                    captures.append(cap)
+        elif tag == 'w:pPr' and parent == 'w:p':
+            cap = _Capture(paras[-1][0], 'ppr')
+            cap.start(tag, attrs)
+            captures.append(cap)
+        elif tag == 'w:t' and parent == 'w:r':
+            text = []
+        elif tag == 'w:tab' and parent == 'w:r':
+            for para in paras:
+                para[1].append('\t')
+
+    def end(tag):
+        nonlocal text
+        stack.pop()
+        for cap in list(captures):
+            if cap.end(tag):
+                captures.remove(cap)
+
+        if tag == 'w:t' and text is not None and stack and stack[-1] == 'w:r':
+            chunk = ''.join(text)
+            for para in paras:
+                para[1].append(chunk)
+            text = None
+        elif tag == 'w:r':
+            for para in paras:
+                if para[3] and para[2] == len(stack):
+                    para[3] = False
+        elif tag == 'w:p':
+            rec, parts, _, _ = paras.pop()
+            rec.set_text(''.join(parts))
+
+    def chars(data_):
+        for cap in captures:
+            cap.text(data_)
+        if text is not None and stack[-1] == 'w:t':
+            text.append(data_)
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = chars
+    parser.Parse(data, True)
+    return records
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+docx_writer.py — Fast markdown-to-.docx writer for Markup deliverables.
+
+Writes a Word package directly: the fixed parts (styles, numbering, content
+types, relationships) come from the small built-in template below, and
+word/document.xml is streamed into the zip paragraph by paragraph, so long
+agreements never pass through python-docx's object model.
+
+Supported markdown: "#" to "###" headings, "-" / "*" bullet lists (nested by
+two-space indent), pipe tables (the changes tracker; turned off for agreement
+text), "---" rules, and **bold**, *italic* and ***bold italic*** inline text.
+
+Usage:
+    from docx_writer import write_markdown_docx
+    write_markdown_docx(lines_or_chunks, Path("review_memo.docx"), title="Review Memorandum")
+"""
+
+import re
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+FLUSH_EVERY = 256   # paragraphs buffered before writing to the zip stream
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+<Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>
+<Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>
+</Types>"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>
+</Relationships>"""
+
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" Target="numbering.xml"/>
+</Relationships>"""
+
+CORE_PROPS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+<dc:title>{title}</dc:title>
+<dcterms:created xsi:type="dcterms:W3CDTF">{created}</dcterms:created>
+</cp:coreProperties>"""
+
+
+def _heading_style(level: int, size: int) -> str:
+    return (
+        f'<w:style w:type="paragraph" w:styleId="Heading{level}">'
+        f'<w:name w:val="heading {level}"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/>'
+        f'<w:uiPriority w:val="9"/><w:qFormat/>'
+        f'<w:pPr><w:keepNext/><w:spacing w:before="240" w:after="80"/><w:outlineLvl w:val="{level - 1}"/></w:pPr>'
+        f'<w:rPr><w:b/><w:sz w:val="{size}"/><w:szCs w:val="{size}"/></w:rPr></w:style>'
+    )
+
+
+STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<w:styles xmlns:w="{W_NS}">'
+    '<w:docDefaults><w:rPrDefault><w:rPr>'
+    '<w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:eastAsia="Calibri" w:cs="Calibri"/>'
+    '<w:sz w:val="22"/><w:szCs w:val="22"/><w:lang w:val="en-US"/>'
+    '</w:rPr></w:rPrDefault>'
+    '<w:pPrDefault><w:pPr><w:spacing w:after="120" w:line="259" w:lineRule="auto"/></w:pPr></w:pPrDefault>'
+    '</w:docDefaults>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>'
+    + _heading_style(1, 32) + _heading_style(2, 28) + _heading_style(3, 24) +
+    '<w:style w:type="paragraph" w:styleId="ListBullet"><w:name w:val="List Bullet"/>'
+    '<w:basedOn w:val="Normal"/><w:pPr><w:numPr><w:numId w:val="1"/></w:numPr>'
+    '<w:spacing w:after="60"/></w:pPr></w:style>'
+    '<w:style w:type="character" w:default="1" w:styleId="DefaultParagraphFont">'
+    '<w:name w:val="Default Paragraph Font"/><w:uiPriority w:val="1"/><w:semiHidden/></w:style>'
+    '<w:style w:type="table" w:default="1" w:styleId="TableNormal"><w:name w:val="Normal Table"/>'
+    '<w:semiHidden/><w:tblPr><w:tblInd w:w="0" w:type="dxa"/><w:tblCellMar>'
+    '<w:top w:w="0" w:type="dxa"/><w:left w:w="108" w:type="dxa"/>'
+    '<w:bottom w:w="0" w:type="dxa"/><w:right w:w="108" w:type="dxa"/>'
+    '</w:tblCellMar></w:tblPr></w:style>'
+    '<w:style w:type="table" w:styleId="TableGrid"><w:name w:val="Table Grid"/>'
+    '<w:basedOn w:val="TableNormal"/><w:pPr><w:spacing w:after="0" w:line="240" w:lineRule="auto"/></w:pPr>'
+    '<w:tblPr><w:tblBorders>'
+    + ''.join(f'<w:{side} w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+              for side in ("top", "left", "bottom", "right", "insideH", "insideV")) +
+    '</w:tblBorders></w:tblPr></w:style>'
+    '</w:styles>'
+)
+
+_BULLETS = ["•", "o", "▪"]
+
+NUMBERING = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<w:numbering xmlns:w="{W_NS}"><w:abstractNum w:abstractNumId="0">'
+    '<w:multiLevelType w:val="hybridMultilevel"/>'
+    + ''.join(
+        f'<w:lvl w:ilvl="{lvl}"><w:start w:val="1"/><w:numFmt w:val="bullet"/>'
+        f'<w:lvlText w:val="{_BULLETS[lvl % 3]}"/><w:lvlJc w:val="left"/>'
+        f'<w:pPr><w:ind w:left="{720 * (lvl + 1)}" w:hanging="360"/></w:pPr></w:lvl>'
+        for lvl in range(9)) +
+    '</w:abstractNum><w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num></w:numbering>'
+)
+
+DOCUMENT_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<w:document xmlns:w="{W_NS}"><w:body>'
+)
+DOCUMENT_TAIL = (
+    '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+    '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" '
+    'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>'
+    '</w:body></w:document>'
+)
+
+TABLE_WIDTH = 9360   # twips between the page margins
+
+_INVALID_XML_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_INLINE_RE = re.compile(r'\*\*\*(.+?)\*\*\*|\*\*(.+?)\*\*|(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])')
+_BULLET_RE = re.compile(r'^( *)[-*] +(.*)$')
+_TABLE_RULE_RE = re.compile(r'^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$')
+
+
+def _esc(text: str) -> str:
+    text = _INVALID_XML_RE.sub('', text)
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _run(text: str, bold: bool = False, italic: bool = False) -> str:
+    rpr = ''
+    if bold or italic:
+        rpr = '<w:rPr>' + ('<w:b/>' if bold else '') + ('<w:i/>' if italic else '') + '</w:rPr>'
+    parts = text.split('\t')
+    body = '<w:tab/>'.join(f'<w:t xml:space="preserve">{_esc(p)}</w:t>' for p in parts)
+    return f'<w:r>{rpr}{body}</w:r>'
+
+
+def inline_runs(text: str, bold: bool = False) -> str:
+    """Runs for a line of text with **bold**, *italic* and ***both*** spans."""
+    if '*' not in text:
+        return _run(text, bold=bold)
+    runs = []
+    pos = 0
+    for m in _INLINE_RE.finditer(text):
+        if m.start() > pos:
+            runs.append(_run(text[pos:m.start()], bold=bold))
+        if m.group(1) is not None:
+            runs.append(_run(m.group(1), bold=True, italic=True))
+        elif m.group(2) is not None:
+            runs.append(_run(m.group(2), bold=True))
+        else:
+            runs.append(_run(m.group(3), bold=bold, italic=True))
+        pos = m.end()
+    if pos < len(text):
+        runs.append(_run(text[pos:], bold=bold))
+    return ''.join(runs)
+
+
+def _paragraph(text: str, style: str = '', ilvl: int = None, bold: bool = False) -> str:
+    ppr = ''
+    if style:
+        numpr = (f'<w:numPr><w:ilvl w:val="{ilvl}"/><w:numId w:val="1"/></w:numPr>'
+                 if ilvl else '')
+        ppr = f'<w:pPr><w:pStyle w:val="{style}"/>{numpr}</w:pPr>'
+    return f'<w:p>{ppr}{inline_runs(text, bold=bold)}</w:p>'
+
+
+def _table(rows: list[list[str]]) -> str:
+    """A bordered table; the first row is the bold header row."""
+    ncols = max(len(r) for r in rows)
+    col_w = TABLE_WIDTH // ncols
+    out = ['<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/>'
+           f'<w:tblW w:w="{TABLE_WIDTH}" w:type="dxa"/><w:tblLook w:val="04A0"/></w:tblPr><w:tblGrid>',
+           f'<w:gridCol w:w="{col_w}"/>' * ncols, '</w:tblGrid>']
+    for i, row in enumerate(rows):
+        out.append('<w:tr>')
+        if i == 0:
+            out.append('<w:trPr><w:tblHeader/></w:trPr>')
+        for cell in row + [''] * (ncols - len(row)):
+            out.append(f'<w:tc><w:tcPr><w:tcW w:w="{col_w}" w:type="dxa"/></w:tcPr>'
+                       f'{_paragraph(cell, bold=(i == 0))}</w:tc>')
+        out.append('</w:tr>')
+    out.append('</w:tbl><w:p/>')
+    return ''.join(out)
+
+
+def _split_row(line: str) -> list[str]:
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|'):
+        line = line[:-1]
+    return [cell.strip() for cell in line.split('|')]
+
+
+def iter_body_xml(lines, tables: bool = True):
+    """Yield WordprocessingML body elements for markdown lines.
+
+    With tables=False, lines starting with "|" stay ordinary paragraphs (for
+    agreement text, where a pipe is not table markup).
+    """
+    table = []
+    for line in lines:
+        stripped = line.strip()
+        if tables and stripped.startswith('|'):
+            if not _TABLE_RULE_RE.match(stripped):
+                table.append(_split_row(stripped))
+            continue
+        if table:
+            yield _table(table)
+            table = []
+        if not stripped:
+            continue
+        if stripped.startswith('### '):
+            yield _paragraph(stripped[4:], 'Heading3')
+        elif stripped.startswith('## '):
+            yield _paragraph(stripped[3:], 'Heading2')
+        elif stripped.startswith('# '):
+            yield _paragraph(stripped[2:], 'Heading1')
+        elif stripped.startswith('---'):
+            yield _paragraph('_' * 50)
+        else:
+            m = _BULLET_RE.match(line.rstrip())
+            if m:
+                yield _paragraph(m.group(2), 'ListBullet', ilvl=min(len(m.group(1)) // 2, 8))
+            else:
+                yield _paragraph(stripped)
+    if table:
+        yield _table(table)
+
+
+def write_markdown_docx(lines, output_path: Path, title: str = "Document",
+                        tables: bool = True) -> Path:
+    """Write markdown lines (any iterable of str) to a .docx package.
+
+    tables=False leaves pipe-table lines as plain paragraphs.
+    """
+    created = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', CONTENT_TYPES)
+        zf.writestr('_rels/.rels', PACKAGE_RELS)
+        zf.writestr('docProps/core.xml', CORE_PROPS.format(title=_esc(title), created=created))
+        zf.writestr('word/_rels/document.xml.rels', DOCUMENT_RELS)
+        zf.writestr('word/styles.xml', STYLES)
+        zf.writestr('word/numbering.xml', NUMBERING)
+        with zf.open('word/document.xml', 'w', force_zip64=True) as part:
+            part.write(DOCUMENT_HEAD.encode('utf-8'))
+            buf = []
+            for element in iter_body_xml(lines, tables):
+                buf.append(element)
+                if len(buf) >= FLUSH_EVERY:
+                    part.write(''.join(buf).encode('utf-8'))
+                    buf = []
+            buf.append(DOCUMENT_TAIL)
+            part.write(''.join(buf).encode('utf-8'))
+    return output_path
@@ -0,0 +1,28 @@
+"""
+markup_core — Shared OOXML redlining helpers for apply_redlines.py and review_draft.py.
+
+    skill   locate the docx skill and import its Document library on first use
+    text    whitespace normalization and XML escaping
+    runs    tracked-change run XML (w:r / w:ins / w:del) from diff operations
+    parts   fixes applied to unpacked package parts before the Document library loads them
+    bench   timing harness shared by the benchmark entry points
+    timings per-phase span tree and cProfile behind every script's --timings / --profile
+
+Nothing here imports the docx skill at import time, so `--help` and dry runs
+start without probing for it.
+"""
+
+from .parts import fix_utf16_files
+from .runs import text_to_runs, tracked_runs_xml
+from .skill import find_skill_root, load_skill
+from .text import esc, nm
+
+__all__ = [
+    "esc",
+    "find_skill_root",
+    "fix_utf16_files",
+    "load_skill",
+    "nm",
+    "text_to_runs",
+    "tracked_runs_xml",
+]
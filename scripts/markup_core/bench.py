@@ -0,0 +1,119 @@
+"""
+Timing harness shared by the benchmark entry points.
+
+benchmark_deal() times the redline hot paths on a reviewed deal — streaming
+word/document.xml, each diff level, and building tracked-change run XML —
+and prints one table. Run it through diff_engine.py:
+
+    python scripts/diff_engine.py bench ./deal_review/
+"""
+
+import difflib
+import time
+from pathlib import Path
+
+SAMPLE_RPR = '<w:rPr><w:rFonts w:ascii="Times New Roman"/><w:sz w:val="24"/></w:rPr>'
+
+
+def best_of(fn, repeat=3):
+    """Call fn() repeat times; return (fastest seconds, last result)."""
+    best, result = None, None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def print_table(header, rows):
+    """Print rows under a header, first column left-aligned, the rest right-aligned."""
+    widths = [max(len(str(r[i])) for r in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        cells = [str(row[0]).ljust(widths[0])]
+        cells += [str(c).rjust(w) for c, w in zip(row[1:], widths[1:])]
+        print('   ' + '  '.join(cells))
+
+
+def changed_paragraph_pairs(deal_dir, min_ratio=0.5):
+    """(original line, revised line) pairs for every reworded paragraph in a deal.
+
+    Lines inside a replaced block are paired in order and kept if they are
+    at least min_ratio similar, roughly as apply_redlines.py pairs them.
+    """
+    pairs = []
+    for folder in sorted((Path(deal_dir) / "provisions").iterdir()):
+        original, revised = folder / "original.txt", folder / "revised.txt"
+        if not (original.exists() and revised.exists()):
+            continue
+        old_lines = [l for l in original.read_text(encoding='utf-8').split('\n') if l.strip()]
+        new_lines = [l for l in revised.read_text(encoding='utf-8').split('\n') if l.strip()]
+        sm = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in sm.get_opcodes():
+            if tag != 'replace':
+                continue
+            for a, b in zip(old_lines[i1:i2], new_lines[j1:j2]):
+                if difflib.SequenceMatcher(None, a, b).quick_ratio() >= min_ratio:
+                    pairs.append((a, b))
+    return pairs
+
+
+def _split_words(ops):
+    return sum(1 for prev, nxt in zip(ops, ops[1:])
+               if 'eq' in (prev[0], nxt[0])
+               and prev[1][-1].isalnum() and nxt[1][0].isalnum())
+
+
+def benchmark_deal(deal_dir, repeat=3):
+    """Time the redline hot paths on a reviewed deal. Returns 0, or 1 if nothing to time."""
+    from diff_engine import DEFAULT_DIFF_LEVEL, DIFF_LEVELS, diff_ops
+    from docx_stream import parse_paragraphs
+    from .runs import tracked_runs_xml
+
+    deal_dir = Path(deal_dir)
+    rows = []
+
+    document_xml = deal_dir / "unpacked" / "word" / "document.xml"
+    if document_xml.exists():
+        data = document_xml.read_bytes()
+        seconds, records = best_of(lambda: parse_paragraphs(data), repeat)
+        rows.append(["stream document.xml", f"{seconds:.4f}", f"{len(records):,} paras", "", ""])
+
+    pairs = changed_paragraph_pairs(deal_dir)
+    if pairs:
+        default_ops = None
+        for level in DIFF_LEVELS:
+            seconds, results = best_of(lambda: [diff_ops(a, b, level) for a, b in pairs], repeat)
+            runs = sum(1 for ops in results for op, _ in ops if op != 'eq')
+            rows.append([f"diff {level}", f"{seconds:.4f}", f"{len(pairs):,} paras",
+                         f"{runs / len(pairs):.2f}", f"{sum(map(_split_words, results)):,}"])
+            if level == DEFAULT_DIFF_LEVEL:
+                default_ops = results
+        seconds, _ = best_of(lambda: [tracked_runs_xml(SAMPLE_RPR, ops) for ops in default_ops],
+                             repeat)
+        rows.append([f"run XML ({DEFAULT_DIFF_LEVEL})", f"{seconds:.4f}",
+                     f"{len(pairs):,} paras", "", ""])
+
+    if not rows:
+        print(f"Error: Nothing to benchmark in {deal_dir} (no unpacked/ or revised.txt files)")
+        return 1
+    chars = sum(len(a) + len(b) for a, b in pairs)
+    print(f"🔎 {deal_dir}: {len(pairs)} changed paragraphs, {chars:,} characters "
+          f"(best of {repeat})")
+    print_table(["step", "seconds", "input", "runs/para", "split words"], rows)
+    return 0
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Time the redline hot paths on a reviewed deal.")
+    parser.add_argument('deal_dir', help='Path to a deal with revised.txt files')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (default: 3)')
+    args = parser.parse_args()
+    return benchmark_deal(args.deal_dir, args.repeat)
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""Fixes applied to unpacked package parts before the Document library loads them."""
+
+import glob
+import os
+
+
+def fix_utf16_files(directory):
+    """Convert any UTF-16 encoded XML files to UTF-8."""
+    count = 0
+    for xml_path in glob.glob(os.path.join(directory, '**', '*.xml'), recursive=True):
+        with open(xml_path, 'rb') as f:
+            header = f.read(4)
+        if header[:2] in (b'\xff\xfe', b'\xfe\xff'):
+            with open(xml_path, 'rb') as f:
+                content = f.read()
+            text = content.decode('utf-16')
+            text = text.replace('encoding="utf-16"', 'encoding="UTF-8"')
+            text = text.replace("encoding='utf-16'", "encoding='UTF-8'")
+            with open(xml_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            count += 1
+    if count:
+        print(f"  Converted {count} UTF-16 XML file(s) to UTF-8")
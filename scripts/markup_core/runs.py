@@ -0,0 +1,44 @@
+"""Tracked-change run XML (w:r, w:ins, w:del) built from diff operations."""
+
+from functools import lru_cache
+
+from .text import esc
+
+
+@lru_cache(maxsize=1024)
+def _run_parts(rpr, is_del):
+    """(run prefix, run suffix, tab run) for one rPr; a paragraph reuses its rPr for every run."""
+    tag = 'w:delText' if is_del else 'w:t'
+    return (f'<w:r>{rpr}<{tag} xml:space="preserve">',
+            f'</{tag}></w:r>',
+            f'<w:r>{rpr}<w:tab/></w:r>')
+
+
+def text_to_runs(rpr, text, is_del=False):
+    """Convert text to XML runs, splitting at tab characters."""
+    prefix, suffix, tab = _run_parts(rpr, is_del)
+    if '\t' not in text:
+        return f'{prefix}{esc(text)}{suffix}' if text else ''
+    runs = []
+    segs = text.split('\t')
+    for i, seg in enumerate(segs):
+        if seg:
+            runs.append(f'{prefix}{esc(seg)}{suffix}')
+        if i < len(segs) - 1:
+            runs.append(tab)
+    return ''.join(runs)
+
+
+def tracked_runs_xml(rpr, ops):
+    """Build tracked-change XML runs from diff operations."""
+    parts = []
+    for op, text in ops:
+        if op == 'eq':
+            parts.append(text_to_runs(rpr, text, is_del=False))
+        elif op == 'del':
+            inner = text_to_runs(rpr, text, is_del=True)
+            parts.append(f'<w:del>{inner}</w:del>')
+        elif op == 'ins':
+            inner = text_to_runs(rpr, text, is_del=False)
+            parts.append(f'<w:ins>{inner}</w:ins>')
+    return ''.join(parts)
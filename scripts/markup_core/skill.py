@@ -0,0 +1,41 @@
+"""Locate the docx skill and import its Document library on first use."""
+
+import os
+import sys
+from functools import lru_cache
+from types import SimpleNamespace
+
+SKILL_CANDIDATES = [
+    '~/.claude/skills/docx',
+    '/mnt/skills/public/docx',
+    '/mnt/skills/docx',
+]
+
+
+@lru_cache(maxsize=None)
+def find_skill_root():
+    """Find the docx skill root directory (probed once per process)."""
+    for c in SKILL_CANDIDATES:
+        c = os.path.expanduser(c)
+        if os.path.isfile(os.path.join(c, 'scripts', 'document.py')):
+            return c
+    return None
+
+
+@lru_cache(maxsize=None)
+def load_skill():
+    """Import the docx skill's Document library.
+
+    Returns a namespace with Document, DocxXMLEditor and pack_document. Exits
+    with an error if the skill is not installed.
+    """
+    root = find_skill_root()
+    if not root:
+        sys.exit("ERROR: Could not find the docx skill. Expected at ~/.claude/skills/docx")
+    if root not in sys.path:
+        sys.path.insert(0, root)
+
+    from scripts.document import Document, DocxXMLEditor
+    from ooxml.scripts.pack import pack_document
+    return SimpleNamespace(root=root, Document=Document, DocxXMLEditor=DocxXMLEditor,
+                           pack_document=pack_document)
@@ -0,0 +1,19 @@
+"""Whitespace normalization and XML escaping."""
+
+import re
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+_XML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+
+def nm(t):
+    """Normalize whitespace for matching/indexing."""
+    return WHITESPACE_RE.sub(' ', t.strip())
+
+
+def esc(text):
+    """Escape text for XML content."""
+    if '&' in text or '<' in text or '>' in text:
+        return text.translate(_XML_ESCAPES)
+    return text
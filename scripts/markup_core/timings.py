@@ -0,0 +1,267 @@
+"""
+Phase timings and profiling shared by the scripts' --timings / --profile options.
+
+Scripts wrap their phases in span(); with --timings each span records wall
+and CPU seconds, the process's peak RSS when it ended and how many items
+it processed, nested as a tree. When the script exits the tree is merged
+into <deal>/timings.json under the script's name, so one file holds the
+latest run of each script:
+
+    {"apply_redlines": {"recorded_at": "...", "argv": [...],
+                        "spans": {"name": "apply_redlines", "wall_s": 4.1, ...,
+                                  "children": [{"name": "stream", ...}, ...]}}}
+
+--profile [PHASE] also runs cProfile inside every span named PHASE (each
+script names its hot phase as the default), writes the stats next to
+timings.json as profile_<script>_<PHASE>.prof and prints the top entries.
+
+Recording is off unless a script calls enable(); span() then returns one
+shared no-op object, so instrumented code costs a global lookup per phase.
+
+    from markup_core import timings
+
+    with timings.span("align", label=folder, items=len(paragraphs)) as s:
+        ...
+        s.count()       # one more item processed
+"""
+
+import atexit
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:      # Windows
+    resource = None
+
+TIMINGS_FILENAME = "timings.json"
+PROFILE_TOP = 25
+SUMMARY_DEPTH = 2        # levels of the span tree printed on exit
+
+_recorder = None
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _node(name, label=None, items=None):
+    node = {"name": name}
+    if label is not None:
+        node["label"] = str(label)
+    node.update(wall_s=None, cpu_s=None, peak_rss_mb=None, items=items, children=[])
+    return node
+
+
+class _NullSpan:
+    """What span() returns while recording is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def count(self, n=1):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One timed phase; use as a context manager."""
+    __slots__ = ('recorder', 'node', '_wall', '_cpu', '_profiling')
+
+    def __init__(self, recorder, node):
+        self.recorder, self.node = recorder, node
+        self._profiling = False
+
+    def __enter__(self):
+        rec = self.recorder
+        rec.stack[-1]["children"].append(self.node)
+        rec.stack.append(self.node)
+        if rec.profiler is not None and not rec.profiling and self.node["name"] == rec.profile_phase:
+            rec.profiling = self._profiling = True
+            rec.profiler.enable()
+        self._wall, self._cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall, cpu = time.perf_counter() - self._wall, time.process_time() - self._cpu
+        rec = self.recorder
+        if self._profiling:
+            rec.profiler.disable()
+            rec.profiling = self._profiling = False
+        _close(self.node, wall, cpu)
+        rec.stack.pop()
+        return False
+
+    def count(self, n=1):
+        """Add n to the items this span processed."""
+        self.node["items"] = (self.node["items"] or 0) + n
+
+
+def _close(node, wall, cpu):
+    node["wall_s"] = round(wall, 6)
+    node["cpu_s"] = round(cpu, 6)
+    node["peak_rss_mb"] = _peak_rss_mb()
+
+
+class Recorder:
+    """The span tree of one process (or of one collect() call)."""
+
+    def __init__(self, root, profile_phase=None):
+        self.root = root
+        self.stack = [root]
+        self.profile_phase = profile_phase
+        self.profiler = cProfile.Profile() if profile_phase else None
+        self.profiling = False
+        self.recorded_at = datetime.now(timezone.utc).isoformat()
+        self._wall, self._cpu = time.perf_counter(), time.process_time()
+
+    def close(self):
+        if self.root["wall_s"] is None:
+            _close(self.root, time.perf_counter() - self._wall, time.process_time() - self._cpu)
+
+
+def enabled():
+    """True while this process is recording spans."""
+    return _recorder is not None
+
+
+def span(name, label=None, items=None):
+    """Context manager timing one phase (a no-op unless recording is enabled)."""
+    if _recorder is None:
+        return _NULL_SPAN
+    return Span(_recorder, _node(name, label, items))
+
+
+def attach(spans):
+    """Add span trees recorded elsewhere (see collect()) under the current span."""
+    if _recorder is not None:
+        _recorder.stack[-1]["children"].extend(spans)
+
+
+def collect(fn, *args):
+    """Call fn(*args) recording its spans apart from the caller's.
+
+    Returns (result, spans). Process-pool workers use it to send their spans
+    back for the parent to attach(); nothing is written.
+    """
+    global _recorder
+    saved = _recorder
+    rec = _recorder = Recorder(_node("collect"))
+    try:
+        result = fn(*args)
+    finally:
+        _recorder = saved
+    return result, rec.root["children"]
+
+
+def add_arguments(parser, hot_phase):
+    """Add --timings and --profile [PHASE] to a script's argument parser."""
+    parser.add_argument(
+        '--timings', action='store_true',
+        help=f'Record a per-phase span tree (wall and CPU time, peak RSS, items) '
+             f'to {TIMINGS_FILENAME}'
+    )
+    parser.add_argument(
+        '--profile', nargs='?', const=hot_phase, metavar='PHASE',
+        help=f'Also cProfile every PHASE span (default: {hot_phase}) and write '
+             f'profile_<script>_<PHASE>.prof; implies --timings'
+    )
+
+
+def enable_from_args(args, script, output_dir):
+    """Start recording if --timings or --profile was given; write on exit."""
+    if getattr(args, 'timings', False) or getattr(args, 'profile', None):
+        enable(script, output_dir, getattr(args, 'profile', None))
+
+
+def enable(script, output_dir, profile_phase=None):
+    """Record spans for the rest of this process and write them to output_dir at exit."""
+    global _recorder
+    _recorder = Recorder(_node(script), profile_phase)
+    atexit.register(_finish, _recorder, script, str(output_dir))
+
+
+def profiled():
+    """True if a cProfile of the hot phase was requested (phases then run in-process)."""
+    return _recorder is not None and _recorder.profiler is not None
+
+
+def _aggregate(children):
+    """Children grouped by name, in first-seen order: [name, calls, wall, cpu, items, grandchildren]."""
+    groups = {}
+    for child in children:
+        g = groups.setdefault(child["name"], [child["name"], 0, 0.0, 0.0, None, []])
+        g[1] += 1
+        g[2] += child["wall_s"] or 0.0
+        g[3] += child["cpu_s"] or 0.0
+        if child["items"] is not None:
+            g[4] = (g[4] or 0) + child["items"]
+        g[5].extend(child["children"])
+    return groups.values()
+
+
+def _summary_rows(children, depth):
+    rows = []
+    for name, calls, wall, cpu, items, grandchildren in _aggregate(children):
+        rows.append(['  ' * depth + name, calls, f"{wall:.3f}s", f"{cpu:.3f}s",
+                     '' if items is None else f"{items:,}"])
+        if depth + 1 < SUMMARY_DEPTH:
+            rows.extend(_summary_rows(grandchildren, depth + 1))
+    return rows
+
+
+def _finish(rec, script, output_dir):
+    from .bench import print_table
+
+    global _recorder
+    rec.close()
+    if _recorder is rec:
+        _recorder = None
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, TIMINGS_FILENAME)
+    entry = {"recorded_at": rec.recorded_at, "argv": sys.argv[1:],
+             "python": sys.version.split()[0], "cpus": os.cpu_count()}
+
+    if rec.profiler is not None:
+        prof_name = f"profile_{script}_{rec.profile_phase}.prof"
+        rec.profiler.dump_stats(os.path.join(output_dir, prof_name))
+        entry["profile"] = prof_name
+        out = io.StringIO()
+        stats = pstats.Stats(rec.profiler, stream=out)
+        if stats.total_calls:
+            stats.sort_stats('cumulative').print_stats(PROFILE_TOP)
+            print(f"\n🔎 cProfile of '{rec.profile_phase}' spans "
+                  f"(top {PROFILE_TOP} by cumulative time, full stats in {prof_name}):")
+            print(out.getvalue().strip('\n'))
+        else:
+            print(f"\n⚠️  No '{rec.profile_phase}' span ran in this process; {prof_name} is empty")
+    entry["spans"] = rec.root
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            timings = json.load(f)
+    except (OSError, ValueError):
+        timings = {}
+    timings[script] = entry
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(timings, f, indent=2)
+
+    print(f"\nℹ️  Timings for {script} ({rec.root['wall_s']:.3f}s wall) → {path}")
+    print_table(["phase", "calls", "wall", "cpu", "items"],
+                _summary_rows(rec.root["children"], 0))
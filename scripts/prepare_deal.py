@@ -12,10 +12,18 @@ Usage:
 
 Features:
     - Splits agreement into provisions (by heading style or text pattern)
+    - Breaks oversized articles into word-balanced review units at Section
+      boundaries, recording the article/section tree in each manifest
+    - Writes a context.md per provision with only the definitions, cross-
+      referenced sections and preferences it needs
     - Creates structured folders with manifest files
     - Extracts full agreement text for context
     - Generates review_config.json
-    - Supports resume (won't overwrite existing reviewed provisions)
+    - Supports resume: re-running on a new draft turn rewrites only provisions
+      whose text changed, keeping review status and outputs for the rest
+    - Mirrors the manifests into deal.db, a SQLite index for --status, the
+      memo and the changes tracker (--no-db skips it)
+    - --timings / --profile record where the time goes (timings.json)
 """
 
 import argparse
@@ -24,10 +32,21 @@ import os
 import re
 import sys
 import hashlib
+import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from review_cache import ReviewCache, CACHED_FILES
+from context_bundle import DEFAULT_DEPTH, estimate_tokens, write_context_bundles
+from deal_index import DB_FILENAME, DealIndex
+from defined_terms import detect_defined_terms, update_terms_index
+from docx_package import DocxPackage
+from markup_core import timings
+from provision_lsh import ProvisionIndex
+from provision_units import DEFAULT_MAX_UNIT_WORDS, TOKENS_PER_WORD, balance_provisions
+from xref_graph import write_xref_graph
+
 
 # ---------------------------------------------------------------------------
 # Text-based splitting (works with .txt files)
@@ -111,32 +130,57 @@ def split_text_by_pattern(text: str, pattern: str) -> list[dict]:
 # DOCX-based splitting
 # ---------------------------------------------------------------------------
 
-def split_docx_by_style(docx_path: str, style_name: str) -> list[dict]:
-    """Split a .docx file by heading style. Returns text-based provisions."""
-    try:
-        from docx import Document
-    except ImportError:
-        print("Error: python-docx required. Install with:")
-        print("  pip install python-docx --break-system-packages")
-        sys.exit(1)
+class ParsedAgreement:
+    """A .docx loaded once, with its paragraph list, texts and styles cached.
 
-    doc = Document(docx_path)
-    split_points = []
-
-    for i, para in enumerate(doc.paragraphs):
-        if para.style and para.style.name.lower() == style_name.lower():
-            split_points.append((i, para.text.strip()))
+    python-docx rebuilds ``doc.paragraphs`` (and resolves each paragraph's
+    style) on every access, so the splitters, full-text extraction and style
+    auto-detection all share one instance instead of re-opening the package.
+    """
 
+    def __init__(self, docx_path: str):
+        try:
+            from docx import Document
+        except ImportError:
+            print("Error: python-docx required. Install with:")
+            print("  pip install python-docx --break-system-packages")
+            sys.exit(1)
+
+        self.path = docx_path
+        self.document = Document(docx_path)
+        self.paragraphs = self.document.paragraphs
+        self.texts = [p.text for p in self.paragraphs]
+        self._styles = None
+        self._full_text = None
+
+    @property
+    def styles(self) -> list[Optional[str]]:
+        """Lower-cased style name of each paragraph (None if unstyled)."""
+        if self._styles is None:
+            self._styles = [
+                p.style.name.lower() if p.style is not None else None
+                for p in self.paragraphs
+            ]
+        return self._styles
+
+    @property
+    def full_text(self) -> str:
+        """All non-blank paragraph text joined by blank lines."""
+        if self._full_text is None:
+            self._full_text = '\n\n'.join(t for t in self.texts if t.strip())
+        return self._full_text
+
+
+def split_paragraphs_at(texts: list[str], split_points: list[tuple]) -> list[dict]:
+    """Build provisions from paragraph texts and (index, title) split points."""
     if not split_points:
         return []
 
     provisions = []
-    paragraphs = doc.paragraphs
 
     # Preamble
     if split_points[0][0] > 0:
-        preamble_paras = paragraphs[:split_points[0][0]]
-        preamble_text = '\n\n'.join(p.text for p in preamble_paras if p.text.strip())
+        preamble_text = '\n\n'.join(t for t in texts[:split_points[0][0]] if t.strip())
         if preamble_text:
             provisions.append({
                 'title': 'Preamble',
@@ -149,10 +193,9 @@ def split_docx_by_style(docx_path: str, style_name: str) -> list[dict]:
         if idx + 1 < len(split_points):
             end_para = split_points[idx + 1][0]
         else:
-            end_para = len(paragraphs)
+            end_para = len(texts)
 
-        section_paras = paragraphs[start_para:end_para]
-        section_text = '\n\n'.join(p.text for p in section_paras if p.text.strip())
+        section_text = '\n\n'.join(t for t in texts[start_para:end_para] if t.strip())
 
         section_num = f"{idx + 1:02d}"
         provisions.append({
@@ -165,71 +208,31 @@ def split_docx_by_style(docx_path: str, style_name: str) -> list[dict]:
     return provisions
 
 
-def split_docx_by_pattern(docx_path: str, pattern: str) -> list[dict]:
-    """Split a .docx by text pattern matching. Returns text-based provisions."""
-    try:
-        from docx import Document
-    except ImportError:
-        print("Error: python-docx required. Install with:")
-        print("  pip install python-docx --break-system-packages")
-        sys.exit(1)
+def split_docx_by_style(agreement: ParsedAgreement, style_name: str) -> list[dict]:
+    """Split a parsed .docx by heading style. Returns text-based provisions."""
+    target = style_name.lower()
+    split_points = [
+        (i, agreement.texts[i].strip())
+        for i, style in enumerate(agreement.styles)
+        if style == target
+    ]
+    return split_paragraphs_at(agreement.texts, split_points)
+
 
-    doc = Document(docx_path)
+def split_docx_by_pattern(agreement: ParsedAgreement, pattern: str) -> list[dict]:
+    """Split a parsed .docx by text pattern matching. Returns text-based provisions."""
     regex = re.compile(pattern, re.IGNORECASE)
     split_points = []
-
-    for i, para in enumerate(doc.paragraphs):
-        if regex.match(para.text.strip()):
-            split_points.append((i, para.text.strip()))
-
-    if not split_points:
-        return []
-
-    provisions = []
-    paragraphs = doc.paragraphs
-
-    # Preamble
-    if split_points[0][0] > 0:
-        preamble_paras = paragraphs[:split_points[0][0]]
-        preamble_text = '\n\n'.join(p.text for p in preamble_paras if p.text.strip())
-        if preamble_text:
-            provisions.append({
-                'title': 'Preamble',
-                'text': preamble_text,
-                'start_line': 0,
-                'section_number': '00',
-            })
-
-    for idx, (start_para, title) in enumerate(split_points):
-        if idx + 1 < len(split_points):
-            end_para = split_points[idx + 1][0]
-        else:
-            end_para = len(paragraphs)
-
-        section_paras = paragraphs[start_para:end_para]
-        section_text = '\n\n'.join(p.text for p in section_paras if p.text.strip())
-
-        section_num = f"{idx + 1:02d}"
-        provisions.append({
-            'title': title,
-            'text': section_text,
-            'start_line': start_para,
-            'section_number': section_num,
-        })
-
-    return provisions
+    for i, text in enumerate(agreement.texts):
+        stripped = text.strip()
+        if regex.match(stripped):
+            split_points.append((i, stripped))
+    return split_paragraphs_at(agreement.texts, split_points)
 
 
 def extract_full_text_from_docx(docx_path: str) -> str:
     """Extract all text from a .docx for the full_agreement.txt context file."""
-    try:
-        from docx import Document
-    except ImportError:
-        print("Error: python-docx required.")
-        sys.exit(1)
-
-    doc = Document(docx_path)
-    return '\n\n'.join(p.text for p in doc.paragraphs if p.text.strip())
+    return ParsedAgreement(docx_path).full_text
 
 
 # ---------------------------------------------------------------------------
@@ -245,45 +248,43 @@ def sanitize_folder_name(title: str) -> str:
     return name[:80]
 
 
-def detect_cross_references(text: str) -> list[str]:
-    """Extract cross-references from provision text."""
-    patterns = [
-        r'Section\s+\d+[\.\d]*',
-        r'Article\s+[IVXLCDM]+',
-        r'Article\s+\d+',
-        r'Exhibit\s+[A-Z]',
-        r'Schedule\s+\d+[\.\d]*',
-        r'Annex\s+[A-Z]',
-    ]
-    refs = set()
-    for pattern in patterns:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            refs.add(match.group())
-    return sorted(refs)
-
-
-def detect_defined_terms(text: str) -> list[str]:
-    """Extract likely defined terms (capitalized multi-word phrases in quotes or caps)."""
-    patterns = [
-        r'"([A-Z][A-Za-z\s]+)"',         # "Defined Term"
-        r'\u201c([A-Z][A-Za-z\s]+)\u201d',  # "Defined Term" (smart quotes)
-    ]
-    terms = set()
-    for pattern in patterns:
-        for match in re.finditer(pattern, text):
-            term = match.group(1).strip()
-            if len(term) > 2 and len(term) < 60:
-                terms.add(term)
-    return sorted(terms)
+def provision_folder_name(provision: dict) -> str:
+    """Folder name for a provision: <section_number>_<sanitized title>.
+
+    In a review unit's section span the dots become underscores, so
+    "Sections 1.1-4.3" reads sections_1_1-4_3 rather than sections_11-43.
+    """
+    title = provision['title']
+    if 'parent' in provision:
+        title = re.sub(r'(?<=\d)\.(?=\d)', '_', title)
+    return f"{provision['section_number']}_{sanitize_folder_name(title)}"
+
+
+def provision_content_hash(text: str) -> str:
+    """Hash of a provision's original.txt content, used to detect changes."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+# Manifest fields recorded for review units cut from an oversized article
+HIERARCHY_FIELDS = ("parent", "part", "parts", "blank_lines_before", "sections")
+
+
+def _hierarchy_fields(provision: dict) -> dict:
+    return {key: provision[key] for key in HIERARCHY_FIELDS if key in provision}
 
 
 def create_provision_folder(
     output_dir: Path,
     provision: dict,
     full_agreement_hash: str,
+    cross_refs: list[str],
 ) -> Path:
-    """Create a provision folder with original.txt and manifest.json."""
-    folder_name = f"{provision['section_number']}_{sanitize_folder_name(provision['title'])}"
+    """Create a provision folder with original.txt and manifest.json.
+
+    cross_refs are the references the cross-reference graph found in the
+    provision (see provision_cross_references()).
+    """
+    folder_name = provision_folder_name(provision)
     folder_path = output_dir / "provisions" / folder_name
     folder_path.mkdir(parents=True, exist_ok=True)
 
@@ -291,8 +292,7 @@ def create_provision_folder(
     original_path = folder_path / "original.txt"
     original_path.write_text(provision['text'], encoding='utf-8')
 
-    # Detect cross-references and defined terms
-    cross_refs = detect_cross_references(provision['text'])
+    # Detect defined terms
     defined_terms = detect_defined_terms(provision['text'])
 
     # Create manifest
@@ -303,13 +303,15 @@ def create_provision_folder(
         "char_count": len(provision['text']),
         "word_count": len(provision['text'].split()),
         "cross_references": cross_refs,
-        "defined_terms_referenced": defined_terms,
+        "defined_terms": defined_terms,
         "status": "pending",
         "created_at": datetime.now(timezone.utc).isoformat(),
         "reviewed_at": None,
         "agreement_hash": full_agreement_hash,
+        "content_hash": provision_content_hash(provision['text']),
         "cross_ref_flags": [],
         "open_issues": [],
+        **_hierarchy_fields(provision),
     }
 
     manifest_path = folder_path / "manifest.json"
@@ -318,6 +320,219 @@ def create_provision_folder(
     return folder_path
 
 
+# Files produced by review that belong to a specific version of original.txt
+REVIEW_OUTPUT_FILES = ["original.txt", "manifest.json", "revised.txt",
+                       "analysis.md", "changes_summary.md"]
+
+
+def _existing_content_hash(folder: Path) -> Optional[str]:
+    """Content hash recorded for an existing provision folder (or computed)."""
+    manifest_path = folder / "manifest.json"
+    original_path = folder / "original.txt"
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        if manifest.get("content_hash"):
+            return manifest["content_hash"]
+    if original_path.exists():
+        return provision_content_hash(original_path.read_text(encoding='utf-8'))
+    return None
+
+
+def provision_cross_references(graph: dict) -> dict:
+    """folder -> sorted, de-duplicated references cited in it, from the xref graph."""
+    return {folder: sorted({r["ref"] for r in node["references"]})
+            for folder, node in graph["provisions"].items()}
+
+
+def _refresh_manifest(folder: Path, provision: dict, full_agreement_hash: str,
+                      cross_refs: list[str]) -> None:
+    """Update position/turn fields of a reused manifest, keeping review state."""
+    manifest_path = folder / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    updated = {
+        **{k: v for k, v in manifest.items() if k not in HIERARCHY_FIELDS},
+        "section_number": provision['section_number'],
+        "title": provision['title'],
+        "start_line": provision['start_line'],
+        "agreement_hash": full_agreement_hash,
+        "content_hash": provision_content_hash(provision['text']),
+        "cross_references": cross_refs,
+        **_hierarchy_fields(provision),
+    }
+    if updated != manifest:
+        manifest_path.write_text(json.dumps(updated, indent=2), encoding='utf-8')
+
+
+def update_provision_folders(
+    output_dir: Path,
+    provisions: list[dict],
+    full_agreement_hash: str,
+    cross_refs: dict,
+) -> list[tuple[Path, str]]:
+    """Incrementally sync provision folders with a new turn of the agreement.
+
+    Provisions whose text hash matches an existing folder keep that folder
+    untouched apart from position fields in manifest.json (renamed if the
+    provision was renumbered), so reviewed status and outputs survive.
+    Changed provisions (same folder, or same title under a new number) get a
+    fresh original.txt and a pending manifest; the prior turn's review files
+    are moved to previous/ inside the folder. Folders with no counterpart in
+    the new turn move to superseded/. cross_refs maps folder name to the
+    references cited in it.
+
+    Returns [(folder_path, state)] in provision order, where state is one of
+    "unchanged", "renumbered", "changed" or "new".
+    """
+    import shutil
+
+    provisions_dir = output_dir / "provisions"
+    existing = {}
+    for folder in sorted(provisions_dir.iterdir()):
+        if folder.is_dir() and not folder.name.startswith('.'):
+            existing[folder.name] = _existing_content_hash(folder)
+
+    # Plan pass 1: reuse folders whose content is identical (same name first)
+    by_hash = {}
+    for name, content_hash in existing.items():
+        by_hash.setdefault(content_hash, []).append(name)
+    claimed = set()
+    plan = []  # [provision, target folder, source folder, reused?]
+    for provision in provisions:
+        target = provision_folder_name(provision)
+        candidates = [c for c in by_hash.get(provision_content_hash(provision['text']), [])
+                      if c not in claimed]
+        source = target if target in candidates else (candidates[0] if candidates else None)
+        if source is not None:
+            claimed.add(source)
+        plan.append([provision, target, source, source is not None])
+
+    # Plan pass 2: changed provisions inherit the unclaimed folder with the
+    # same name, or with the same title under a different number
+    def title_key(name):
+        return name.split('_', 1)[-1]
+
+    for entry in plan:
+        if entry[2] is not None:
+            continue
+        target = entry[1]
+        source = target if target in existing and target not in claimed else next(
+            (n for n in existing if n not in claimed and title_key(n) == title_key(target)),
+            None)
+        if source is not None:
+            claimed.add(source)
+            entry[2] = source
+
+    # Move every folder out of the way first, so renumbering chains
+    # (05 -> 06, 06 -> 07, ...) cannot collide with each other.
+    staging = provisions_dir / ".incremental"
+    staging.mkdir(exist_ok=True)
+    for name in existing:
+        (provisions_dir / name).rename(staging / name)
+
+    results = []
+    for provision, target, source, reused in plan:
+        folder = provisions_dir / target
+        if source is not None:
+            (staging / source).rename(folder)
+        if reused:
+            _refresh_manifest(folder, provision, full_agreement_hash, cross_refs[target])
+            results.append((folder, "unchanged" if source == target else "renumbered"))
+            continue
+
+        if source is not None:
+            # Keep the prior turn's review next to the new text for reference
+            previous = folder / "previous"
+            if previous.exists():
+                shutil.rmtree(previous)
+            previous.mkdir()
+            for filename in REVIEW_OUTPUT_FILES:
+                if (folder / filename).exists():
+                    (folder / filename).rename(previous / filename)
+        create_provision_folder(output_dir, provision, full_agreement_hash, cross_refs[target])
+        results.append((folder, "changed" if source is not None else "new"))
+
+    leftovers = sorted(staging.iterdir())
+    if leftovers:
+        superseded = output_dir / "superseded"
+        superseded.mkdir(exist_ok=True)
+        for path in leftovers:
+            dest = superseded / path.name
+            if dest.exists():
+                shutil.rmtree(dest)
+            path.rename(dest)
+    staging.rmdir()
+
+    return results
+
+
+def apply_review_cache(output_dir: Path, posture: str, skill_names: list[str],
+                       cache: ReviewCache) -> list[str]:
+    """Fill pending provisions from the cross-deal review cache.
+
+    A hit writes the cached revised.txt / analysis.md / changes_summary.md
+    into the folder and marks the manifest reviewed with review_source
+    "cache", so /review-all skips it. Returns the folder names filled.
+    """
+    filled = []
+    for folder in sorted((output_dir / "provisions").iterdir()):
+        manifest_path = folder / "manifest.json"
+        original_path = folder / "original.txt"
+        if not manifest_path.exists() or not original_path.exists():
+            continue
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        if manifest.get("status") != "pending":
+            continue
+
+        key = ReviewCache.key(original_path.read_text(encoding='utf-8'),
+                              posture, skill_names)
+        hit = cache.get(key)
+        if hit is None:
+            continue
+
+        for name in CACHED_FILES:
+            if name in hit["files"]:
+                (folder / name).write_text(hit["files"][name], encoding='utf-8')
+        manifest.update(hit["manifest"])
+        manifest.update({
+            "status": "reviewed",
+            "reviewed_at": datetime.now(timezone.utc).isoformat(),
+            "review_source": "cache",
+            "cache_key": key,
+            "cached_from": hit.get("source", ""),
+        })
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        filled.append(folder.name)
+    return filled
+
+
+def find_similar_provisions(output_dir: Path, index: ProvisionIndex, k: int = 3) -> int:
+    """Record the top-k near-duplicate provisions from prior deals in each manifest.
+
+    Each match is {"deal", "folder", "title", "similarity", "path"}, where
+    path points at the prior revised.txt relative to this deal's directory.
+    Returns the number of provisions with at least one match.
+    """
+    deal_dir = output_dir.resolve()
+    matched = 0
+    for folder in sorted((output_dir / "provisions").iterdir()):
+        manifest_path = folder / "manifest.json"
+        original_path = folder / "original.txt"
+        if not manifest_path.exists() or not original_path.exists():
+            continue
+        matches = index.query(original_path.read_text(encoding='utf-8'), k=k,
+                              exclude_deal=deal_dir.name)
+        for m in matches:
+            revised = index.library_dir.resolve() / m["deal"] / "provisions" / m["folder"] / "revised.txt"
+            m["path"] = os.path.relpath(revised, deal_dir)
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        if manifest.get("similar_provisions", []) != matches:
+            manifest["similar_provisions"] = matches
+            manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        if matches:
+            matched += 1
+    return matched
+
+
 def create_review_config(output_dir: Path, posture: str, notes: str = "",
                         has_term_sheet: bool = False,
                         skills: list[dict] = None) -> Path:
@@ -427,10 +642,17 @@ def install_skills(output_dir: Path, skill_paths: list[str]) -> list[dict]:
 
 
 def get_review_status(output_dir: Path) -> dict:
-    """Check review progress across all provision folders."""
+    """Check review progress across all provision folders.
+
+    Answered from deal.db (synced first) when the deal has one.
+    """
     provisions_dir = output_dir / "provisions"
     if not provisions_dir.exists():
         return {"total": 0, "reviewed": 0, "pending": 0, "provisions": []}
+    if (output_dir / DB_FILENAME).exists():
+        with DealIndex(output_dir) as index:
+            index.sync()
+            return index.status()
 
     statuses = []
     for folder in sorted(provisions_dir.iterdir()):
@@ -456,77 +678,95 @@ def get_review_status(output_dir: Path) -> dict:
 
 
 # ---------------------------------------------------------------------------
-# Main
+# Workspace template (CLAUDE.md, slash commands, scripts)
 # ---------------------------------------------------------------------------
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Prepare a loan agreement for agentic review with Claude Code.",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Auto-detect article pattern from a text file
-  python prepare_deal.py agreement.txt --posture borrower_friendly
+def load_workspace_template(plugin_dir: Path) -> dict:
+    """Read the files every deal workspace gets a copy of, once.
 
-  # Split a Word doc by heading style
-  python prepare_deal.py agreement.docx --style "Heading 1" --posture balanced
+    Returns a dict with the deal-level CLAUDE.md content (and where it came
+    from), the slash command files and the scripts, each as
+    (filename, bytes, mode) entries. Batch mode loads this once and shares it
+    across all deals instead of re-reading the plugin tree per deal.
+    """
+    template = {"claude_md": None, "claude_md_source": None,
+                "commands": [], "scripts": []}
 
-  # Split by custom pattern
-  python prepare_deal.py agreement.docx --pattern "ARTICLE" --posture lender_friendly
+    # Use the deal-review-methodology skill as the deal CLAUDE.md (contains full
+    # review methodology). Fall back to root CLAUDE.md if skill not found.
+    methodology_skill = plugin_dir / "skills" / "deal-review-methodology" / "SKILL.md"
+    claude_md = plugin_dir / "CLAUDE.md"
+    if methodology_skill.exists():
+        # Strip YAML frontmatter (--- ... ---) before writing as CLAUDE.md
+        content = methodology_skill.read_text(encoding="utf-8")
+        if content.startswith("---"):
+            end = content.find("---", 3)
+            if end != -1:
+                content = content[end + 3:].lstrip("\n")
+        template["claude_md"] = content
+        template["claude_md_source"] = "deal-review-methodology skill"
+    elif claude_md.exists():
+        template["claude_md"] = claude_md.read_text(encoding="utf-8")
 
-  # Check review progress
-  python prepare_deal.py --status ./my_deal_review/
+    # Plugin structure: commands live in commands/ (not .claude/commands/)
+    commands_src = plugin_dir / "commands"
+    if not commands_src.exists():
+        commands_src = plugin_dir / ".claude" / "commands"  # fallback for old structure
+    if commands_src.exists():
+        template["commands"] = [
+            (f.name, f.read_bytes(), f.stat().st_mode)
+            for f in sorted(commands_src.glob("*.md"))
+        ]
+
+    # Top-level scripts plus the markup_core package they import
+    scripts_dir = plugin_dir / "scripts"
+    template["scripts"] = [
+        (f.relative_to(scripts_dir).as_posix(), f.read_bytes(), f.stat().st_mode)
+        for f in sorted(scripts_dir.glob("*.py")) + sorted(scripts_dir.glob("markup_core/*.py"))
+    ]
+    return template
 
-  # Add client-specific notes
-  python prepare_deal.py agreement.txt --posture borrower_friendly \\
-      --notes "Client wants aggressive push on cure periods and cash management"
-        """,
-    )
 
-    parser.add_argument('input_file', nargs='?', help='Path to agreement (.docx or .txt)')
-    parser.add_argument('--style', '-s', help='Heading style to split on (for .docx)')
-    parser.add_argument('--pattern', '-p', help='Regex pattern to split on')
-    parser.add_argument('--posture', default='borrower_friendly',
-                        choices=['borrower_friendly', 'lender_friendly', 'balanced', 'compliance_only'],
-                        help='Review posture (default: borrower_friendly)')
-    parser.add_argument('--output-dir', '-o', help='Output directory (default: ./deal_review/)')
-    parser.add_argument('--notes', '-n', default='', help='Client-specific review notes')
-    parser.add_argument('--term-sheet', '-t', help='Path to term sheet or deal summary (.txt, .docx, .pdf)')
-    parser.add_argument('--skill', '-k', action='append', default=[],
-                        help='Path to a topical skill/reference file (.md). Repeatable: --skill file1.md --skill file2.md')
-    parser.add_argument('--status', nargs='?', const='./deal_review/',
-                        help='Show review progress for an existing deal directory')
+def _write_template_files(dest_dir: Path, files: list[tuple]) -> None:
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    for name, data, mode in files:
+        dest = dest_dir / name
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(data)
+        os.chmod(dest, mode & 0o777)
 
-    args = parser.parse_args()
 
-    # Status check mode
-    if args.status:
-        status_dir = Path(args.status)
-        if not status_dir.exists():
-            print(f"Error: Directory not found: {status_dir}")
-            return 1
-        status = get_review_status(status_dir)
-        print(f"\n{'='*60}")
-        print(f"Deal Review Status: {status_dir}")
-        print(f"{'='*60}")
-        print(f"Total provisions:    {status['total']}")
-        print(f"Reviewed:            {status['reviewed']}")
-        print(f"Pending:             {status['pending']}")
-        print(f"\nProvision Details:")
-        print(f"{'-'*60}")
-        for p in status['provisions']:
-            icon = "✅" if p['status'] == 'reviewed' else "⏳"
-            print(f"  {icon} {p['folder']}: {p['status']}")
-        return 0
+def install_workspace_template(output_dir: Path, template: dict) -> None:
+    """Write CLAUDE.md, slash commands and scripts into a deal workspace."""
+    if template["claude_md"] is not None:
+        (output_dir / "CLAUDE.md").write_text(template["claude_md"], encoding="utf-8")
+        if template["claude_md_source"]:
+            print(f"✅ CLAUDE.md copied to workspace (from {template['claude_md_source']})")
+        else:
+            print(f"✅ CLAUDE.md copied to workspace")
+
+    if template["commands"]:
+        _write_template_files(output_dir / ".claude" / "commands", template["commands"])
+        print(f"✅ Slash commands copied ({len(template['commands'])} commands)")
+
+    # Copy scripts into workspace for assemble_deal.py access
+    _write_template_files(output_dir / "scripts", template["scripts"])
+    print(f"✅ Scripts copied to workspace")
 
-    if not args.input_file:
-        parser.print_help()
-        return 1
 
+# ---------------------------------------------------------------------------
+# Workspace preparation
+# ---------------------------------------------------------------------------
+
+def prepare_workspace(args: argparse.Namespace, template: Optional[dict] = None) -> dict:
+    """Build one deal workspace from parsed prepare_deal arguments.
+
+    Returns a small summary dict (output_dir, provisions, total_words,
+    agreement_hash). Raises FileNotFoundError if the agreement is missing.
+    """
     input_path = Path(args.input_file)
     if not input_path.exists():
-        print(f"Error: File not found: {input_path}")
-        return 1
+        raise FileNotFoundError(f"File not found: {input_path}")
 
     # Determine output directory
     output_dir = Path(args.output_dir) if args.output_dir else Path('./deal_review')
@@ -543,73 +783,114 @@ Examples:
     # --- Extract full text and split ---
     is_docx = input_path.suffix.lower() == '.docx'
 
-    if is_docx:
-        full_text = extract_full_text_from_docx(str(input_path))
-    else:
-        full_text = input_path.read_text(encoding='utf-8')
+    with timings.span("extract"):
+        if is_docx:
+            agreement = ParsedAgreement(str(input_path))
+            full_text = agreement.full_text
+        else:
+            full_text = input_path.read_text(encoding='utf-8')
 
-    # Write full agreement text
-    full_agreement_path = output_dir / "full_agreement.txt"
-    full_agreement_path.write_text(full_text, encoding='utf-8')
-    print(f"✅ Full agreement text extracted ({len(full_text):,} chars)")
+        # Write full agreement text
+        full_agreement_path = output_dir / "full_agreement.txt"
+        full_agreement_path.write_text(full_text, encoding='utf-8')
+        print(f"✅ Full agreement text extracted ({len(full_text):,} chars)")
 
     # Compute hash for integrity tracking
     agreement_hash = hashlib.sha256(full_text.encode()).hexdigest()[:16]
 
     # Split into provisions
-    provisions = []
-    if is_docx:
-        if args.style:
-            provisions = split_docx_by_style(str(input_path), args.style)
-        elif args.pattern:
-            provisions = split_docx_by_pattern(str(input_path), args.pattern)
-        else:
-            # Try auto-detect on the extracted text
-            detected = detect_split_pattern(full_text)
-            if detected:
-                print(f"📎 Auto-detected pattern: {detected}")
-                provisions = split_docx_by_pattern(str(input_path), detected)
+    with timings.span("split") as span:
+        provisions = []
+        if is_docx:
+            if args.style:
+                provisions = split_docx_by_style(agreement, args.style)
+            elif args.pattern:
+                provisions = split_docx_by_pattern(agreement, args.pattern)
             else:
-                # Fall back to trying common heading styles
-                try:
-                    from docx import Document
-                    doc = Document(str(input_path))
-                    for style in ["Heading 1", "heading 1", "HEADING 1"]:
-                        provisions = split_docx_by_style(str(input_path), style)
+                # Try auto-detect on the extracted text
+                detected = detect_split_pattern(full_text)
+                if detected:
+                    print(f"📎 Auto-detected pattern: {detected}")
+                    provisions = split_docx_by_pattern(agreement, detected)
+                else:
+                    # Fall back to the common top-level heading style
+                    try:
+                        provisions = split_docx_by_style(agreement, "Heading 1")
                         if provisions:
-                            print(f"📎 Split by style: {style}")
-                            break
-                except Exception:
-                    pass
-    else:
-        if args.pattern:
-            provisions = split_text_by_pattern(full_text, args.pattern)
+                            print(f"📎 Split by style: Heading 1")
+                    except Exception:
+                        pass
         else:
-            detected = detect_split_pattern(full_text)
-            if detected:
-                print(f"📎 Auto-detected pattern: {detected}")
-                provisions = split_text_by_pattern(full_text, detected)
-
-    if not provisions:
-        print("\n⚠️  Could not detect provision boundaries.")
-        print("    Try specifying --pattern or --style explicitly.")
-        print("    Common patterns: 'ARTICLE', '^SECTION \\d+', '^\\d+\\.'")
-        # Create a single provision with the full text as fallback
-        provisions = [{
-            'title': 'Full Agreement',
-            'text': full_text,
-            'start_line': 0,
-            'section_number': '01',
-        }]
-        print("    Created single provision with full agreement text.\n")
-
-    # Create provision folders
-    print(f"\n📂 Creating {len(provisions)} provision folders...")
-    for provision in provisions:
-        folder = create_provision_folder(output_dir, provision, agreement_hash)
+            if args.pattern:
+                provisions = split_text_by_pattern(full_text, args.pattern)
+            else:
+                detected = detect_split_pattern(full_text)
+                if detected:
+                    print(f"📎 Auto-detected pattern: {detected}")
+                    provisions = split_text_by_pattern(full_text, detected)
+
+        if not provisions:
+            print("\n⚠️  Could not detect provision boundaries.")
+            print("    Try specifying --pattern or --style explicitly.")
+            print("    Common patterns: 'ARTICLE', '^SECTION \\d+', '^\\d+\\.'")
+            # Create a single provision with the full text as fallback
+            provisions = [{
+                'title': 'Full Agreement',
+                'text': full_text,
+                'start_line': 0,
+                'section_number': '01',
+            }]
+            print("    Created single provision with full agreement text.\n")
+
+        # Break oversized articles into review units at section boundaries
+        max_unit_words = getattr(args, 'max_unit_words', DEFAULT_MAX_UNIT_WORDS)
+        split_count = len(provisions)
+        provisions = balance_provisions(provisions, max_unit_words)
+        if len(provisions) > split_count:
+            parents = {p['parent']['section_number'] for p in provisions if 'parent' in p}
+            print(f"📎 Split {len(parents)} oversized provision(s) into "
+                  f"{len(provisions) - split_count + len(parents)} review units "
+                  f"(≤ ~{max_unit_words:,} words each)")
+        span.count(len(provisions))
+
+    # One scan of each provision for references: the graph, then the manifests
+    folder_names = [provision_folder_name(provision) for provision in provisions]
+    with timings.span("xref_graph"):
+        graph = write_xref_graph(output_dir, [(name, provision['text'])
+                                              for name, provision in zip(folder_names, provisions)])
+    cross_refs = provision_cross_references(graph)
+
+    # Create provision folders (incrementally when the workspace already has some)
+    incremental = (getattr(args, 'incremental', True)
+                   and (output_dir / "provisions").is_dir()
+                   and any((output_dir / "provisions").iterdir()))
+    with timings.span("folders", items=len(provisions)):
+        if incremental:
+            print(f"\n📂 Updating {len(provisions)} provision folders (incremental)...")
+            states = update_provision_folders(output_dir, provisions, agreement_hash, cross_refs)
+        else:
+            print(f"\n📂 Creating {len(provisions)} provision folders...")
+            states = [(create_provision_folder(output_dir, provision, agreement_hash,
+                                               cross_refs[name]), None)
+                      for name, provision in zip(folder_names, provisions)]
+    for provision, (folder, state) in zip(provisions, states):
         word_count = len(provision['text'].split())
-        cross_refs = len(detect_cross_references(provision['text']))
-        print(f"   └── {folder.name} ({word_count:,} words, {cross_refs} cross-refs)")
+        suffix = f" [{state}]" if state else ""
+        print(f"   └── {folder.name} ({word_count:,} words, "
+              f"{len(cross_refs[folder.name])} cross-refs){suffix}")
+    if incremental:
+        counts = {}
+        for _, state in states:
+            counts[state] = counts.get(state, 0) + 1
+        print(f"   {counts.get('unchanged', 0) + counts.get('renumbered', 0)} unchanged "
+              f"({counts.get('renumbered', 0)} renumbered), "
+              f"{counts.get('changed', 0)} changed, {counts.get('new', 0)} new")
+    print(f"✅ Cross-reference graph: xref_graph.json ({len(graph['dangling'])} dangling, "
+          f"{len(graph['cycles'])} circular)")
+    with timings.span("terms_index"):
+        terms_index, _ = update_terms_index(output_dir)
+    print(f"✅ Defined-term index: defined_terms_index.json "
+          f"({len(terms_index['terms'])} terms)")
 
     # Copy original file for reference
     import shutil
@@ -662,60 +943,61 @@ Examples:
                         has_term_sheet=has_ts, skills=installed_skills)
     print(f"\n✅ Review config created (posture: {args.posture})")
 
+    # --- Pre-populate provisions already reviewed in earlier deals ---
+    if getattr(args, 'cache', True):
+        cache = ReviewCache(getattr(args, 'cache_dir', None))
+        with timings.span("review_cache"):
+            filled = apply_review_cache(output_dir, args.posture,
+                                        [s['name'] for s in installed_skills], cache)
+        if filled:
+            print(f"♻️  {len(filled)} provision(s) reviewed (cached) from prior deals:")
+            for name in filled:
+                print(f"   └── {name}")
+
+    # --- Point reviewers at near-duplicate provisions from prior deals ---
+    similar_k = getattr(args, 'similar', 3)
+    if similar_k:
+        library_dir = Path(getattr(args, 'library_dir', None) or output_dir.resolve().parent)
+        index = ProvisionIndex(library_dir)
+        if len(index):
+            with timings.span("similar"):
+                matched = find_similar_provisions(output_dir, index, similar_k)
+            print(f"🔎 {matched} provision(s) matched against {len(index):,} "
+                  f"reviewed provisions in {library_dir}")
+
+    # --- Minimal per-provision context for the parallel review agents ---
+    if getattr(args, 'context', True):
+        with timings.span("context") as span:
+            sizes = write_context_bundles(output_dir, getattr(args, 'context_depth', DEFAULT_DEPTH))
+            span.count(len(sizes))
+        if sizes:
+            print(f"✅ Context bundles: context.md in {len(sizes)} provisions "
+                  f"(~{sum(sizes.values()) // len(sizes):,} tokens on average vs "
+                  f"~{estimate_tokens(full_text):,} for full_agreement.txt)")
+
     # --- Unpack .docx for tracked changes workflow ---
     if is_docx:
         unpacked_dir = output_dir / "unpacked"
-        docx_scripts = Path("/mnt/skills/public/docx/scripts")
-        if docx_scripts.exists():
-            import subprocess
-            unpack_script = docx_scripts / "office" / "unpack.py"
-            result = subprocess.run(
-                ["python3", str(unpack_script), str(input_path), str(unpacked_dir)],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0:
-                print(f"✅ DOCX unpacked for tracked changes workflow")
-            else:
-                print(f"⚠️  DOCX unpack failed: {result.stderr[:200]}")
-        else:
-            print(f"ℹ️  DOCX skill not available; tracked changes workflow disabled")
-
-    # Copy methodology as deal-level CLAUDE.md and commands into workspace
-    script_dir = Path(__file__).resolve().parent.parent
-    # Use the deal-review-methodology skill as the deal CLAUDE.md (contains full
-    # review methodology). Fall back to root CLAUDE.md if skill not found.
-    methodology_skill = script_dir / "skills" / "deal-review-methodology" / "SKILL.md"
-    claude_md = script_dir / "CLAUDE.md"
-    if methodology_skill.exists():
-        # Strip YAML frontmatter (--- ... ---) before writing as CLAUDE.md
-        content = methodology_skill.read_text(encoding="utf-8")
-        if content.startswith("---"):
-            end = content.find("---", 3)
-            if end != -1:
-                content = content[end + 3:].lstrip("\n")
-        (output_dir / "CLAUDE.md").write_text(content, encoding="utf-8")
-        print(f"✅ CLAUDE.md copied to workspace (from deal-review-methodology skill)")
-    elif claude_md.exists():
-        shutil.copy2(claude_md, output_dir / "CLAUDE.md")
-        print(f"✅ CLAUDE.md copied to workspace")
-
-    # Plugin structure: commands live in commands/ (not .claude/commands/)
-    commands_src = script_dir / "commands"
-    if not commands_src.exists():
-        commands_src = script_dir / ".claude" / "commands"  # fallback for old structure
-    if commands_src.exists():
-        commands_dst = output_dir / ".claude" / "commands"
-        commands_dst.mkdir(parents=True, exist_ok=True)
-        for cmd_file in commands_src.glob("*.md"):
-            shutil.copy2(cmd_file, commands_dst / cmd_file.name)
-        print(f"✅ Slash commands copied ({len(list(commands_src.glob('*.md')))} commands)")
-
-    # Copy scripts into workspace for assemble_deal.py access
-    scripts_dst = output_dir / "scripts"
-    scripts_dst.mkdir(parents=True, exist_ok=True)
-    for script_file in script_dir.glob("scripts/*.py"):
-        shutil.copy2(script_file, scripts_dst / script_file.name)
-    print(f"✅ Scripts copied to workspace")
+        try:
+            with timings.span("unpack"):
+                count = DocxPackage(str(input_path)).extract_xml(str(unpacked_dir))
+            print(f"✅ DOCX unpacked for tracked changes workflow ({count} XML parts)")
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f"⚠️  DOCX unpack failed: {e}")
+
+    # --- Index the manifests for status queries, the memo and the tracker ---
+    if getattr(args, 'db', True):
+        with timings.span("deal_db") as span:
+            with DealIndex(output_dir) as index:
+                span.count(index.sync())
+                indexed = index.status()["total"]
+        print(f"✅ Deal index: {DB_FILENAME} ({indexed} provisions)")
+
+    # Copy methodology as deal-level CLAUDE.md, commands and scripts
+    if template is None:
+        template = load_workspace_template(Path(__file__).resolve().parent.parent)
+    with timings.span("template"):
+        install_workspace_template(output_dir, template)
 
     # Summary
     total_words = sum(len(p['text'].split()) for p in provisions)
@@ -732,6 +1014,328 @@ Examples:
     print(f"     or review a single provision: /review-provision provisions/01_...")
     print()
 
+    return {
+        "output_dir": str(output_dir),
+        "provisions": len(provisions),
+        "total_words": total_words,
+        "agreement_hash": agreement_hash,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Batch mode
+# ---------------------------------------------------------------------------
+
+REVIEW_POSTURES = ['borrower_friendly', 'lender_friendly', 'balanced', 'compliance_only']
+
+BATCH_DEAL_DEFAULTS = {
+    "incremental": True,
+    "cache": True,
+    "cache_dir": None,
+    "similar": 3,
+    "library_dir": None,
+    "style": None,
+    "pattern": None,
+    "posture": "borrower_friendly",
+    "output_dir": None,
+    "notes": "",
+    "term_sheet": None,
+    "skill": [],
+    "max_unit_words": DEFAULT_MAX_UNIT_WORDS,
+    "context": True,
+    "context_depth": DEFAULT_DEPTH,
+    "db": True,
+}
+
+_batch_template = None
+
+
+def load_batch_manifest(manifest_path: Path) -> list[dict]:
+    """Read a batch manifest into a list of per-deal option dicts.
+
+    The manifest is either a JSON list of deals or an object with a "deals"
+    list and optional "defaults". Each deal uses the CLI option names
+    (input_file, output_dir, posture, notes, term_sheet, skill, style,
+    pattern, max_unit_words, context, context_depth, db) plus an optional
+    "name"; output_dir defaults to deals/<name>.
+    Relative paths are resolved against the manifest's directory.
+    Raises ValueError for a manifest that is not valid JSON, an unknown
+    option name, or an entry that is malformed.
+    """
+    data = json.loads(manifest_path.read_text(encoding='utf-8'))
+    if isinstance(data, list):
+        data = {"deals": data}
+    if not isinstance(data, dict) or not isinstance(data.get("deals", []), list) \
+            or not isinstance(data.get("defaults", {}), dict):
+        raise ValueError('expected a list of deals or {"deals": [...], "defaults": {...}}')
+    allowed = set(BATCH_DEAL_DEFAULTS) | {"input_file", "name"}
+    unknown = sorted(set(data.get("defaults", {})) - allowed)
+    if unknown:
+        raise ValueError(f"Unknown batch option(s) in defaults: {', '.join(unknown)}")
+    defaults = {**BATCH_DEAL_DEFAULTS, **data.get("defaults", {})}
+    base = manifest_path.resolve().parent
+
+    def resolve(path):
+        return str(base / path) if path else path
+
+    deals = []
+    for entry in data.get("deals", []):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Batch entry is not an object: {entry!r}")
+        unknown = sorted(set(entry) - allowed)
+        if unknown:
+            raise ValueError(f"Unknown batch option(s) {', '.join(unknown)}: {entry}")
+        deal = {**defaults, **entry}
+        if not deal.get("input_file"):
+            raise ValueError(f"Batch entry without input_file: {entry}")
+        if deal["posture"] not in REVIEW_POSTURES:
+            raise ValueError(f"Batch entry with unknown posture {deal['posture']!r} "
+                             f"(expected one of {', '.join(REVIEW_POSTURES)}): {entry}")
+        if isinstance(deal["skill"], str):
+            deal["skill"] = [deal["skill"]]
+        deal["name"] = deal.get("name") or Path(deal["input_file"]).stem
+        deal["input_file"] = resolve(deal["input_file"])
+        deal["output_dir"] = resolve(deal["output_dir"] or f"deals/{deal['name']}")
+        deal["term_sheet"] = resolve(deal["term_sheet"])
+        deal["skill"] = [resolve(k) for k in deal["skill"]]
+        deals.append(deal)
+    return deals
+
+
+def _init_batch_worker(template: dict) -> None:
+    global _batch_template
+    _batch_template = template
+
+
+def _timed_prepare(args: argparse.Namespace, template: dict, name: str) -> dict:
+    """prepare_workspace() inside a "deal" span."""
+    with timings.span("deal", label=name):
+        return prepare_workspace(args, template)
+
+
+def _prepare_batch_deal(deal: dict, timed: bool = False) -> dict:
+    """Worker: prepare one deal, capturing its console output.
+
+    With timed set, the deal's spans come back under "spans".
+    """
+    import io
+    import time
+    import traceback
+    from contextlib import redirect_stdout
+
+    args = argparse.Namespace(**{k: deal[k] for k in BATCH_DEAL_DEFAULTS},
+                              input_file=deal["input_file"])
+    log = io.StringIO()
+    result = {"name": deal["name"], "input_file": deal["input_file"],
+              "output_dir": deal["output_dir"]}
+    t0, c0 = time.perf_counter(), time.process_time()
+    try:
+        with redirect_stdout(log):
+            if timed:
+                summary, result["spans"] = timings.collect(_timed_prepare, args,
+                                                           _batch_template, deal["name"])
+                result.update(summary)
+            else:
+                result.update(prepare_workspace(args, _batch_template))
+        result["status"] = "ok"
+    except (Exception, SystemExit) as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["log_tail"] = (log.getvalue() + traceback.format_exc())[-2000:]
+    result["wall_seconds"] = round(time.perf_counter() - t0, 3)
+    result["cpu_seconds"] = round(time.process_time() - c0, 3)
+    return result
+
+
+def run_batch(manifest_path: Path, jobs: Optional[int] = None,
+              summary_path: Optional[Path] = None) -> int:
+    """Prepare every deal in a batch manifest across a process pool.
+
+    The workspace template is read once in the parent and handed to each
+    worker at start-up. Writes a JSON summary with per-deal timings and
+    failures; returns 1 if any deal failed.
+    """
+    import time
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    if not manifest_path.exists():
+        print(f"Error: Batch manifest not found: {manifest_path}")
+        return 1
+    try:
+        deals = load_batch_manifest(manifest_path)
+    except ValueError as e:
+        print(f"Error: Invalid batch manifest {manifest_path}: {e}")
+        return 1
+    if not deals:
+        print(f"Error: No deals listed in {manifest_path}")
+        return 1
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(deals)))
+    summary_path = summary_path or manifest_path.with_name(
+        f"{manifest_path.stem}_summary.json")
+    template = load_workspace_template(Path(__file__).resolve().parent.parent)
+
+    print(f"\n{'='*60}")
+    print(f"Markup — Batch preparation")
+    print(f"{'='*60}")
+    print(f"Manifest: {manifest_path}")
+    print(f"Deals:    {len(deals)}")
+    print(f"Workers:  {jobs}")
+    print()
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    t0 = time.perf_counter()
+    results = [None] * len(deals)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker,
+                             initargs=(template,)) as pool:
+        futures = {pool.submit(_prepare_batch_deal, deal, timings.enabled()): i
+                   for i, deal in enumerate(deals)}
+        for future in as_completed(futures):
+            r = results[futures[future]] = future.result()
+            timings.attach(r.pop("spans", []))
+            if r["status"] == "ok":
+                print(f"✅ {r['name']}: {r['provisions']} provisions "
+                      f"({r['wall_seconds']:.2f}s)")
+            else:
+                print(f"❌ {r['name']}: {r['error']}")
+
+    failed = sum(1 for r in results if r["status"] != "ok")
+    summary = {
+        "manifest": str(manifest_path),
+        "started_at": started_at,
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "jobs": jobs,
+        "wall_seconds": round(time.perf_counter() - t0, 3),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "deals": results,
+    }
+    summary_path.write_text(json.dumps(summary, indent=2), encoding='utf-8')
+
+    print(f"\n{'='*60}")
+    print(f"Batch complete: {summary['succeeded']} prepared, {failed} failed "
+          f"in {summary['wall_seconds']:.2f}s")
+    print(f"Summary: {summary_path}")
+    print(f"{'='*60}\n")
+    return 1 if failed else 0
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Prepare a loan agreement for agentic review with Claude Code.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Auto-detect article pattern from a text file
+  python prepare_deal.py agreement.txt --posture borrower_friendly
+
+  # Split a Word doc by heading style
+  python prepare_deal.py agreement.docx --style "Heading 1" --posture balanced
+
+  # Split by custom pattern
+  python prepare_deal.py agreement.docx --pattern "ARTICLE" --posture lender_friendly
+
+  # Check review progress
+  python prepare_deal.py --status ./my_deal_review/
+
+  # Add client-specific notes
+  python prepare_deal.py agreement.txt --posture borrower_friendly \\
+      --notes "Client wants aggressive push on cure periods and cash management"
+
+  # Prepare many deals in parallel from a manifest
+  python prepare_deal.py --batch deals.json --jobs 8
+        """,
+    )
+
+    parser.add_argument('input_file', nargs='?', help='Path to agreement (.docx or .txt)')
+    parser.add_argument('--style', '-s', help='Heading style to split on (for .docx)')
+    parser.add_argument('--pattern', '-p', help='Regex pattern to split on')
+    parser.add_argument('--posture', default='borrower_friendly',
+                        choices=REVIEW_POSTURES,
+                        help='Review posture (default: borrower_friendly)')
+    parser.add_argument('--output-dir', '-o', help='Output directory (default: ./deal_review/)')
+    parser.add_argument('--notes', '-n', default='', help='Client-specific review notes')
+    parser.add_argument('--term-sheet', '-t', help='Path to term sheet or deal summary (.txt, .docx, .pdf)')
+    parser.add_argument('--skill', '-k', action='append', default=[],
+                        help='Path to a topical skill/reference file (.md). Repeatable: --skill file1.md --skill file2.md')
+    parser.add_argument('--status', nargs='?', const='./deal_review/',
+                        help='Show review progress for an existing deal directory')
+    parser.add_argument('--no-incremental', dest='incremental', action='store_false',
+                        help='Rewrite every provision folder even if the workspace '
+                             'already exists (default: only changed provisions)')
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help='Do not pre-populate provisions from the cross-deal review cache')
+    parser.add_argument('--cache-dir',
+                        help='Review cache location (default: $MARKUP_CACHE_DIR or '
+                             '~/.cache/markup/review_cache)')
+    parser.add_argument('--similar', type=int, default=3, metavar='K',
+                        help='Record the K most similar provisions from prior deals in each '
+                             'manifest (default: 3; 0 disables)')
+    parser.add_argument('--library-dir',
+                        help='Deals root holding the similarity index '
+                             '(default: parent of the output directory)')
+    parser.add_argument('--max-unit-words', type=int, default=DEFAULT_MAX_UNIT_WORDS,
+                        metavar='N',
+                        help='Split provisions longer than N words into balanced review units '
+                             'at Section boundaries (default: %(default)s, about '
+                             f'{int(DEFAULT_MAX_UNIT_WORDS * TOKENS_PER_WORD):,} tokens; 0 disables)')
+    parser.add_argument('--no-context', dest='context', action='store_false',
+                        help='Do not write per-provision context.md bundles')
+    parser.add_argument('--context-depth', type=int, default=DEFAULT_DEPTH, metavar='N',
+                        help='Levels of cross-referenced sections to quote in context.md '
+                             '(default: %(default)s)')
+    parser.add_argument('--no-db', dest='db', action='store_false',
+                        help=f'Do not create or sync the {DB_FILENAME} SQLite index')
+    parser.add_argument('--batch', metavar='MANIFEST',
+                        help='Prepare every deal listed in a JSON batch manifest')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Worker processes for --batch (default: CPU count)')
+    parser.add_argument('--batch-summary', metavar='PATH',
+                        help='Where to write the --batch JSON summary '
+                             '(default: <manifest>_summary.json)')
+    timings.add_arguments(parser, 'split')
+
+    args = parser.parse_args()
+
+    # Status check mode
+    if args.status:
+        status_dir = Path(args.status)
+        if not status_dir.exists():
+            print(f"Error: Directory not found: {status_dir}")
+            return 1
+        status = get_review_status(status_dir)
+        print(f"\n{'='*60}")
+        print(f"Deal Review Status: {status_dir}")
+        print(f"{'='*60}")
+        print(f"Total provisions:    {status['total']}")
+        print(f"Reviewed:            {status['reviewed']}")
+        print(f"Pending:             {status['pending']}")
+        print(f"\nProvision Details:")
+        print(f"{'-'*60}")
+        for p in status['provisions']:
+            icon = "✅" if p['status'] == 'reviewed' else "⏳"
+            print(f"  {icon} {p['folder']}: {p['status']}")
+        return 0
+
+    if args.batch:
+        timings.enable_from_args(args, 'prepare_deal', Path(args.batch).resolve().parent)
+        return run_batch(Path(args.batch), jobs=args.jobs,
+                         summary_path=Path(args.batch_summary) if args.batch_summary else None)
+
+    if not args.input_file:
+        parser.print_help()
+        return 1
+
+    timings.enable_from_args(args, 'prepare_deal', args.output_dir or './deal_review')
+    try:
+        prepare_workspace(args)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return 1
     return 0
 
 
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+provision_lsh.py — Near-duplicate provision search across the deal library.
+
+Keeps a MinHash signature for every reviewed provision in the deals/ tree
+and answers "which previously reviewed provisions look most like this one?"
+through locality-sensitive hashing, so prepare_deal.py can point reviewers
+at a prior revised.txt without diffing against every stored provision.
+
+The index lives in <deals root>/.provision_index/index.db (SQLite, WAL
+mode): one row per provision with its signature, and one row per LSH band
+keyed by (band, bucket hash). A query looks up its own 16 band buckets and
+reads only the signatures of the candidates found there, so its cost does
+not grow with the size of the library. Re-indexing a provision replaces its
+rows. assemble_deal.py adds a deal's reviewed provisions as it completes;
+this script can also rebuild the index from scratch.
+
+Usage:
+    python scripts/provision_lsh.py rebuild deals/
+    python scripts/provision_lsh.py query deals/ provisions/05_article_v/original.txt
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import struct
+import sys
+import zlib
+from pathlib import Path
+from typing import Optional
+
+
+NUM_PERM = 64                # MinHash signature length
+BANDS = 16                   # LSH bands (BANDS * ROWS == NUM_PERM)
+ROWS = NUM_PERM // BANDS     # ~50% Jaccard is where candidates start to collide
+SHINGLE_WORDS = 5
+MIN_SIMILARITY = 0.5
+INDEX_DIRNAME = ".provision_index"
+INDEX_FILENAME = "index.db"
+BUSY_TIMEOUT_SECONDS = 30
+_SIG_STRUCT = struct.Struct(f'<{NUM_PERM}I')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS provisions (
+    deal    TEXT NOT NULL,
+    folder  TEXT NOT NULL,
+    title   TEXT NOT NULL,
+    sig     BLOB NOT NULL,
+    PRIMARY KEY (deal, folder)
+);
+CREATE TABLE IF NOT EXISTS bands (
+    band    INTEGER NOT NULL,
+    bucket  INTEGER NOT NULL,
+    deal    TEXT NOT NULL,
+    folder  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bands_bucket ON bands (band, bucket);
+CREATE INDEX IF NOT EXISTS bands_provision ON bands (deal, folder);
+"""
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(20240601)   # fixed seed: signatures must be stable across runs
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_WORD_RE = re.compile(r'\w+')
+
+
+def shingles(text: str) -> set[int]:
+    """Hashed word shingles of a provision's lower-cased text."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + SHINGLE_WORDS]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def minhash(text: str) -> list[int]:
+    """MinHash signature of a provision's text."""
+    hs = shingles(text)
+    if not hs:
+        return [_MAX_HASH] * NUM_PERM
+    return [min((a * x + b) % _PRIME for x in hs) & _MAX_HASH for a, b in _PERMS]
+
+
+def similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def _band_keys(sig: list[int]):
+    """(band, bucket) for each LSH band; bucket is a stable signed 64-bit hash of its rows."""
+    for b in range(BANDS):
+        rows = struct.pack(f'<{ROWS}I', *sig[b * ROWS:(b + 1) * ROWS])
+        yield b, int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), 'little', signed=True)
+
+
+class ProvisionIndex:
+    """MinHash/LSH index over the reviewed provisions of a deals/ tree.
+
+    Nothing is written to the library until a provision is added.
+    """
+
+    def __init__(self, library_dir: Path):
+        self.library_dir = Path(library_dir)
+        self.path = self.library_dir / INDEX_DIRNAME / INDEX_FILENAME
+        self.conn = None
+        if self.path.exists():
+            self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            with self.conn:
+                for statement in SCHEMA.split(";"):
+                    if statement.strip():
+                        self.conn.execute(statement)
+        return self.conn
+
+    def __len__(self):
+        if self.conn is None:
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM provisions").fetchone()[0]
+
+    def _store(self, deal: str, folder: str, title: str, sig: list[int]) -> bool:
+        """Insert or replace one provision's rows (inside the caller's transaction)."""
+        blob = _SIG_STRUCT.pack(*sig)
+        row = self.conn.execute("SELECT title, sig FROM provisions WHERE deal = ? AND folder = ?",
+                                (deal, folder)).fetchone()
+        if row == (title, blob):
+            return False
+        self.conn.execute("INSERT OR REPLACE INTO provisions VALUES (?, ?, ?, ?)",
+                          (deal, folder, title, blob))
+        self.conn.execute("DELETE FROM bands WHERE deal = ? AND folder = ?", (deal, folder))
+        self.conn.executemany("INSERT INTO bands VALUES (?, ?, ?, ?)",
+                              [(band, bucket, deal, folder) for band, bucket in _band_keys(sig)])
+        return True
+
+    def add(self, deal: str, folder: str, text: str, title: str = "") -> bool:
+        """Index (or re-index) one reviewed provision.
+
+        Returns False if the provision is already indexed with the same text.
+        """
+        with self._connect():
+            return self._store(deal, folder, title, minhash(text))
+
+    @staticmethod
+    def _reviewed(deal_dir: Path, folders: Optional[list[str]] = None) -> list[tuple]:
+        """(deal, folder, title, signature) for a deal's reviewed provisions."""
+        reviewed = []
+        provisions_dir = deal_dir / "provisions"
+        if not provisions_dir.exists():
+            return reviewed
+        for folder in sorted(provisions_dir.iterdir()):
+            if folders is not None and folder.name not in folders:
+                continue
+            manifest_path = folder / "manifest.json"
+            original_path = folder / "original.txt"
+            if not (manifest_path.exists() and original_path.exists()
+                    and (folder / "revised.txt").exists()):
+                continue
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            if manifest.get("status") != "reviewed":
+                continue
+            reviewed.append((deal_dir.name, folder.name, manifest.get("title", ""),
+                             minhash(original_path.read_text(encoding='utf-8'))))
+        return reviewed
+
+    def add_deal(self, deal_dir: Path, folders: Optional[list[str]] = None) -> int:
+        """Index a deal's reviewed provisions (only `folders`, if given). Returns the number added."""
+        reviewed = self._reviewed(Path(deal_dir), folders)
+        if not reviewed:
+            return 0
+        with self._connect():
+            return sum(self._store(*provision) for provision in reviewed)
+
+    def query(self, text: str, k: int = 3, exclude_deal: Optional[str] = None,
+              min_similarity: float = MIN_SIMILARITY) -> list[dict]:
+        """Top-k indexed provisions most similar to text (best first)."""
+        if self.conn is None:
+            return []
+        sig = minhash(text)
+        candidates = set()
+        for band, bucket in _band_keys(sig):
+            candidates.update(self.conn.execute(
+                "SELECT deal, folder FROM bands WHERE band = ? AND bucket = ?", (band, bucket)))
+        scored = []
+        for deal, folder in candidates:
+            if deal == exclude_deal:
+                continue
+            title, blob = self.conn.execute(
+                "SELECT title, sig FROM provisions WHERE deal = ? AND folder = ?",
+                (deal, folder)).fetchone()
+            sim = similarity(sig, _SIG_STRUCT.unpack(blob))
+            if sim >= min_similarity:
+                scored.append((sim, deal, folder, title))
+        scored.sort(key=lambda x: (-x[0], x[1], x[2]))
+        return [
+            {"deal": deal, "folder": folder, "title": title, "similarity": round(sim, 3)}
+            for sim, deal, folder, title in scored[:k]
+        ]
+
+    def rebuild(self) -> int:
+        """Re-index every deal under the library directory from scratch.
+
+        The old rows are replaced in one transaction, so a failed rebuild
+        leaves the previous index in place.
+        """
+        reviewed = []
+        for deal_dir in sorted(self.library_dir.iterdir()):
+            if deal_dir.is_dir() and not deal_dir.name.startswith('.'):
+                reviewed.extend(self._reviewed(deal_dir))
+        with self._connect():
+            self.conn.execute("DELETE FROM provisions")
+            self.conn.execute("DELETE FROM bands")
+            for provision in reviewed:
+                self._store(*provision)
+        return len(reviewed)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Near-duplicate provision search across the deal library.",
+    )
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_rebuild = sub.add_parser('rebuild', help='Re-index all reviewed provisions')
+    p_rebuild.add_argument('library_dir', help='Deals root directory (e.g. deals/)')
+    p_query = sub.add_parser('query', help='Find provisions similar to a text file')
+    p_query.add_argument('library_dir', help='Deals root directory (e.g. deals/)')
+    p_query.add_argument('text_file', help='Provision text (e.g. original.txt)')
+    p_query.add_argument('-k', type=int, default=5, help='Matches to show (default: 5)')
+    args = parser.parse_args()
+
+    library = Path(args.library_dir)
+    if not library.is_dir():
+        print(f"Error: Directory not found: {library}")
+        return 1
+
+    index = ProvisionIndex(library)
+    if args.command == 'rebuild':
+        total = index.rebuild()
+        print(f"✅ Indexed {total} reviewed provisions → {index.path}")
+        return 0
+
+    text = Path(args.text_file).read_text(encoding='utf-8')
+    for m in index.query(text, k=args.k):
+        print(f"  {m['similarity']:.2f}  {m['deal']}/provisions/{m['folder']}  {m['title']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
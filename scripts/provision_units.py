@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+provision_units.py — Split oversized provisions into balanced review units.
+
+prepare_deal.py splits an agreement at one heading level (usually articles),
+so a 25,000-word Definitions or Covenants article becomes one provision and
+one /review-all agent grinds on it while the others finish early. This
+module reads the Section (1.1 / Section 5.01) and subsection (1.1(a) / 1.1.1 /
+(a)) numbering inside each provision and regroups any provision over the word
+budget into consecutive units of roughly equal size, cutting only at section
+boundaries (or subsection boundaries inside a section that is itself over
+budget).
+
+Each unit keeps its article's section number with a part suffix ("05.02"),
+so provision folders still sort in agreement order and assemble_deal.py and
+apply_redlines.py stitch them back in sequence (blank_lines_before keeps the
+spacing at the cut, so the article reassembles exactly). The unit's place in the tree
+is recorded in its manifest:
+
+    "parent":   {"section_number": "05", "title": "ARTICLE V COVENANTS"}
+    "part": 2, "parts": 3, "blank_lines_before": 1
+    "sections": [{"number": "5.4", "title": "...", "level": 2, "words": 812}, ...]
+
+Usage:
+    from provision_units import balance_provisions
+    provisions = balance_provisions(provisions, max_words=4000)
+"""
+
+import re
+
+DEFAULT_MAX_UNIT_WORDS = 4000
+TOKENS_PER_WORD = 1.33          # rough English-legal-text ratio, for token budgets
+
+# Article: "ARTICLE V" / "Article 5" / "5.\tCOVENANTS" (only if 5.x sections follow)
+ARTICLE_RE = re.compile(
+    r'^\s*(?:article\s+(?P<named>[ivxlcdm]+|\d+)\b|(?P<number>\d+)\.(?=\s))', re.IGNORECASE)
+# Section: "Section 5.01." / "5.1." / "5.1"
+SECTION_RE = re.compile(
+    r'^\s*(?:section\s+)?(?P<number>\d+\.\d+)(?:\.(?!\d))?(?=\s|$)', re.IGNORECASE)
+# Subsection: "5.1.2" / "5.1(a)" / "(a)"
+SUBSECTION_RE = re.compile(
+    r'^\s*(?:(?:section\s+)?(?P<number>\d+\.\d+(?:\.\d+|\s*\([a-z0-9]{1,4}\)))'
+    r'|(?P<letter>\([a-z]{1,4}\)))(?=\s|\.|$)', re.IGNORECASE)
+LEADING_BLANK_LINES_RE = re.compile(r'^(?:[ \t]*\n)+')
+TRAILING_BLANK_LINES_RE = re.compile(r'(?:\n[ \t]*)+$')
+
+
+def _words(lines: list[str]) -> int:
+    return sum(len(line.split()) for line in lines)
+
+
+def _heading(line: str, match) -> str:
+    """Caption of a numbered heading ("Section 4.01. Representations. ..." → "Representations")."""
+    rest = line[match.end():].strip(' \t.')
+    caption = re.match(r'([^.]{1,80}?)\.(?:\s|$)', rest)
+    return re.sub(r'\s+', ' ', caption.group(1) if caption else rest[:80]).strip()
+
+
+def _blocks(lines: list[str], regex, level: int) -> list[dict]:
+    """Cut lines at each heading matched by regex.
+
+    Lines before the first heading form a lead-in block (number None).
+    """
+    blocks = []
+    current = {"number": None, "title": "", "level": level, "lines": []}
+    for line in lines:
+        m = regex.match(line)
+        if m:
+            if current["lines"] and (current["number"] is not None or blocks
+                                     or any(l.strip() for l in current["lines"])):
+                blocks.append(current)
+                current = {"number": None, "title": "", "level": level, "lines": []}
+            current.update(number=re.sub(r'\s+', '', m.group(m.lastgroup)),
+                           title=_heading(line, m))
+        current["lines"].append(line)
+    if current["lines"]:
+        blocks.append(current)
+    for block in blocks:
+        block["words"] = _words(block["lines"])
+    return blocks
+
+
+def _articles(lines: list[str]) -> list[dict]:
+    """Article blocks; a bare "N." line only opens an article if N.x sections follow."""
+    articles = []
+    for block in _blocks(lines, ARTICLE_RE, 1):
+        number = block["number"]
+        if articles and number and number.isdigit() and not any(
+                (m := SECTION_RE.match(line)) and m.group('number').startswith(number + '.')
+                for line in block["lines"]):
+            articles[-1]["lines"] += block["lines"]
+            articles[-1]["words"] += block["words"]
+        else:
+            articles.append(block)
+    return articles
+
+
+def _node(block: dict) -> dict:
+    return {"number": block["number"], "title": block["title"],
+            "level": block["level"], "words": block["words"]}
+
+
+def _merge_lead(leaves: list[dict]) -> None:
+    """Attach an unnumbered lead-in (heading, recitals) to the leaf after it."""
+    if len(leaves) > 1 and leaves[0]["number"] is None:
+        lead = leaves.pop(0)
+        leaves[0] = {**leaves[0], "lines": lead["lines"] + leaves[0]["lines"],
+                     "words": lead["words"] + leaves[0]["words"]}
+
+
+def _leaves(lines: list[str], max_words: int) -> list[dict]:
+    """The provision's indivisible pieces, in order.
+
+    Each Section is one piece, unless it is over budget on its own, in which
+    case each of its subsections is. Every piece lists the tree nodes
+    (article, section, subsection) that start in it.
+    """
+    leaves = []
+    for article in _articles(lines):
+        pieces = []
+        for section in _blocks(article["lines"], SECTION_RE, 2):
+            subs = _blocks(section["lines"], SUBSECTION_RE, 3) if section["words"] > max_words else []
+            if len(subs) < 2:
+                pieces.append(section)
+                continue
+            # The section heading and its lead-in travel with the first subsection
+            _merge_lead(subs)
+            for sub in subs[1:]:
+                if sub["number"].startswith('(') and section["number"]:
+                    sub["number"] = section["number"] + sub["number"]
+            section_node = _node({**section, "words": section["words"]})
+            subs[0]["nodes"] = [section_node] if section["number"] else []
+            if subs[0]["number"] != section["number"] and subs[0]["number"]:
+                subs[0]["nodes"].append(_node(subs[0]))
+            pieces.extend(subs)
+        _merge_lead(pieces)
+        for piece in pieces:
+            piece.setdefault("nodes", [_node(piece)] if piece["number"] else [])
+        if article["number"]:
+            pieces[0]["nodes"].insert(0, _node(article))
+        leaves.extend(pieces)
+    return leaves
+
+
+def _greedy_starts(sizes: list[int], capacity: int) -> list[int]:
+    """Start indices of the fewest consecutive groups of at most capacity each."""
+    starts, total = [0], 0
+    for i, size in enumerate(sizes):
+        if total and total + size > capacity:
+            starts.append(i)
+            total = 0
+        total += size
+    return starts
+
+
+def partition(sizes: list[int], parts: int) -> list[int]:
+    """Start indices of at most `parts` consecutive groups minimizing the largest group.
+
+    Binary search on the group capacity with a greedy fill.
+    """
+    lo, hi = max(sizes), sum(sizes)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if len(_greedy_starts(sizes, mid)) <= parts:
+            hi = mid
+        else:
+            lo = mid + 1
+    return _greedy_starts(sizes, lo)
+
+
+def _span(nodes: list[dict]) -> str:
+    """"Sections 5.1-5.4" / "Section 5.1(c)" / "Article VI" for a unit's label."""
+    numbered = [n["number"] for n in nodes if n["level"] > 1]
+    if not numbered:
+        numbered = [n["number"] for n in nodes]
+        return f"Article {numbered[0]}" if len(numbered) == 1 else \
+            f"Articles {numbered[0]}-{numbered[-1]}" if numbered else ""
+    return f"Section {numbered[0]}" if len(numbered) == 1 else \
+        f"Sections {numbered[0]}-{numbered[-1]}"
+
+
+def split_provision(provision: dict, max_words: int) -> list[dict]:
+    """Review units for one provision (the provision itself if it fits the budget)."""
+    lines = provision['text'].split('\n')
+    if _words(lines) <= max_words:
+        return [provision]
+    leaves = _leaves(lines, max_words)
+    if len(leaves) < 2:
+        return [provision]
+
+    # As few units as the budget allows (a piece larger than the budget
+    # becomes a unit of its own), then balanced across that many units
+    sizes = [leaf["words"] for leaf in leaves]
+    parts = len(_greedy_starts(sizes, max(max_words, max(sizes))))
+    starts = partition(sizes, parts)
+    bounds = list(zip(starts, starts[1:] + [len(leaves)]))
+    parent = {"section_number": provision['section_number'], "title": provision['title']}
+
+    units = []
+    line_offset = provision.get('start_line', 0)
+    gap = 0
+    for part, (a, b) in enumerate(bounds, 1):
+        group = leaves[a:b]
+        nodes = [node for leaf in group for node in leaf["nodes"]]
+        span = _span(nodes)
+        label = f"Part {part} of {len(bounds)}" + (f", {span}" if span else "")
+        unit_lines = [line for leaf in group for line in leaf["lines"]]
+        # Only whole blank lines come off the end; they become the next unit's gap
+        text = '\n'.join(unit_lines)
+        trailing = TRAILING_BLANK_LINES_RE.search(text)
+        units.append({
+            'title': f"{provision['title']} ({label})",
+            'text': LEADING_BLANK_LINES_RE.sub('', text[:trailing.start()] if trailing else text),
+            'start_line': line_offset,
+            'section_number': f"{provision['section_number']}.{part:02d}",
+            'parent': parent,
+            'part': part,
+            'parts': len(bounds),
+            'blank_lines_before': gap,
+            'sections': nodes,
+        })
+        line_offset += len(unit_lines)
+        gap = trailing.group().count('\n') if trailing else 0
+    return units
+
+
+def balance_provisions(provisions: list[dict], max_words: int) -> list[dict]:
+    """Split every provision over max_words into balanced units (0 disables)."""
+    if not max_words:
+        return provisions
+    units = []
+    for provision in provisions:
+        units.extend(split_provision(provision, max_words))
+    return units
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+reconcile.py — Mechanical reconciliation checks for a reviewed deal.
+
+Runs the deterministic parts of /reconcile in one pass over the provision
+folders (revised.txt where a provision has one, else original.txt):
+
+    - dangling Section / Article references, and those a revision broke
+    - circular reference chains
+    - defined terms still used after their definition was removed, and new
+      capitalized terms a revision introduced without defining
+    - definitions renamed in revision, with remaining uses of the old name
+    - cure and notice periods shorter than the review_config.json preferences
+
+Writes reconciliation_report.json and reconciliation_report.md to the deal
+root. The agent running /reconcile adds the judgment calls (conflicting
+revisions, recommended resolutions) to the markdown report.
+
+Usage:
+    python scripts/reconcile.py ./deal_review/
+"""
+
+import argparse
+import difflib
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from defined_terms import TermAutomaton, find_definitions
+from xref_graph import build_xref_graph
+
+
+REPORT_JSON = "reconciliation_report.json"
+REPORT_MD = "reconciliation_report.md"
+
+RENAME_SIMILARITY = 0.6
+CALENDAR_DAYS_PER_BUSINESS_DAY = 7 / 5   # minimums are in calendar days
+
+PERIOD_RE = re.compile(
+    r'(?:\b[a-z]+(?:-[a-z]+)?\s+)?\((?P<paren>\d+)\)\s+(?P<unit>(?i:business\s+days?|days?))\b'
+    r'|(?<![\d\-])(?P<digits>\d+)\s+(?P<unit2>(?i:business\s+days?|days?))\b'
+)
+NOTICE_AFTER_RE = re.compile(r"'?\s+(?:prior\s+)?(?:written\s+)?notice", re.IGNORECASE)
+CURE_CONTEXT_RE = re.compile(r'\b(?:cure|cured|grace|remed|continues? for|fails? to|failure)', re.IGNORECASE)
+SENTENCE_BREAK_RE = re.compile(r'(?<=[.;])\s+(?=[A-Z(])')
+
+# Capitalized multi-word phrases that may be defined terms
+TERM_CANDIDATE_RE = re.compile(
+    r'\b[A-Z][a-z]+(?:\s+(?:of|and|to|for)?\s*[A-Z][a-z]+){1,4}\b')
+NON_TERM_WORDS = {"Section", "Article", "Exhibit", "Schedule", "Annex", "The",
+                  "This", "Such", "Each", "Any", "All", "If", "In", "Upon"}
+
+
+def load_deal_texts(deal_dir: Path) -> list[dict]:
+    """Provision texts in agreement order: {folder, original, revised, reviewed}."""
+    provisions = []
+    for folder in sorted((deal_dir / "provisions").iterdir()):
+        original_path = folder / "original.txt"
+        if not original_path.exists():
+            continue
+        original = original_path.read_text(encoding='utf-8')
+        revised_path = folder / "revised.txt"
+        revised = revised_path.read_text(encoding='utf-8') if revised_path.exists() else None
+        provisions.append({
+            "folder": folder.name,
+            "original": original,
+            "revised": revised if revised is not None else original,
+            "reviewed": revised is not None,
+        })
+    return provisions
+
+
+def check_references(provisions: list[dict]) -> tuple[list[dict], list[list[str]]]:
+    """Dangling references in the revised agreement, and circular chains."""
+    original = build_xref_graph([(p["folder"], p["original"]) for p in provisions])
+    revised = build_xref_graph([(p["folder"], p["revised"]) for p in provisions])
+    dangling_before = {(d["folder"], d["ref"]) for d in original["dangling"]}
+    dangling = [{**d, "broken_by_revision": (d["folder"], d["ref"]) not in dangling_before}
+                for d in revised["dangling"]]
+    return dangling, revised["cycles"]
+
+
+def _definition_line(text: str, offset: int) -> str:
+    start = text.rfind('\n', 0, offset) + 1
+    end = text.find('\n', offset)
+    return text[start:end if end != -1 else len(text)]
+
+
+def check_terms(provisions: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Undefined terms and renamed definitions in the revised agreement."""
+    orig_defs = {p["folder"]: find_definitions(p["original"]) for p in provisions}
+    rev_defs = {p["folder"]: find_definitions(p["revised"]) for p in provisions}
+    defined_now = {t for defs in rev_defs.values() for t, _ in defs}
+    defined_before = {t for defs in orig_defs.values() for t, _ in defs}
+
+    # Uses of every term ever defined, across the revised agreement
+    automaton = TermAutomaton(sorted(defined_now | defined_before))
+    uses = {}
+    for p in provisions:
+        defined_at = {off for _, off in rev_defs[p["folder"]]}
+        for offset, term in automaton.find(p["revised"]):
+            if offset not in defined_at:
+                uses.setdefault(term, []).append(p["folder"])
+
+    # Definitions renamed within a provision: removed term whose definition
+    # line resembles the line that defines a newly added term
+    renamed = []
+    renamed_from = set()
+    for p in provisions:
+        folder = p["folder"]
+        before = {t: off for t, off in orig_defs[folder]}
+        after = {t: off for t, off in rev_defs[folder]}
+        added = [t for t in after if t not in defined_before]
+        for old in (t for t in before if t not in defined_now):
+            old_line = _definition_line(p["original"], before[old]).replace(old, '')
+            best, best_ratio = None, RENAME_SIMILARITY
+            for new in added:
+                new_line = _definition_line(p["revised"], after[new]).replace(new, '')
+                ratio = difflib.SequenceMatcher(None, old_line, new_line).ratio()
+                if ratio >= best_ratio:
+                    best, best_ratio = new, ratio
+            if best:
+                renamed.append({
+                    "folder": folder, "old": old, "new": best,
+                    "similarity": round(best_ratio, 2),
+                    "stale_uses": sorted(set(uses.get(old, []))),
+                })
+                renamed_from.add(old)
+
+    undefined = []
+    for term in sorted(defined_before - defined_now - renamed_from):
+        if uses.get(term):
+            undefined.append({"term": term, "reason": "definition removed",
+                              "used_in": sorted(set(uses[term]))})
+
+    # Capitalized phrases a revision introduced without defining them
+    known = defined_now | defined_before
+    seen_before = set()
+    for p in provisions:
+        seen_before.update(TERM_CANDIDATE_RE.findall(p["original"]))
+    for p in provisions:
+        if not p["reviewed"]:
+            continue
+        for phrase in sorted(set(TERM_CANDIDATE_RE.findall(p["revised"])) - seen_before):
+            if phrase.split()[0] in NON_TERM_WORDS:
+                continue
+            if phrase in known or (phrase.endswith('s') and phrase[:-1] in known):
+                continue
+            undefined.append({"term": phrase, "reason": "introduced by revision",
+                              "used_in": [p["folder"]]})
+    return undefined, renamed
+
+
+def extract_periods(folder: str, text: str) -> list[dict]:
+    """Day-count periods in a provision, classified as cure, notice or other."""
+    periods = []
+    for paragraph, line in enumerate(text.split('\n')):
+        breaks = [0] + [m.end() for m in SENTENCE_BREAK_RE.finditer(line)] + [len(line)]
+        for m in PERIOD_RE.finditer(line):
+            if m.group('paren'):
+                days, unit = int(m.group('paren')), m.group('unit')
+            else:
+                days, unit = int(m.group('digits')), m.group('unit2')
+            start = max(b for b in breaks if b <= m.start())
+            end = min(b for b in breaks if b >= m.end())
+            sentence = line[start:end].strip()
+            if NOTICE_AFTER_RE.match(line, m.end()):
+                kind = "notice"
+            elif CURE_CONTEXT_RE.search(sentence):
+                kind = "cure"
+            else:
+                kind = "other"
+            business = unit.lower().startswith('business')
+            periods.append({
+                "folder": folder, "paragraph": paragraph, "days": days,
+                "unit": "business days" if business else "days",
+                "calendar_days": round(days * CALENDAR_DAYS_PER_BUSINESS_DAY, 1) if business else days,
+                "kind": kind, "text": m.group(0).strip(), "sentence": sentence[:200],
+            })
+    return periods
+
+
+def period_minimums(preferences: dict) -> dict:
+    """Minimum days per period kind from review_config.json preferences."""
+    return {
+        "cure": preferences.get("cure_period_minimum_days"),
+        "notice": preferences.get("notice_period_minimum_days"),
+    }
+
+
+def check_periods(provisions: list[dict], minimums: dict) -> tuple[list[dict], list[dict]]:
+    """All cure/notice periods, and those below the configured minimums.
+
+    Business-day periods are compared in calendar days (5 business days = 7).
+    """
+    periods = []
+    for p in provisions:
+        periods.extend(extract_periods(p["folder"], p["revised"]))
+    findings = [
+        {**period, "minimum_days": minimums[period["kind"]]}
+        for period in periods
+        if minimums.get(period["kind"]) and period["calendar_days"] < minimums[period["kind"]]
+    ]
+    return [p for p in periods if p["kind"] != "other"], findings
+
+
+def reconcile(deal_dir: Path) -> dict:
+    """Run every mechanical check and return the report dict."""
+    provisions = load_deal_texts(deal_dir)
+    config_path = deal_dir / "review_config.json"
+    config = json.loads(config_path.read_text(encoding='utf-8')) if config_path.exists() else {}
+
+    dangling, cycles = check_references(provisions)
+    undefined, renamed = check_terms(provisions)
+    minimums = period_minimums(config.get("preferences", {}))
+    periods, period_findings = check_periods(provisions, minimums)
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "provisions": len(provisions),
+        "reviewed": sum(1 for p in provisions if p["reviewed"]),
+        "summary": {
+            "dangling_references": len(dangling),
+            "circular_chains": len(cycles),
+            "undefined_terms": len(undefined),
+            "renamed_definitions": len(renamed),
+            "period_findings": len(period_findings),
+        },
+        "dangling_references": dangling,
+        "circular_references": cycles,
+        "undefined_terms": undefined,
+        "renamed_definitions": renamed,
+        "period_minimums": minimums,
+        "periods": periods,
+        "period_findings": period_findings,
+    }
+
+
+def render_markdown(report: dict) -> str:
+    """Markdown version of the report, with a section left for the agent."""
+    s = report["summary"]
+    lines = [
+        "# Reconciliation Report",
+        "",
+        f"Generated: {report['generated_at'][:10]}  ",
+        f"Provisions: {report['provisions']} ({report['reviewed']} with revised.txt)",
+        "",
+        "## Summary of Findings",
+        "",
+        f"- Dangling cross-references: {s['dangling_references']}",
+        f"- Circular reference chains: {s['circular_chains']}",
+        f"- Undefined terms: {s['undefined_terms']}",
+        f"- Renamed definitions: {s['renamed_definitions']}",
+        f"- Cure / notice periods below preference: {s['period_findings']}",
+        "",
+        "## Cross-Reference Updates Needed",
+        "",
+    ]
+    for d in report["dangling_references"]:
+        note = " (broken by revision)" if d["broken_by_revision"] else ""
+        lines.append(f"- `{d['folder']}` ¶{d['paragraph']}: {d['ref']} does not exist{note}")
+    for chain in report["circular_references"]:
+        lines.append(f"- Circular: {' ↔ '.join(f'`{f}`' for f in chain)}")
+    if not report["dangling_references"] and not report["circular_references"]:
+        lines.append("None.")
+
+    lines += ["", "## Defined Terms", ""]
+    for r in report["renamed_definitions"]:
+        stale = f"; still used as \"{r['old']}\" in {', '.join(r['stale_uses'])}" if r["stale_uses"] else ""
+        lines.append(f"- `{r['folder']}`: \"{r['old']}\" renamed to \"{r['new']}\"{stale}")
+    for u in report["undefined_terms"]:
+        lines.append(f"- \"{u['term']}\" is used but not defined ({u['reason']}): "
+                     f"{', '.join(u['used_in'])}")
+    if not report["renamed_definitions"] and not report["undefined_terms"]:
+        lines.append("None.")
+
+    lines += ["", "## Cure and Notice Periods", ""]
+    if report["periods"]:
+        lines += ["| Provision | ¶ | Kind | Period | Minimum | |",
+                  "|-----------|---|------|--------|---------|---|"]
+        below = {(f["folder"], f["paragraph"], f["text"]) for f in report["period_findings"]}
+        minimums = report["period_minimums"]
+        for p in report["periods"]:
+            flag = "⚠️ below preference" if (p["folder"], p["paragraph"], p["text"]) in below else ""
+            period = p["text"]
+            if p["unit"] == "business days":
+                period += f" (≈{p['calendar_days']:g} calendar days)"
+            lines.append(f"| {p['folder']} | {p['paragraph']} | {p['kind']} | {period} "
+                         f"| {minimums.get(p['kind']) or ''} | {flag} |")
+    else:
+        lines.append("None found.")
+
+    lines += ["", "## Conflicting Revisions", "",
+              "_To be completed by the reviewer: revisions in one provision that "
+              "contradict another, and the recommended resolution for each finding above._",
+              ""]
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run mechanical reconciliation checks across a deal's provisions.",
+    )
+    parser.add_argument('deal_dir', help='Path to the deal review directory')
+    args = parser.parse_args()
+
+    deal_dir = Path(args.deal_dir)
+    if not (deal_dir / "provisions").is_dir():
+        print(f"Error: No provisions directory in {deal_dir}")
+        return 1
+
+    report = reconcile(deal_dir)
+    (deal_dir / REPORT_JSON).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    (deal_dir / REPORT_MD).write_text(render_markdown(report), encoding='utf-8')
+
+    s = report["summary"]
+    print(f"✅ Reconciled {report['provisions']} provisions "
+          f"({report['reviewed']} revised) → {deal_dir / REPORT_JSON}")
+    print(f"   {s['dangling_references']} dangling refs, {s['circular_chains']} circular, "
+          f"{s['undefined_terms']} undefined terms, {s['renamed_definitions']} renamed, "
+          f"{s['period_findings']} period findings")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
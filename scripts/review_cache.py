@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+review_cache.py — Persistent cross-deal cache of provision reviews for Markup.
+
+Deals written on the same lender form repeat many provisions verbatim. This
+cache stores a reviewed provision's outputs keyed by its normalized
+original.txt text plus the review posture and installed skill set, so the
+next deal with the same provision can start from the prior review instead
+of re-running it.
+
+Layout (default ~/.cache/markup/review_cache, or $MARKUP_CACHE_DIR):
+
+    entries/<key[:2]>/<key>/
+        revised.txt, analysis.md, changes_summary.md
+        entry.json      # cached manifest flags, source deal, timestamps
+
+Each entry's entry.json mtime is its last-used time; when the cache grows
+past its size limit the least recently used entries are evicted.
+
+Usage:
+    from review_cache import ReviewCache
+    cache = ReviewCache()
+    key = ReviewCache.key(original_text, "borrower_friendly", ["skill-a"])
+    hit = cache.get(key)
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    "MARKUP_CACHE_DIR", Path.home() / ".cache" / "markup" / "review_cache"))
+DEFAULT_MAX_MB = 512
+
+# Review outputs copied into / out of the cache
+CACHED_FILES = ["revised.txt", "analysis.md", "changes_summary.md"]
+# Manifest fields carried with a cached review
+CACHED_MANIFEST_FIELDS = ["cross_ref_flags", "open_issues"]
+
+
+def normalize_provision_text(text: str) -> str:
+    """Collapse whitespace so reflowed but identical provisions share a key."""
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _env_max_bytes() -> int:
+    """Size limit from $MARKUP_CACHE_MAX_MB, or the default if unset or invalid."""
+    value = os.environ.get("MARKUP_CACHE_MAX_MB")
+    if value:
+        try:
+            return int(value) * 1024 * 1024
+        except ValueError:
+            print(f"⚠️  Ignoring MARKUP_CACHE_MAX_MB={value!r} (not a whole number of MB); "
+                  f"using {DEFAULT_MAX_MB} MB")
+    return DEFAULT_MAX_MB * 1024 * 1024
+
+
+class ReviewCache:
+    """Content-addressed, size-bounded LRU store of provision reviews."""
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR
+        self.max_bytes = _env_max_bytes() if max_bytes is None else max_bytes
+        self.entries_dir = self.root / "entries"
+
+    @staticmethod
+    def key(original_text: str, posture: str, skills: list[str]) -> str:
+        """Cache key for a provision under a posture and skill set."""
+        h = hashlib.sha256()
+        h.update(normalize_provision_text(original_text).encode('utf-8'))
+        h.update(b'\0' + posture.encode('utf-8'))
+        h.update(b'\0' + '\n'.join(sorted(skills)).encode('utf-8'))
+        return h.hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.entries_dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return {'files': {name: text}, 'manifest': {...}, ...} or None.
+
+        A hit refreshes the entry's last-used time.
+        """
+        entry_dir = self._entry_dir(key)
+        meta_path = entry_dir / "entry.json"
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            files = {
+                name: (entry_dir / name).read_text(encoding='utf-8')
+                for name in CACHED_FILES if (entry_dir / name).exists()
+            }
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None
+        if "revised.txt" not in files:
+            return None
+        meta["files"] = files
+        return meta
+
+    def put(self, key: str, files: dict, manifest: dict, source: str = "") -> bool:
+        """Store a reviewed provision. Returns False if the key already holds this review.
+
+        An entry whose files or flags differ (the provision was re-reviewed)
+        is replaced. Call evict() after a batch of puts to enforce the size limit.
+        """
+        entry_dir = self._entry_dir(key)
+        flags = {f: manifest.get(f, []) for f in CACHED_MANIFEST_FIELDS}
+        existing = self.get(key)
+        if existing is not None and existing.get("manifest") == flags and all(
+                existing["files"].get(name) == files.get(name) for name in CACHED_FILES):
+            return False
+
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{key[:8]}_", dir=entry_dir.parent))
+        stale = None
+        try:
+            for name in CACHED_FILES:
+                if files.get(name) is not None:
+                    (tmp / name).write_text(files[name], encoding='utf-8')
+            meta = {
+                "key": key,
+                "source": source,
+                "stored_at": datetime.now(timezone.utc).isoformat(),
+                "manifest": flags,
+            }
+            (tmp / "entry.json").write_text(json.dumps(meta, indent=2), encoding='utf-8')
+            # Set a stale entry aside first: rename cannot replace a directory
+            if entry_dir.exists():
+                stale = Path(tempfile.mkdtemp(prefix=f".{key[:8]}_old_", dir=entry_dir.parent))
+                os.rename(entry_dir, stale / key)
+            # Atomic publish; another process may have stored the same key
+            os.rename(tmp, entry_dir)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+        finally:
+            if stale is not None:
+                shutil.rmtree(stale, ignore_errors=True)
+        return True
+
+    def evict(self) -> int:
+        """Drop least recently used entries until under max_bytes. Returns count."""
+        if not self.entries_dir.exists():
+            return 0
+        entries = []
+        total = 0
+        for entry_dir in self.entries_dir.glob("*/*"):
+            meta_path = entry_dir / "entry.json"
+            try:
+                used = meta_path.stat().st_mtime
+                size = sum(f.stat().st_size for f in entry_dir.iterdir())
+            except OSError:
+                continue
+            entries.append((used, size, entry_dir))
+            total += size
+
+        removed = 0
+        for used, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
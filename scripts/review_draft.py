@@ -1,217 +1,188 @@
 #!/usr/bin/env python3
 """
-Apply corrections as tracked changes to a single draft loan document.
+Apply corrections as tracked changes to draft loan documents.
 
-Takes a .docx file and a JSON corrections file, applies character-level tracked
-changes for each deviation, then repacks the document.
+Takes a .docx file and a JSON corrections file, applies word-level tracked
+changes for each deviation (--diff refine or char for finer diffs, see
+diff_engine.py), then repacks the document. With --drafts-dir, every
+<stem>_corrections.json in the directory is applied to <stem>.docx in parallel.
 
 Usage:
     PYTHONPATH=~/.claude/skills/docx python scripts/review_draft.py draft.docx corrections.json
+    PYTHONPATH=~/.claude/skills/docx python scripts/review_draft.py --drafts-dir drafts/
+    PYTHONPATH=~/.claude/skills/docx python scripts/review_draft.py draft.docx corrections.json --profile
 
 Prerequisites:
     - The docx skill must be installed at ~/.claude/skills/docx
     - The corrections JSON must contain an array of correction objects
 """
-import argparse, os, sys, re, difflib, json, glob, shutil, tempfile
+import argparse, os, sys, difflib, json, glob, shutil, tempfile, zipfile
 
+from docx_package import DocxPackage
+from diff_engine import DEFAULT_DIFF_LEVEL, DIFF_LEVELS, diff_ops
+from docx_stream import parse_paragraphs
+from markup_core import fix_utf16_files, load_skill, nm, timings, tracked_runs_xml
 
-# ---- Locate and import the Document library ----
 
-def find_skill_root():
-    """Find the docx skill root directory."""
-    candidates = [
-        os.path.expanduser('~/.claude/skills/docx'),
-        '/mnt/skills/public/docx',
-        '/mnt/skills/docx',
-    ]
-    for c in candidates:
-        if os.path.isfile(os.path.join(c, 'scripts', 'document.py')):
-            return c
-    return None
-
-SKILL_ROOT = find_skill_root()
-if not SKILL_ROOT:
-    sys.exit("ERROR: Could not find the docx skill. Expected at ~/.claude/skills/docx")
-sys.path.insert(0, SKILL_ROOT)
-
-from scripts.document import Document, DocxXMLEditor
-from ooxml.scripts.pack import pack_document
-
-
-# ---- Fix UTF-16 encoded XML files ----
-
-def fix_utf16_files(directory):
-    """Convert any UTF-16 encoded XML files to UTF-8."""
-    count = 0
-    for xml_path in glob.glob(os.path.join(directory, '**', '*.xml'), recursive=True):
-        with open(xml_path, 'rb') as f:
-            header = f.read(4)
-        if header[:2] in (b'\xff\xfe', b'\xfe\xff'):
-            with open(xml_path, 'rb') as f:
-                content = f.read()
-            text = content.decode('utf-16')
-            text = text.replace('encoding="utf-16"', 'encoding="UTF-8"')
-            text = text.replace("encoding='utf-16'", "encoding='UTF-8'")
-            with open(xml_path, 'w', encoding='utf-8') as f:
-                f.write(text)
-            count += 1
-    if count:
-        print(f"  Converted {count} UTF-16 XML file(s) to UTF-8")
-
-
-# ---- XML text helpers ----
-
-def extract_text(para):
-    """Extract text from a minidom w:p element, including tabs."""
-    parts = []
-    for r in para.getElementsByTagName('w:r'):
-        for ch in r.childNodes:
-            if ch.nodeType != ch.ELEMENT_NODE:
-                continue
-            if ch.tagName == 'w:t':
-                parts.append(''.join(
-                    c.data for c in ch.childNodes if c.nodeType == c.TEXT_NODE
-                ))
-            elif ch.tagName == 'w:tab':
-                parts.append('\t')
-    return ''.join(parts)
-
-
-def get_rpr(para):
-    """Get rPr XML string from the first run in a paragraph."""
-    for r in para.getElementsByTagName('w:r'):
-        for ch in r.childNodes:
-            if ch.nodeType == ch.ELEMENT_NODE and ch.tagName == 'w:rPr':
-                s = ch.toxml()
-                return re.sub(r' xmlns:\w+="[^"]*"', '', s)
-        return ''
-    return ''
-
-
-def get_ppr(para):
-    """Get pPr XML string from a paragraph."""
-    for ch in para.childNodes:
-        if ch.nodeType == ch.ELEMENT_NODE and ch.tagName == 'w:pPr':
-            s = ch.toxml()
-            return re.sub(r' xmlns:\w+="[^"]*"', '', s)
-    return ''
-
-
-def nm(t):
-    """Normalize whitespace for matching."""
-    return re.sub(r'\s+', ' ', t.strip())
-
-
-def esc(text):
-    """Escape text for XML content."""
-    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-
-
-# ---- Diff and tracked-change XML construction ----
-
-def text_to_runs(rpr, text, is_del=False):
-    """Convert text to XML runs, splitting at tab characters."""
-    tag = 'w:delText' if is_del else 'w:t'
-    segs = text.split('\t')
-    runs = []
-    for i, seg in enumerate(segs):
-        if seg:
-            runs.append(
-                f'<w:r>{rpr}<{tag} xml:space="preserve">{esc(seg)}</{tag}></w:r>'
-            )
-        if i < len(segs) - 1:
-            runs.append(f'<w:r>{rpr}<w:tab/></w:r>')
-    return ''.join(runs)
-
-
-def char_diff_ops(old, new):
-    """Character-level diff preserving exact original text."""
-    ops = []
-    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old, new).get_opcodes():
-        if tag == 'equal':
-            ops.append(('eq', old[i1:i2]))
-        elif tag == 'delete':
-            ops.append(('del', old[i1:i2]))
-        elif tag == 'insert':
-            ops.append(('ins', new[j1:j2]))
-        elif tag == 'replace':
-            ops.append(('del', old[i1:i2]))
-            ops.append(('ins', new[j1:j2]))
-    return ops
-
-
-def merge_ops(ops):
-    """Merge consecutive ops of the same type."""
-    if not ops:
-        return ops
-    merged = [ops[0]]
-    for op, text in ops[1:]:
-        if merged[-1][0] == op:
-            merged[-1] = (op, merged[-1][1] + text)
-        else:
-            merged.append((op, text))
-    return merged
+# ---- Find and modify paragraphs ----
 
+SHINGLE_SIZE = 4      # character n-gram length for the paragraph index
+MIN_SUBSTR_LEN = 10   # paragraphs this short never win a substring match
+FUZZY_THRESHOLD = 0.5
 
-def tracked_runs_xml(rpr, ops):
-    """Build tracked-change XML runs from diff operations."""
-    parts = []
-    for op, text in ops:
-        if op == 'eq':
-            parts.append(text_to_runs(rpr, text, is_del=False))
-        elif op == 'del':
-            inner = text_to_runs(rpr, text, is_del=True)
-            parts.append(f'<w:del>{inner}</w:del>')
-        elif op == 'ins':
-            inner = text_to_runs(rpr, text, is_del=False)
-            parts.append(f'<w:ins>{inner}</w:ins>')
-    return ''.join(parts)
 
+class ParagraphIndex:
+    """Lookup structure over a document's normalized paragraph texts.
+
+    Built once per document and updated in place as corrections replace
+    paragraphs. Holds:
+      - an exact-match hash map (normalized text -> paragraph indices)
+      - a character-shingle inverted index (shingle -> paragraph indices)
+        used for substring and fuzzy candidates
+      - a prefix-shingle map for "paragraph contained in target" lookups
+    """
+
+    def __init__(self, norms):
+        self.norms = []
+        self._exact = {}
+        self._shingles = {}
+        self._prefix = {}
+        for n in norms:
+            self.norms.append(n)
+            self._add(len(self.norms) - 1, n)
+
+    def __len__(self):
+        return len(self.norms)
+
+    def __getitem__(self, i):
+        return self.norms[i]
+
+    @staticmethod
+    def _grams(text):
+        return {text[k:k + SHINGLE_SIZE]
+                for k in range(len(text) - SHINGLE_SIZE + 1)}
+
+    def _add(self, i, n):
+        self._exact.setdefault(n, set()).add(i)
+        for g in self._grams(n):
+            self._shingles.setdefault(g, set()).add(i)
+        if len(n) > MIN_SUBSTR_LEN:
+            self._prefix.setdefault(n[:SHINGLE_SIZE], set()).add(i)
+
+    def _remove(self, i, n):
+        self._exact[n].discard(i)
+        for g in self._grams(n):
+            self._shingles[g].discard(i)
+        if len(n) > MIN_SUBSTR_LEN:
+            self._prefix[n[:SHINGLE_SIZE]].discard(i)
+
+    def update(self, i, new_norm):
+        """Replace the normalized text of paragraph i."""
+        old = self.norms[i]
+        if old == new_norm:
+            return
+        self._remove(i, old)
+        self.norms[i] = new_norm
+        self._add(i, new_norm)
+
+    def find_exact(self, target_norm):
+        hits = self._exact.get(target_norm)
+        return min(hits) if hits else None
+
+    def find_substring(self, target_norm):
+        """Lowest index whose paragraph contains, or is contained in, target."""
+        best = None
+        norms = self.norms
+        target_grams = self._grams(target_norm)
+
+        # Target contained in paragraph: every candidate holds all of the
+        # target's shingles, so the rarest shingle's postings suffice.
+        if target_grams:
+            postings = min((self._shingles.get(g, ()) for g in target_grams), key=len)
+            candidates = postings
+        else:
+            candidates = range(len(norms))
+        for i in candidates:
+            if (best is None or i < best) and len(norms[i]) > MIN_SUBSTR_LEN \
+                    and target_norm in norms[i]:
+                best = i
+
+        # Paragraph contained in target: the paragraph's first shingle must
+        # occur somewhere in the target.
+        for g in target_grams:
+            for i in self._prefix.get(g, ()):
+                if (best is None or i < best) and len(norms[i]) <= len(target_norm) \
+                        and norms[i] in target_norm:
+                    best = i
+        return best
+
+    def find_fuzzy(self, target_norm):
+        """Best SequenceMatcher ratio above FUZZY_THRESHOLD (first index on ties).
+
+        Only paragraphs that share a shingle with the target and whose length
+        allows a ratio above the threshold are scored, those sharing the most
+        shingles first; quick_ratio() prunes before any full ratio().
+        """
+        la = len(target_norm)
+        norms = self.norms
+        # 2*min(la, lb)/(la + lb) bounds the ratio: above 0.5 needs la/3 < lb < 3*la
+        lo, hi = la / 3, 3 * la
+        target_grams = self._grams(target_norm)
+        shared = {}
+        if target_grams:
+            for g in target_grams:
+                for i in self._shingles.get(g, ()):
+                    if lo < len(norms[i]) < hi:
+                        shared[i] = shared.get(i, 0) + 1
+        else:
+            shared = {i: 0 for i, n in enumerate(norms) if lo < len(n) < hi}
+
+        best_idx, best_ratio = None, FUZZY_THRESHOLD
+        for i in sorted(shared, key=lambda i: (-shared[i], i)):
+            lb = len(norms[i])
+            bound = 2.0 * min(la, lb) / (la + lb)
+            if bound < best_ratio or (bound == best_ratio and
+                                      (best_idx is None or i > best_idx)):
+                continue
+            sm = difflib.SequenceMatcher(None, target_norm, norms[i])
+            bound = sm.quick_ratio()
+            if bound < best_ratio or (bound == best_ratio and
+                                      (best_idx is None or i > best_idx)):
+                continue
+            r = sm.ratio()
+            if r > best_ratio or (r == best_ratio and best_idx is not None
+                                  and i < best_idx):
+                best_idx, best_ratio = i, r
+        return best_idx
 
-# ---- Find and modify paragraphs ----
 
-def find_matching_para(all_paras, all_norms, target_text):
+def find_matching_para(para_index, target_text):
     """Find the paragraph index that best matches the target text.
 
-    Uses normalized substring matching, falling back to fuzzy ratio.
+    Uses exact normalized matching, then substring matching, falling back to
+    fuzzy ratio.
     """
     target_norm = nm(target_text)
     if not target_norm:
         return None
 
-    # Exact normalized match
-    for i, n in enumerate(all_norms):
-        if target_norm == n:
-            return i
-
-    # Substring match (target contained in paragraph or vice versa)
-    for i, n in enumerate(all_norms):
-        if target_norm in n or n in target_norm:
-            if len(n) > 10:  # avoid trivially short matches
-                return i
-
-    # Fuzzy match — find best ratio above threshold
-    best_idx, best_ratio = None, 0.0
-    for i, n in enumerate(all_norms):
-        if not n:
-            continue
-        r = difflib.SequenceMatcher(None, target_norm, n).ratio()
-        if r > best_ratio:
-            best_idx, best_ratio = i, r
-
-    if best_ratio > 0.5:
-        return best_idx
-
-    return None
+    idx = para_index.find_exact(target_norm)
+    if idx is None:
+        idx = para_index.find_substring(target_norm)
+    if idx is None:
+        idx = para_index.find_fuzzy(target_norm)
+    return idx
 
 
-def apply_correction(ed, para, xml_raw_text, original_text, revised_text):
+def apply_correction(ed, para, rec, original_text, revised_text,
+                     diff_level=DEFAULT_DIFF_LEVEL):
     """Apply a single correction as tracked changes to a paragraph.
 
     If the correction targets a substring of the paragraph, applies the change
-    within the full paragraph context.
+    within the full paragraph context. On success the ParaRecord's text is
+    updated to the paragraph's new (accepted) text.
     """
-    ppr, rpr = get_ppr(para), get_rpr(para)
+    ppr, rpr, xml_raw_text = rec.ppr, rec.rpr, rec.text
 
     # Determine what to diff: if original_text is a substring, replace just that
     # portion within the full paragraph text
@@ -240,71 +211,37 @@ def apply_correction(ed, para, xml_raw_text, original_text, revised_text):
     if nm(old_text) == nm(new_text):
         return None  # no actual change
 
-    ops = merge_ops(char_diff_ops(old_text, new_text))
+    ops = diff_ops(old_text, new_text, diff_level)
     runs = tracked_runs_xml(rpr, ops)
 
     new_p_xml = f'<w:p>{ppr}{runs}</w:p>'
     try:
         nodes = ed.replace_node(para, new_p_xml)
-        return next(
-            (x for x in nodes if getattr(x, 'tagName', None) == 'w:p'), None
-        )
     except Exception as e:
         print(f"    ERR modify: {e}")
         return None
-
-
-# ---- Unpack helper ----
-
-def unpack_docx(docx_path, unpack_dir):
-    """Unpack a .docx file using the docx skill's unpack script."""
-    unpack_script = os.path.join(SKILL_ROOT, 'ooxml', 'scripts', 'unpack.py')
-    if not os.path.isfile(unpack_script):
-        # Fallback: simple ZIP extraction
-        import zipfile
-        os.makedirs(unpack_dir, exist_ok=True)
-        with zipfile.ZipFile(docx_path, 'r') as z:
-            z.extractall(unpack_dir)
-        return True
-
-    import subprocess
-    result = subprocess.run(
-        [sys.executable, unpack_script, docx_path, unpack_dir],
-        capture_output=True, text=True
+    new_p = next(
+        (x for x in nodes if getattr(x, 'tagName', None) == 'w:p'), None
     )
-    if result.returncode != 0:
-        print(f"  Unpack error: {result.stderr[:300]}")
-        return False
-    return True
-
+    if new_p is not None:
+        rec.set_text(new_text)
+    return new_p
 
-# ---- Main ----
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='Apply corrections as tracked changes to a draft loan document.'
-    )
-    parser.add_argument(
-        'draft_path',
-        help='Path to the draft .docx file'
-    )
-    parser.add_argument(
-        'corrections_path',
-        help='Path to the corrections JSON file'
-    )
-    parser.add_argument(
-        '--author', '-a', default='HK',
-        help='Author name for tracked changes (default: HK)'
-    )
-    args = parser.parse_args()
+# ---- Apply corrections to one draft ----
 
-    draft_path = os.path.abspath(args.draft_path)
-    corrections_path = os.path.abspath(args.corrections_path)
+def review_draft(draft_path, corrections_path, author='HK', diff_level=DEFAULT_DIFF_LEVEL):
+    """Apply one corrections file to one draft as tracked changes.
 
-    if not os.path.isfile(draft_path):
-        sys.exit(f"ERROR: Draft file not found: {draft_path}")
-    if not os.path.isfile(corrections_path):
-        sys.exit(f"ERROR: Corrections file not found: {corrections_path}")
+    Returns a result dict (draft, deviations, applied, failed, validated,
+    changed). Raises RuntimeError if the draft cannot be read or parsed.
+    """
+    result = {
+        'draft': os.path.basename(draft_path),
+        'corrections': os.path.basename(corrections_path),
+        'deviations': 0, 'applied': 0, 'failed': 0,
+        'validated': None, 'changed': False,
+    }
 
     # Load corrections
     with open(corrections_path) as f:
@@ -317,35 +254,49 @@ def main():
         and c.get('original_text')
         and c.get('revised_text')
     ]
+    result['deviations'] = len(deviations)
 
     if not deviations:
         print(f"No deviations to apply for {os.path.basename(draft_path)}")
-        return 0
+        return result
 
     print(f"\n{'='*50}")
     print(f"Applying corrections: {os.path.basename(draft_path)}")
     print(f"{'='*50}")
     print(f"  {len(deviations)} deviation(s) to correct")
 
-    # Unpack .docx to temp directory
-    unpack_dir = tempfile.mkdtemp(prefix='review_draft_')
-    print(f"  Unpacking .docx...")
-    if not unpack_docx(draft_path, unpack_dir):
-        sys.exit(f"ERROR: Failed to unpack {draft_path}")
-
-    # Fix any UTF-16 encoded XML files
-    fix_utf16_files(unpack_dir)
-
-    # Initialize Document library
-    print("  Initializing Document library...")
-    doc = Document(unpack_dir, author=args.author)
-    ed = doc["word/document.xml"]
-
-    # Build paragraph index
-    all_paras = list(ed.dom.getElementsByTagName('w:p'))
-    all_texts = [extract_text(p) for p in all_paras]
-    all_norms = [nm(t) for t in all_texts]
-    print(f"  {len(all_paras)} total paragraphs")
+    # Read the .docx once; parts are only written to disk if a correction matches
+    print(f"  Reading .docx...")
+    with timings.span("draft", label=result['draft'], items=len(deviations)):
+        try:
+            with timings.span("read"):
+                package = DocxPackage(draft_path)
+        except (OSError, zipfile.BadZipFile) as e:
+            raise RuntimeError(f"Failed to read {draft_path}: {e}")
+        unpack_dir = tempfile.mkdtemp(prefix='review_draft_')
+        try:
+            _apply_deviations(draft_path, package, unpack_dir, deviations, author,
+                              diff_level, result)
+        finally:
+            # Clean up temp directory
+            shutil.rmtree(unpack_dir, ignore_errors=True)
+    return result
+
+
+def _apply_deviations(draft_path, package, unpack_dir, deviations, author,
+                      diff_level, result):
+    # Stream all paragraphs (text, rPr, pPr) in a single pass and index them
+    with timings.span("stream") as span:
+        records = parse_paragraphs(package.read('word/document.xml'))
+        para_index = ParagraphIndex(r.norm for r in records)
+        span.count(len(records))
+    print(f"  {len(records)} total paragraphs")
+
+    # The Document library (and its DOM) is only loaded once a correction
+    # matches, and then only the matched paragraphs' nodes are touched. It
+    # needs a directory, so only the XML parts are written to unpack_dir;
+    # media and other binary parts stay in the package.
+    doc = ed = all_paras = None
 
     # Apply each correction
     applied = 0
@@ -360,48 +311,265 @@ def main():
         print(f"\n  Req #{req_id} ({section}):")
 
         # Find the paragraph containing the original text
-        idx = find_matching_para(all_paras, all_norms, original)
+        with timings.span("match", label=req_id):
+            idx = find_matching_para(para_index, original)
         if idx is None:
             print(f"    SKIP: Could not find matching paragraph")
             failed += 1
             continue
 
-        print(f"    Found at paragraph {idx}: {all_norms[idx][:60]}...")
-
-        new_p = apply_correction(
-            ed, all_paras[idx], all_texts[idx], original, revised
-        )
+        print(f"    Found at paragraph {idx}: {para_index[idx][:60]}...")
+
+        if doc is None:
+            print("    Initializing Document library...")
+            with timings.span("load_dom"):
+                package.extract_xml(unpack_dir)
+                fix_utf16_files(unpack_dir)
+                doc = load_skill().Document(unpack_dir, author=author)
+                ed = doc["word/document.xml"]
+                all_paras = ed.dom.getElementsByTagName('w:p')
+            if len(all_paras) != len(records):
+                raise RuntimeError(f"Paragraph count mismatch between stream "
+                                   f"({len(records)}) and DOM ({len(all_paras)})")
+
+        with timings.span("modify", label=req_id):
+            new_p = apply_correction(
+                ed, all_paras[idx], records[idx], original, revised, diff_level
+            )
         if new_p:
             all_paras[idx] = new_p
-            all_texts[idx] = extract_text(new_p)
-            all_norms[idx] = nm(all_texts[idx])
+            para_index.update(idx, records[idx].norm)
             applied += 1
             print(f"    Applied tracked change")
         else:
             print(f"    SKIP: No change needed or modification failed")
             failed += 1
 
+    result['applied'], result['failed'] = applied, failed
     print(f"\n{'='*50}")
     print(f"TOTAL: {applied} applied, {failed} failed/skipped")
 
+    if doc is None:
+        print(f"\nNo paragraphs matched; {os.path.basename(draft_path)} left unchanged.")
+        return
+
     # Save with validation
     print("\nSaving and validating...")
+    with timings.span("save"):
+        try:
+            doc.save(unpack_dir)
+            result['validated'] = True
+            print("  Validation passed!")
+        except ValueError as e:
+            print(f"  Validation failed: {e}")
+            doc.save(unpack_dir, validate=False)
+            result['validated'] = False
+            print("  Saved without validation (review output manually)")
+
+    # Repack to .docx, overwriting the original; untouched parts are copied as stored
+    with timings.span("pack"):
+        changed = package.update_from(unpack_dir)
+        print(f"Packing → {os.path.basename(draft_path)} ({len(changed)} part(s) rewritten)")
+        package.save(draft_path)
+    result['changed'] = True
+
+    print(f"\nDone! Output: {draft_path}")
+
+
+# ---- Drafts directory mode ----
+
+CORRECTIONS_SUFFIX = '_corrections.json'
+
+
+def find_draft_pairs(drafts_dir):
+    """Pair each <stem>_corrections.json in drafts_dir with <stem>.docx.
+
+    Returns (pairs, unpaired) where pairs is a list of
+    (draft_path, corrections_path) and unpaired lists corrections files
+    with no matching draft.
+    """
+    pairs, unpaired = [], []
+    for corrections_path in sorted(glob.glob(os.path.join(drafts_dir, '*' + CORRECTIONS_SUFFIX))):
+        stem = os.path.basename(corrections_path)[:-len(CORRECTIONS_SUFFIX)]
+        draft_path = os.path.join(drafts_dir, stem + '.docx')
+        if os.path.isfile(draft_path):
+            pairs.append((draft_path, corrections_path))
+        else:
+            unpaired.append(corrections_path)
+    return pairs, unpaired
+
+
+def _review_draft_worker(job):
+    """Process-pool worker: run review_draft() with its output captured.
+
+    With timed set, the draft's spans come back under 'spans' for the
+    parent to attach.
+    """
+    import io, time, traceback
+    from contextlib import redirect_stdout
+
+    draft_path, corrections_path, author, diff_level, timed = job
+    log = io.StringIO()
+    t0, c0 = time.perf_counter(), time.process_time()
+    spans = []
     try:
-        doc.save(unpack_dir)
-        print("  Validation passed!")
-    except ValueError as e:
-        print(f"  Validation failed: {e}")
-        doc.save(unpack_dir, validate=False)
-        print("  Saved without validation (review output manually)")
+        with redirect_stdout(log):
+            if timed:
+                result, spans = timings.collect(review_draft, draft_path, corrections_path,
+                                                author, diff_level)
+            else:
+                result = review_draft(draft_path, corrections_path, author, diff_level)
+        result['status'] = 'ok'
+    except Exception as e:
+        traceback.print_exc(file=log)
+        result = {
+            'draft': os.path.basename(draft_path),
+            'corrections': os.path.basename(corrections_path),
+            'status': 'error', 'error': f"{type(e).__name__}: {e}",
+        }
+    result['wall_seconds'] = round(time.perf_counter() - t0, 3)
+    result['cpu_seconds'] = round(time.process_time() - c0, 3)
+    result['log'] = log.getvalue()
+    if timed:
+        result['spans'] = spans
+    return result
+
+
+def review_drafts_dir(drafts_dir, author='HK', jobs=None, report_path=None,
+                      diff_level=DEFAULT_DIFF_LEVEL):
+    """Apply every corrections file in drafts_dir across a process pool.
+
+    Each worker imports the docx skill once and processes drafts until the
+    queue is empty, so a closing set finishes in roughly the time of its
+    slowest document. Writes a consolidated JSON report and returns the
+    number of drafts that errored.
+    """
+    import time
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from datetime import datetime, timezone
+
+    drafts_dir = os.path.abspath(drafts_dir)
+    pairs, unpaired = find_draft_pairs(drafts_dir)
+    for path in unpaired:
+        print(f"  WARN: No draft .docx for {os.path.basename(path)}")
+    if not pairs:
+        print(f"No *{CORRECTIONS_SUFFIX} files with matching drafts in {drafts_dir}")
+        return 0
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(pairs)))
+    report_path = report_path or os.path.join(drafts_dir, 'review_drafts_report.json')
+    print(f"Applying corrections to {len(pairs)} draft(s) with {jobs} worker(s)...")
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    t0 = time.perf_counter()
+    results = [None] * len(pairs)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(_review_draft_worker,
+                        (draft, corr, author, diff_level, timings.enabled())): i
+            for i, (draft, corr) in enumerate(pairs)
+        }
+        for n, future in enumerate(as_completed(futures), 1):
+            r = results[futures[future]] = future.result()
+            print(r.pop('log'), end='')
+            timings.attach(r.pop('spans', []))
+            if r['status'] == 'ok':
+                print(f"[{n}/{len(pairs)}] Completed: {r['draft']} "
+                      f"({r['applied']} applied, {r['wall_seconds']:.2f}s)")
+            else:
+                print(f"[{n}/{len(pairs)}] ERROR: {r['draft']}: {r['error']}")
+
+    errors = sum(1 for r in results if r['status'] != 'ok')
+    report = {
+        'drafts_dir': drafts_dir,
+        'started_at': started_at,
+        'finished_at': datetime.now(timezone.utc).isoformat(),
+        'jobs': jobs,
+        'diff_level': diff_level,
+        'wall_seconds': round(time.perf_counter() - t0, 3),
+        'drafts': results,
+        'unpaired_corrections': [os.path.basename(p) for p in unpaired],
+        'totals': {
+            'drafts': len(results),
+            'errors': errors,
+            'applied': sum(r.get('applied', 0) for r in results),
+            'failed': sum(r.get('failed', 0) for r in results),
+        },
+    }
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
 
-    # Repack to .docx, overwriting the original
-    print(f"Packing → {os.path.basename(draft_path)}")
-    pack_document(unpack_dir, draft_path)
+    print(f"\n{'='*50}")
+    print(f"ALL DRAFTS: {report['totals']['applied']} applied, "
+          f"{report['totals']['failed']} failed/skipped, {errors} error(s) "
+          f"in {report['wall_seconds']:.2f}s")
+    print(f"Report: {report_path}")
+    return errors
 
-    # Clean up temp directory
-    shutil.rmtree(unpack_dir, ignore_errors=True)
 
-    print(f"\nDone! Output: {draft_path}")
+# ---- Main ----
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Apply corrections as tracked changes to a draft loan document.'
+    )
+    parser.add_argument(
+        'draft_path', nargs='?',
+        help='Path to the draft .docx file'
+    )
+    parser.add_argument(
+        'corrections_path', nargs='?',
+        help='Path to the corrections JSON file'
+    )
+    parser.add_argument(
+        '--author', '-a', default='HK',
+        help='Author name for tracked changes (default: HK)'
+    )
+    parser.add_argument(
+        '--drafts-dir', '-d',
+        help='Apply every <stem>_corrections.json in this directory to <stem>.docx'
+    )
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=None,
+        help='Worker processes for --drafts-dir (default: CPU count)'
+    )
+    parser.add_argument(
+        '--report',
+        help='Report path for --drafts-dir (default: <drafts-dir>/review_drafts_report.json)'
+    )
+    parser.add_argument(
+        '--diff', choices=DIFF_LEVELS, default=DEFAULT_DIFF_LEVEL,
+        help='Diff level for tracked changes: word (whole words), refine (words, '
+             'then characters inside a reworded word) or char '
+             f'(default: {DEFAULT_DIFF_LEVEL})'
+    )
+    timings.add_arguments(parser, 'match')
+    args = parser.parse_args()
+
+    if args.drafts_dir:
+        if not os.path.isdir(args.drafts_dir):
+            sys.exit(f"ERROR: Drafts directory not found: {args.drafts_dir}")
+        timings.enable_from_args(args, 'review_draft', os.path.abspath(args.drafts_dir))
+        errors = review_drafts_dir(args.drafts_dir, args.author, args.jobs, args.report,
+                                   args.diff)
+        return 1 if errors else 0
+
+    if not args.draft_path or not args.corrections_path:
+        parser.error('draft_path and corrections_path are required unless --drafts-dir is given')
+
+    draft_path = os.path.abspath(args.draft_path)
+    corrections_path = os.path.abspath(args.corrections_path)
+
+    if not os.path.isfile(draft_path):
+        sys.exit(f"ERROR: Draft file not found: {draft_path}")
+    if not os.path.isfile(corrections_path):
+        sys.exit(f"ERROR: Corrections file not found: {corrections_path}")
+    timings.enable_from_args(args, 'review_draft', os.path.dirname(draft_path))
+
+    try:
+        review_draft(draft_path, corrections_path, args.author, args.diff)
+    except RuntimeError as e:
+        sys.exit(f"ERROR: {e}")
     return 0
 
 
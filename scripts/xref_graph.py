@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+xref_graph.py — Agreement-wide cross-reference graph for Markup.
+
+Scans every provision once with a single compiled pattern, resolves each
+Section / Article / Exhibit / Schedule / Annex reference to the provision
+folder and paragraph (line of original.txt) where the target is headed, and
+marks references that are dangling or part of a circular chain. The result is
+written to xref_graph.json in the deal directory so /check-cross-refs and
+/reconcile can look references up instead of re-reading full_agreement.txt.
+
+prepare_deal.py builds the graph from original.txt. After review, rebuild it
+from the revised text to check the revised agreement:
+
+Usage:
+    python scripts/xref_graph.py ./deal_review/
+    python scripts/xref_graph.py ./deal_review/ --revised
+"""
+
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+XREF_GRAPH_FILENAME = "xref_graph.json"
+
+# One pass over the text finds every kind of reference. Keywords match in any
+# case; identifiers (roman numerals, exhibit letters) must be upper case so
+# "this Article in" or "the exhibit attached" are not read as references.
+REFERENCE_RE = re.compile(
+    r'\b(?:'
+    r'(?P<section>(?i:sections?))\s+(?P<section_id>\d+(?:\.\d+)*)'
+    r'|(?P<article>(?i:articles?))\s+(?P<article_id>[IVXLCDM]+|\d+)\b'
+    r'|(?P<exhibit>(?i:exhibits?))\s+(?P<exhibit_id>[A-Z](?:-\d+)?)\b'
+    r'|(?P<schedule>(?i:schedules?))\s+(?P<schedule_id>\d+(?:\.\d+)*|[A-Z])\b'
+    r'|(?P<annex>(?i:annex(?:es)?))\s+(?P<annex_id>[A-Z])\b'
+    r')'
+)
+
+# Lines that head a reference target
+HEADING_RE = re.compile(
+    r'^\s*(?:'
+    r'(?i:section)\s+(?P<section_id>\d+(?:\.\d+)*)'
+    r'|(?P<bare_id>\d+\.\d+(?:\.\d+)*)\.?(?=\s)'
+    r'|(?i:article)\s+(?P<article_id>[IVXLCDM]+|\d+)\b'
+    r'|(?P<attachment>(?i:exhibit|schedule|annex))\s+(?P<attachment_id>[A-Z](?:-\d+)?|\d+(?:\.\d+)*)\b'
+    r')'
+)
+
+ATTACHMENT_KINDS = ("exhibit", "schedule", "annex")
+
+_ROMAN = {'I': 1, 'V': 5, 'X': 10, 'L': 50, 'C': 100, 'D': 500, 'M': 1000}
+
+
+def roman_to_int(numeral: str) -> int:
+    """Convert a roman numeral (upper case) to an integer."""
+    total = 0
+    for ch, nxt in zip(numeral, numeral[1:] + ' '):
+        value = _ROMAN[ch]
+        total += -value if _ROMAN.get(nxt, 0) > value else value
+    return total
+
+
+def target_key(kind: str, ident: str) -> str:
+    """Canonical lookup key for a reference target.
+
+    Section numbers compare by component ("Section 1.01" == "Section 1.1")
+    and articles by value ("Article V" == "Article 5").
+    """
+    if kind == "section" or (kind == "schedule" and ident[0].isdigit()):
+        ident = '.'.join(str(int(part)) for part in ident.split('.'))
+    elif kind == "article":
+        ident = str(int(ident)) if ident.isdigit() else str(roman_to_int(ident))
+    return f"{kind.capitalize()} {ident}"
+
+
+def scan_references(text: str):
+    """Yield (display, key, line, offset) for every reference in text.
+
+    display is the reference as cited ("Section 5.01"), key its canonical
+    target key, line the 0-based line (paragraph) and offset the character
+    offset within the text.
+    """
+    line = 0
+    pos = 0
+    for m in REFERENCE_RE.finditer(text):
+        line += text.count('\n', pos, m.start())
+        pos = m.start()
+        kind = m.lastgroup[:-3]
+        ident = m.group(m.lastgroup)
+        yield f"{kind.capitalize()} {ident}", target_key(kind, ident), line, m.start()
+
+
+def heading_key(line: str):
+    """Target key of the Section / Article / attachment a line heads, or None."""
+    m = HEADING_RE.match(line)
+    if not m:
+        return None
+    if m.group('section_id'):
+        return target_key("section", m.group('section_id'))
+    if m.group('bare_id'):
+        return target_key("section", m.group('bare_id'))
+    if m.group('article_id'):
+        return target_key("article", m.group('article_id'))
+    return target_key(m.group('attachment').lower(), m.group('attachment_id'))
+
+
+def index_targets(provisions: list[tuple[str, str]]) -> dict:
+    """Map target key -> {folder, paragraph, heading} for every headed target.
+
+    The first heading for a key wins (later ones are usually quotations).
+    """
+    targets = {}
+    for folder, text in provisions:
+        for paragraph, line in enumerate(text.split('\n')):
+            key = heading_key(line)
+            if key is None:
+                continue
+            if key not in targets:
+                targets[key] = {"folder": folder, "paragraph": paragraph,
+                                "heading": line.strip()[:120]}
+    return targets
+
+
+def _strongly_connected(edges: dict) -> list[list[str]]:
+    """Tarjan's algorithm; returns components with more than one node."""
+    index, low, on_stack, stack, comps = {}, {}, set(), [], []
+    counter = 0
+
+    for root in edges:
+        if root in index:
+            continue
+        work = [(root, iter(edges.get(root, ())))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, it = work[-1]
+            for nxt in it:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(edges.get(nxt, ()))))
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            else:
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                if low[node] == index[node]:
+                    comp = []
+                    while True:
+                        n = stack.pop()
+                        on_stack.discard(n)
+                        comp.append(n)
+                        if n == node:
+                            break
+                    if len(comp) > 1:
+                        comps.append(sorted(comp))
+    return sorted(comps)
+
+
+def build_xref_graph(provisions: list[tuple[str, str]]) -> dict:
+    """Build the cross-reference graph for (folder, text) pairs in agreement order.
+
+    Each reference gets a status: "resolved" (target in another provision),
+    "internal" (target in the same provision), "dangling" (Section/Article
+    with no heading anywhere in the agreement) or "external" (an exhibit,
+    schedule or annex not included in the agreement text).
+    """
+    targets = index_targets(provisions)
+    nodes = {}
+    edges = {}
+    dangling = []
+
+    for folder, text in provisions:
+        refs = []
+        for display, key, line, offset in scan_references(text):
+            target = targets.get(key)
+            if target and target["folder"] == folder and target["paragraph"] == line:
+                continue    # the target's own heading
+            ref = {"ref": display, "target": key, "paragraph": line, "offset": offset}
+            if target:
+                ref.update(folder=target["folder"], target_paragraph=target["paragraph"])
+                if target["folder"] == folder:
+                    ref["status"] = "internal"
+                else:
+                    ref["status"] = "resolved"
+                    edges.setdefault(folder, set()).add(target["folder"])
+            elif key.split(' ', 1)[0].lower() in ATTACHMENT_KINDS:
+                ref["status"] = "external"
+            else:
+                ref["status"] = "dangling"
+                dangling.append({"folder": folder, "ref": display, "paragraph": line})
+            refs.append(ref)
+        nodes[folder] = {"references": refs, "referenced_by": []}
+
+    for src in sorted(edges):
+        for dst in sorted(edges[src]):
+            nodes[dst]["referenced_by"].append(src)
+
+    cycles = _strongly_connected({f: sorted(edges.get(f, ())) for f in nodes})
+    in_cycle = {}
+    for comp in cycles:
+        for f in comp:
+            in_cycle[f] = set(comp)
+    for folder, node in nodes.items():
+        for ref in node["references"]:
+            ref["circular"] = (ref["status"] == "resolved"
+                               and ref["folder"] in in_cycle.get(folder, ()))
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "targets": targets,
+        "provisions": nodes,
+        "dangling": dangling,
+        "cycles": cycles,
+    }
+
+
+def load_provision_texts(deal_dir: Path, revised: bool = False) -> list[tuple[str, str]]:
+    """(folder, text) for each provision folder, preferring revised.txt if asked."""
+    provisions = []
+    for folder in sorted((deal_dir / "provisions").iterdir()):
+        source = folder / "revised.txt" if revised else None
+        if source is None or not source.exists():
+            source = folder / "original.txt"
+        if source.exists():
+            provisions.append((folder.name, source.read_text(encoding='utf-8')))
+    return provisions
+
+
+def write_xref_graph(deal_dir: Path, provisions: list[tuple[str, str]],
+                     source: str = "original") -> dict:
+    """Build the graph and write it to <deal_dir>/xref_graph.json."""
+    graph = build_xref_graph(provisions)
+    graph["source"] = source
+    (deal_dir / XREF_GRAPH_FILENAME).write_text(json.dumps(graph, indent=2), encoding='utf-8')
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the cross-reference graph (xref_graph.json) for a deal.",
+    )
+    parser.add_argument('deal_dir', help='Path to the deal review directory')
+    parser.add_argument('--revised', action='store_true',
+                        help='Use revised.txt where a provision has one')
+    args = parser.parse_args()
+
+    deal_dir = Path(args.deal_dir)
+    if not (deal_dir / "provisions").is_dir():
+        print(f"Error: No provisions directory in {deal_dir}")
+        return 1
+
+    provisions = load_provision_texts(deal_dir, revised=args.revised)
+    graph = write_xref_graph(deal_dir, provisions,
+                             source="revised" if args.revised else "original")
+    total = sum(len(n["references"]) for n in graph["provisions"].values())
+    print(f"✅ {total} references across {len(provisions)} provisions → "
+          f"{deal_dir / XREF_GRAPH_FILENAME}")
+    if graph["dangling"]:
+        print(f"⚠️  {len(graph['dangling'])} dangling reference(s):")
+        for d in graph["dangling"]:
+            print(f"   └── {d['folder']}: {d['ref']}")
+    if graph["cycles"]:
+        print(f"🔁 {len(graph['cycles'])} circular reference chain(s):")
+        for comp in graph["cycles"]:
+            print(f"   └── {' ↔ '.join(comp)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())